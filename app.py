@@ -3,8 +3,14 @@ import json
 import asyncio
 import pandas as pd
 from pathlib import Path
-import time
 from promo_processor.processor import PromoProcessor
+from promo_processor.session import ProcessingSession, SessionConfig
+from promo_processor.record import json_default
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE
+from promo_processor.pipeline import read_jsonl
+from promo_processor.jobs import JobProgress, ProcessingJob
+from promo_processor.logs import configure_logging
+from promo_processor.writers import to_bytes
 from typing import Optional, Dict, List, Any, Callable
 import logging
 import os
@@ -22,6 +28,23 @@ class AppConfig:
         }
     }
 
+    EXECUTION_MODES = {
+        "Single process": "single",
+        "Process pool": "pool",
+        "Vectorized": "vectorized",
+    }
+    # The progress panel polls the background job this often (seconds).
+    PROGRESS_INTERVAL = 0.25
+    PARTIAL_RESULTS_ROWS = 200
+
+    # Download label: (writer format, file suffix, MIME type)
+    DOWNLOAD_FORMATS = {
+        "JSON": ("json", ".json", "application/json"),
+        "JSONL": ("jsonl", ".jsonl", "application/x-ndjson"),
+        "Parquet": ("parquet", ".parquet", "application/vnd.apache.parquet"),
+        "Feather": ("arrow", ".feather", "application/vnd.apache.arrow.file"),
+    }
+
     CUSTOM_CSS = """
         <style>
         .main { 
@@ -93,6 +116,7 @@ class DataProcessor:
         file_extension = Path(uploaded_file.name).suffix.lower()
         file_handlers: Dict[str, Callable] = {
             '.json': lambda f: json.load(f),
+            '.jsonl': lambda f: list(read_jsonl(f)),
             '.csv': lambda f: DataProcessor._convert_df_to_json(pd.read_csv(f)),
             '.xlsx': lambda f: DataProcessor._convert_df_to_json(pd.read_excel(f)),
             '.xls': lambda f: DataProcessor._convert_df_to_json(pd.read_excel(f))
@@ -102,7 +126,7 @@ class DataProcessor:
             if file_extension in file_handlers:
                 st.write("Converting file to JSON...")
                 return file_handlers[file_extension](uploaded_file)
-            st.error("📛 Unsupported file format. Please upload JSON, CSV, or Excel file.")
+            st.error("📛 Unsupported file format. Please upload JSON, JSONL, CSV, or Excel file.")
             return None
         except Exception as e:
             st.error(f"❌ Error converting file: {str(e)}")
@@ -112,6 +136,7 @@ class DataProcessor:
     def _convert_df_to_json(df: pd.DataFrame) -> List[Dict]:
         df.fillna("", inplace=True)
         df["crawl_date"] = df["crawl_date"].astype(str)
+        st.session_state.uploaded_frame = df
         return df.to_dict(orient='records')
 
 class PromoApp:
@@ -124,14 +149,8 @@ class PromoApp:
         temp_dir = tempfile.gettempdir()
         log_file = os.path.join(temp_dir, 'promo_processor.log')
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, mode='a'),
-                logging.StreamHandler()
-            ]
-        )
+        # Handlers run on a listener thread, so processing threads only enqueue records.
+        configure_logging(logging.INFO, log_file, use_queue=True)
         self.logger = logging.getLogger(__name__)
 
     @staticmethod
@@ -140,6 +159,42 @@ class PromoApp:
             st.session_state.results = []
         if "qa_stats" not in st.session_state:
             st.session_state.qa_stats = {}
+        if "execution_mode" not in st.session_state:
+            st.session_state.execution_mode = "Single process"
+        if "perf_stats" not in st.session_state:
+            st.session_state.perf_stats = {}
+        if "engine" not in st.session_state:
+            # Results reference the uploaded rows instead of copying every column.
+            st.session_state.engine = ProcessingSession(SessionConfig(compact_records=True))
+        if "job" not in st.session_state:
+            st.session_state.job = None
+
+    def render_settings_section(self):
+        with st.sidebar:
+            st.header("⚙️ Execution")
+            st.radio(
+                "Execution mode",
+                list(AppConfig.EXECUTION_MODES),
+                key="execution_mode",
+                help="Process pool shards records across worker processes; "
+                     "Vectorized processes the whole table with column operations"
+            )
+            st.selectbox(
+                "Retailer",
+                [None, *PromoProcessor.get_registry().retailer_matchers],
+                format_func=lambda retailer: "From data" if retailer is None else retailer.title(),
+                key="retailer",
+                help="Only apply promo patterns for this retailer; "
+                     "'From data' routes each record by its retailer field"
+            )
+            if st.session_state.execution_mode == "Process pool":
+                st.number_input("Worker processes", min_value=1, max_value=os.cpu_count() or 1,
+                                value=os.cpu_count() or 1, key="workers")
+                st.number_input("Chunk size", min_value=1, value=DEFAULT_CHUNK_SIZE, step=100,
+                                key="chunk_size")
+            st.selectbox("Download format", list(AppConfig.DOWNLOAD_FORMATS), key="download_format")
+            st.checkbox("Collect performance stats", key="collect_stats",
+                        help="Time every processor and pattern; shown in the Performance tab")
 
     def setup_page(self):
         st.set_page_config(**AppConfig.PAGE_CONFIG)
@@ -150,17 +205,71 @@ class PromoApp:
     async def process_data(self):
         if not self._has_valid_uploaded_data():
             return
-        
-        try:
-            with st.spinner('🔄 Processing your data...'):
-                await self._process_data_with_progress()
-            st.success("✅ Processing completed successfully!")
-            self._calculate_qa_stats()
-        except Exception as e:
-            st.error(f"❌ An error occurred: {str(e)}")
-            self.logger.error(f"Error processing data: {str(e)}", exc_info=True)
 
-    def _calculate_qa_stats(self):
+        engine = st.session_state.engine
+        engine.stats.enabled = st.session_state.get("collect_stats", False)
+        engine.stats.reset()
+        st.session_state.results = []
+        st.session_state.qa_stats = {}
+        st.session_state.perf_stats = {}
+        st.session_state.job_message = None
+        pool = st.session_state.execution_mode == "Process pool"
+        st.session_state.job = ProcessingJob(
+            st.session_state.uploaded_data,
+            AppConfig.EXECUTION_MODES[st.session_state.execution_mode],
+            session=engine,
+            retailer=st.session_state.retailer,
+            workers=st.session_state.workers if pool else None,
+            chunk_size=st.session_state.chunk_size if pool else DEFAULT_CHUNK_SIZE,
+            frame=st.session_state.get("uploaded_frame"),
+        ).start()
+
+    @staticmethod
+    @st.fragment(run_every=AppConfig.PROGRESS_INTERVAL)
+    def render_job_progress():
+        """Polls the background job; only this fragment reruns while it works, not the whole page."""
+        job = st.session_state.job
+        if job is None:
+            return
+        progress = job.progress()
+        st.progress(progress.fraction, text=PromoApp._progress_text(progress))
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            if st.button("⏹️ Cancel", key="cancel_button", disabled=progress.finished):
+                job.cancel()
+        with col2:
+            show_partial = st.toggle("Show partial results", key="show_partial_results")
+        if show_partial and progress.done:
+            st.caption(f"Latest {min(progress.done, AppConfig.PARTIAL_RESULTS_ROWS)} of {progress.done} results")
+            st.dataframe(pd.DataFrame(job.partial_results(AppConfig.PARTIAL_RESULTS_ROWS)))
+        if progress.finished:
+            PromoApp._finish_job(job, progress)
+            st.rerun()
+
+    @staticmethod
+    def _progress_text(progress: JobProgress) -> str:
+        text = f"📊 Processed {progress.done} of {progress.total} items"
+        remaining = progress.remaining
+        if remaining is not None and not progress.finished:
+            text += f" (Est. {int(remaining // 3600)}h {int((remaining % 3600) // 60)}m {int(remaining % 60)}s remaining)"
+        return text
+
+    @staticmethod
+    def _finish_job(job: ProcessingJob, progress: JobProgress):
+        st.session_state.job = None
+        st.session_state.results = job.results
+        if progress.status == "done":
+            st.session_state.job_message = ("success", "✅ Processing completed successfully!")
+        elif progress.status == "cancelled":
+            st.session_state.job_message = ("warning", f"⏹️ Processing cancelled after {progress.done} of {progress.total} items")
+        else:
+            st.session_state.job_message = ("error", f"❌ An error occurred: {progress.error}")
+        PromoApp._calculate_qa_stats()
+        engine = job.session
+        st.session_state.perf_stats = engine.performance_stats() if engine.stats.enabled else {}
+
+    @staticmethod
+    def _calculate_qa_stats():
         total_items = len(st.session_state.results)
         volume_deals = sum(1 for item in st.session_state.results if item.get('volume_deals_description'))
         volume_deals_not_processed = volume_deals - sum(1 for item in st.session_state.results if item.get('volume_deals_price'))
@@ -180,29 +289,47 @@ class PromoApp:
             st.warning("⚠️ No results available to download")
             return
 
+        st.download_button(label="📥 Download Results", **self._download_payload())
+
+    @staticmethod
+    def _download_payload() -> Dict[str, Any]:
+        label = st.session_state.get("download_format", "JSON")
+        writer_format, suffix, mime = AppConfig.DOWNLOAD_FORMATS[label]
         filename = getattr(st.session_state, 'filename', 'processed_results').split('.')[0]
-        json_str = json.dumps(st.session_state.results, indent=4)
-        
-        st.download_button(
-            label="📥 Download Results",
-            data=json_str.encode('utf-8'),
-            file_name=f"{filename}.json",
-            mime='application/json'
-        )
+        results = st.session_state.results
+        try:
+            # One chunk, so the Parquet/Feather schema is inferred from every record, not the first ones.
+            data = to_bytes(results, writer_format, chunk_size=max(1, len(results)))
+        except (ValueError, ImportError) as e:
+            st.error(f"❌ Could not write {label} ({e}); the download below is JSON instead.")
+            writer_format, suffix, mime = AppConfig.DOWNLOAD_FORMATS["JSON"]
+            data = to_bytes(results, writer_format)
+        return {
+            "data": data,
+            "file_name": f"{filename}{suffix}",
+            "mime": mime,
+        }
 
     def render_upload_section(self):
         st.markdown("<div class='upload-header'>📤 Upload Data</div>", unsafe_allow_html=True)
         with st.container():
             uploaded_file = st.file_uploader(
                 "Drag and drop your file here or click to browse",
-                type=['json', 'csv', 'xlsx', 'xls'],
-                help="Supported formats: JSON, CSV, Excel"
+                type=['json', 'jsonl', 'csv', 'xlsx', 'xls'],
+                help="Supported formats: JSON, JSONL, CSV, Excel"
             )
             st.markdown("</div>", unsafe_allow_html=True)
 
-            if uploaded_file:
+            # The uploader keeps its file across reruns; only a new file resets the results.
+            if uploaded_file and uploaded_file.file_id != st.session_state.get("upload_id"):
+                st.session_state.upload_id = uploaded_file.file_id
+                if st.session_state.job is not None:
+                    st.session_state.job.cancel()
+                    st.session_state.job = None
                 st.session_state.results = []
                 st.session_state.qa_stats = {}
+                st.session_state.perf_stats = {}
+                st.session_state.uploaded_frame = None
                 data = DataProcessor.convert_to_json(uploaded_file)
                 if data:
                     st.session_state.uploaded_data = data
@@ -213,28 +340,30 @@ class PromoApp:
         st.markdown("<br>", unsafe_allow_html=True)
         col1, _, col2 = st.columns([1, 0.2, 1])
         with col1:
-            if st.button("🔄 Process Data", key='process_button'):
+            running = st.session_state.job is not None
+            if st.button("🔄 Process Data", key='process_button', disabled=running):
                 if 'uploaded_data' in st.session_state:
                     await self.process_data()
+            message = st.session_state.get("job_message")
+            if message and not running:
+                getattr(st, message[0])(message[1])
         with col2:
             if len(st.session_state.results) == 0:
                 return
             st.download_button(
                 label="📥 Save Results",
-                data=json.dumps(st.session_state.results, indent=4).encode('utf-8'),
-                file_name=f"{getattr(st.session_state, 'filename', 'processed_results').split('.')[0]}.json",
-                mime='application/json',
-                disabled=len(st.session_state.results) == 0
+                disabled=len(st.session_state.results) == 0,
+                **self._download_payload()
             )
             
     def render_results_section(self):
         if len(st.session_state.results) > 0:
-            tab1, tab2 = st.tabs(["Results", "QA Statistics"])
+            tab1, tab2, tab3 = st.tabs(["Results", "QA Statistics", "Performance"])
             
             with tab1:
                 with st.container():
                     st.markdown("<div class='results-container'>", unsafe_allow_html=True)
-                    st.json(st.session_state.results)
+                    st.json(json.dumps(st.session_state.results, default=json_default))
                     st.markdown("</div>", unsafe_allow_html=True)
             
             with tab2:
@@ -249,36 +378,47 @@ class PromoApp:
                                 delta=None,
                                 delta_color="normal"
                             )
+
+            with tab3:
+                self._render_performance_stats()
                            
         else:
             st.info("💡 No results to display. Upload and process data to see results here.")
 
+    @staticmethod
+    def _render_performance_stats():
+        stats = st.session_state.perf_stats
+        if not stats or not stats["items"]:
+            st.info("💡 Enable 'Collect performance stats' in the sidebar and process the data again. "
+                    "Stats are collected in the Single process mode only.")
+            return
+        latency = stats["latency"]
+        cols = st.columns(5)
+        cols[0].metric("⏱️ p50 latency", f"{latency['p50_us']:.0f} µs")
+        cols[1].metric("⏱️ p95 latency", f"{latency['p95_us']:.0f} µs")
+        cols[2].metric("⏱️ p99 latency", f"{latency['p99_us']:.0f} µs")
+        cols[3].metric("🎯 Cache hit rate", f"{stats['cache']['hit_rate']:.0%}")
+        cols[4].metric("❔ Unmatched regex time", f"{stats['unmatched_regex_ms']:.1f} ms")
+
+        st.subheader("Latency distribution")
+        st.bar_chart(pd.DataFrame(stats["histogram"]).set_index("upper_us"))
+        st.subheader("Processors")
+        st.dataframe(pd.DataFrame.from_dict(stats["processors"], orient="index"))
+        st.subheader("Patterns")
+        st.dataframe(pd.DataFrame.from_dict(stats["patterns"], orient="index").head(25))
+
     @staticmethod
     def _has_valid_uploaded_data() -> bool:
         return 'uploaded_data' in st.session_state and st.session_state.uploaded_data
 
-    async def _process_data_with_progress(self):
-        total_items = len(st.session_state.uploaded_data)
-        progress_text = st.empty()
-        progress_bar = st.progress(0)
-        start_time = time.time()
-        
-        for idx, item in enumerate(st.session_state.uploaded_data):
-            processor = await PromoProcessor.process_item(item)
-            st.session_state.results.extend(processor.results)
-            processor.results = []
-            elapsed_time = time.time() - start_time
-            items_per_second = (idx + 1) / elapsed_time if elapsed_time > 0 else 0
-            estimated_total_time = total_items / items_per_second if items_per_second > 0 else 0
-            remaining_time = estimated_total_time - elapsed_time
-            progress_text.write(f"📊 Processing item {idx + 1} of {total_items} (Est. {int(remaining_time//3600)}h {int((remaining_time%3600)//60)}m {int(remaining_time%60)}s remaining)")
-            progress_bar.progress((idx + 1) / total_items)
-            
-            
+
 async def main():
     app = PromoApp()
+    app.render_settings_section()
     app.render_upload_section()
     await app.render_action_buttons()
+    if st.session_state.job is not None:
+        app.render_job_progress()
     app.render_results_section()
 
 if __name__ == "__main__":
@@ -0,0 +1,117 @@
+"""Seeded generator of realistic promo item records for the benchmarks."""
+import random
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+WORDS = ["ONE", "TWO", "THREE", "FOUR", "FIVE"]
+PRODUCTS = ["snacks", "cereal", "soft drinks", "frozen pizza", "paper towels", "yogurt", "coffee", "pet food"]
+RETAILERS = ["target", "walmart", "jewel", "marianos"]
+STORE_BRANDS = {
+    "target": ["Good & Gather", "Market Pantry", "Up & Up", "Favorite Day"],
+    "walmart": ["Great Value", "Marketside", "Clear American"],
+    "jewel": ["Signature Select", "Lucerne", "O Organics"],
+    "marianos": ["Kroger", "Simple Truth", "Private Selection"],
+}
+NATIONAL_BRANDS = ["Kellogg's", "Pepsi", "Tide", "Bounty", "Chobani", "Folgers", "Purina", "DiGiorno"]
+
+
+def _price(r: random.Random, low: float = 0.5, high: float = 20.0) -> str:
+    return f"{r.uniform(low, high):.2f}"
+
+
+class Family(NamedTuple):
+    """One processor's description shapes and the slots its hooks handle."""
+    processor: str
+    templates: Tuple[Callable[[random.Random], str], ...]
+    slots: Tuple[str, ...] = ("deal", "coupon")
+    retailers: Tuple[str, ...] = tuple(RETAILERS)
+
+
+FAMILIES: List[Family] = [
+    Family("QuantityForPriceProcessor", (
+        lambda r: f"{r.randint(2, 5)} For ${_price(r, 2, 12)}",
+        lambda r: f"Buy {r.randint(2, 4)} for ${_price(r, 3, 15)}",
+    )),
+    Family("BuyGetFreeProcessor", (
+        lambda r: f"Buy {r.randint(1, 3)}, Get {r.randint(1, 2)} Free",
+        lambda r: f"Buy {r.randint(1, 3)}, get {r.randint(1, 2)} {r.choice([25, 50])}% off",
+    )),
+    Family("BuyGetDiscountProcessor", (lambda r: f"Buy {r.randint(2, 4)} get {r.choice([10, 20, 30])}% off",)),
+    Family("AboutEachPriceProcessor", (lambda r: f"${_price(r)} Each",)),
+    Family("AddTotalForOfferProcessor", (lambda r: f"Add {r.randint(2, 5)} Total For Offer",)),
+    Family("CouponDiscountProcessor", (lambda r: f"Coupon: ${r.randint(1, 3)}.00 off",)),
+    Family("DollarDiscountProcessor", (lambda r: f"${r.randint(1, 3)}.00 off",), ("coupon",)),
+    Family("PercentageDiscountProcessor", (
+        lambda r: f"Deal: {r.choice([10, 15, 20, 25])}% off",
+        lambda r: f"Save {r.choice([10, 20, 30])}% on {r.choice(PRODUCTS)}",
+        lambda r: f"{r.choice([10, 20, 40])}% off {r.choice(PRODUCTS)}",
+    )),
+    Family("PriceEachWithQuantityProcessor", (lambda r: f"${_price(r, 1, 5)} price each when you buy {r.randint(2, 4)}",),
+           ("deal",)),
+    Family("PricePerLbProcessor", (lambda r: f"${_price(r, 1, 9)}/lb",)),
+    Family("WeightBasedPromoProcessor", (lambda r: f"${_price(r, 2, 9)}/lb When you buy {r.choice(WORDS)} (1)",)),
+    Family("WordBasedQuantityPriceProcessor", (lambda r: f"${_price(r, 2, 12)} When you buy {r.choice(WORDS)}",),
+           ("deal",)),
+    Family("SaveOnQuantityProcessor", (
+        lambda r: f"${_price(r, 5, 15)} SAVE ${r.randint(1, 3)}.00 on {r.randint(2, 4)} ({r.randint(1, 5)})",
+        lambda r: f"Save ${r.randint(1, 3)}.00 on {r.randint(2, 4)} {r.choice(PRODUCTS)}",
+    )),
+    Family("SpendSavingsProcessor", (lambda r: f"Spend ${r.choice([20, 30, 50])} Save ${r.choice([5, 10])} on {r.choice(PRODUCTS)}",)),
+    Family("SavingsProcessor", (lambda r: f"Save ${r.randint(1, 4)}.{r.choice(['00', '50'])}",), ("coupon",)),
+    Family("SelectDealProcessor", (lambda r: f"Deal: ${_price(r, 1, 10)} price on {r.choice(PRODUCTS)}",),
+           ("deal",)),
+    Family("SelectProductPriceProcessor", (lambda r: f"${_price(r, 1, 10)} price on select {r.choice(PRODUCTS)}",),
+           ("coupon",)),
+    Family("FixedPriceMealProcessor", (lambda r: f"${r.randint(5, 25)} meal deal",)),
+    Family("TargetCircleDealProcessor", (
+        lambda r: f"Target Circle Deal: Buy {r.randint(1, 2)}, get {r.randint(1, 2)} 50% off select {r.choice(PRODUCTS)}",
+    ), ("coupon",), ("target",)),
+    Family("TargetCirclePercentProcessor", (
+        lambda r: f"Target Circle Deal: {r.choice([10, 20, 30])}% off {r.choice(PRODUCTS)}",
+        lambda r: f"Target Circle: {r.choice([5, 15])}% off {r.choice(PRODUCTS)}",
+        lambda r: f"Target Circle Deal: Save {r.choice([10, 25])}% on {r.choice(PRODUCTS)} - {r.randint(2, 6)}pk",
+    ), ("coupon",), ("target",)),
+    Family("TargetCirclePriceProcessor", (
+        lambda r: f"Target Circle Deal: ${_price(r, 1, 10)} price on {r.choice(PRODUCTS)}",
+        lambda r: f"Target Circle Coupon: ${r.randint(1, 5)} off",
+    ), ("coupon",), ("target",)),
+]
+
+NOISE = ["", "", "", "Rollback", "Clearance", "New lower price", "Online only", "Limit 4 per customer",
+         "Price valid through Saturday"]
+
+
+def _description(r: random.Random, slot: str, retailer: str, promo_rate: float) -> str:
+    if r.random() >= promo_rate:
+        return r.choice(NOISE)
+    family = r.choice([family for family in FAMILIES if slot in family.slots and retailer in family.retailers])
+    return r.choice(family.templates)(r)
+
+
+def generate_items(count: int, seed: int = 0, promo_rate: float = 0.7) -> Iterator[Dict[str, Any]]:
+    """Yield ``count`` item records; the same ``seed`` always yields the same records."""
+    r = random.Random(seed)
+    for index in range(count):
+        retailer = r.choice(RETAILERS)
+        brand = r.choice(STORE_BRANDS[retailer]) if r.random() < 0.3 else r.choice(NATIONAL_BRANDS)
+        regular_price = round(r.uniform(1.0, 30.0), 2)
+        sale_price = round(regular_price * r.uniform(0.6, 0.95), 2) if r.random() < 0.4 else regular_price
+        deal = _description(r, "deal", retailer, promo_rate)
+        coupon = _description(r, "coupon", retailer, promo_rate * 0.5)
+        yield {
+            "sku": f"{retailer[:3].upper()}-{index:08d}",
+            "retailer": retailer,
+            "product_title": f"{brand} {r.choice(PRODUCTS).title()} {r.randint(8, 64)} oz",
+            "regular_price": regular_price,
+            "sale_price": sale_price,
+            "volume_deals_description": deal,
+            "digital_coupon_description": coupon,
+            "crawl_date": "2024-12-01",
+            "upc": f"{r.randrange(10 ** 11, 10 ** 12)}",
+            "category": r.choice(PRODUCTS),
+        }
+
+
+def family_descriptions(per_family: int, seed: int = 0) -> Dict[str, List[str]]:
+    """Return ``per_family`` descriptions for every processor family, keyed by processor name."""
+    r = random.Random(seed)
+    return {family.processor: [r.choice(family.templates)(r) for _ in range(per_family)] for family in FAMILIES}
@@ -0,0 +1,197 @@
+"""Throughput benchmarks for the promo processing engine.
+
+Usage::
+
+    python -m benchmarks.run --items 20000 --output bench.json
+    python -m benchmarks.run --compare bench.json
+
+Every run uses the seeded corpus from ``benchmarks.corpus`` so reports taken
+on different revisions measure the same records and can be compared.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.corpus import FAMILIES, family_descriptions, generate_items
+from promo_processor.processor import PromoProcessor
+
+
+def _best_of(repeat: int, func: Callable[[], Any], setup: Optional[Callable[[], Any]] = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _reset() -> None:
+    PromoProcessor.results = []
+    PromoProcessor._match_cache.clear()
+
+
+def bench_end_to_end(items: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    """Items per second through ``PromoProcessor.process_item`` with a cold and a warm match cache."""
+    run = lambda: asyncio.run(PromoProcessor.process_item(items))
+    cold = _best_of(repeat, run, _reset)
+    warm = _best_of(repeat, run, lambda: setattr(PromoProcessor, "results", []))
+    return {
+        "items": len(items),
+        "cold_seconds": cold,
+        "cold_items_per_sec": len(items) / cold,
+        "warm_seconds": warm,
+        "warm_items_per_sec": len(items) / warm,
+    }
+
+
+def bench_match_latency(per_family: int, repeat: int, seed: int) -> Dict[str, Dict[str, float]]:
+    """Uncached ``registry.match`` latency for each processor's own descriptions, in microseconds."""
+    registry = PromoProcessor.get_registry()
+    retailers = {family.processor: family.retailers[0] if len(family.retailers) == 1 else None
+                 for family in FAMILIES}
+    report = {}
+    for processor, descriptions in family_descriptions(per_family, seed).items():
+        retailer = retailers[processor]
+        samples = []
+        for _ in range(repeat):
+            for description in descriptions:
+                start = time.perf_counter_ns()
+                registry.match(description, retailer)
+                samples.append(time.perf_counter_ns() - start)
+        samples.sort()
+        report[processor] = {
+            "mean_us": statistics.fmean(samples) / 1000,
+            "p50_us": samples[len(samples) // 2] / 1000,
+            "p95_us": samples[int(len(samples) * 0.95)] / 1000,
+        }
+    return report
+
+
+def bench_store_brands(items: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    titles = [item["product_title"] for item in items]
+    seconds = _best_of(repeat, lambda: [PromoProcessor.apply_store_brands(title) for title in titles])
+    return {"titles": len(titles), "seconds": seconds, "titles_per_sec": len(titles) / seconds}
+
+
+def bench_to_json(items: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    PromoProcessor.results = PromoProcessor.process_batch(items)
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "results.json"
+        seconds = _best_of(repeat, lambda: asyncio.run(PromoProcessor.to_json(path)))
+        size = path.stat().st_size
+    PromoProcessor.results = []
+    return {"records": len(items), "bytes": size, "seconds": seconds, "mb_per_sec": size / seconds / 1e6}
+
+
+def bench_writers(items: List[Dict[str, Any]], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Seconds and bytes per output format; formats whose library is missing are skipped."""
+    from promo_processor.writers import write_records
+
+    records = PromoProcessor.process_batch(items)
+    report = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name in ("results.json", "results.jsonl", "results.jsonl.gz", "results.parquet", "results.feather"):
+            path = Path(directory) / name
+            try:
+                seconds = _best_of(repeat, lambda: write_records(records, path))
+            except ImportError:
+                continue
+            report[name.split(".", 1)[1]] = {"seconds": seconds, "bytes": path.stat().st_size}
+    return report
+
+
+def run(items: int, seed: int, repeat: int, per_family: int) -> Dict[str, Any]:
+    corpus = list(generate_items(items, seed))
+    start = time.perf_counter()
+    PromoProcessor.build_registry()
+    registry_seconds = time.perf_counter() - start
+    return {
+        "meta": {
+            "revision": _revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "items": items,
+            "seed": seed,
+            "repeat": repeat,
+            "per_family": per_family,
+        },
+        "results": {
+            "registry_seconds": registry_seconds,
+            "end_to_end": bench_end_to_end(corpus, repeat),
+            "match_latency": bench_match_latency(per_family, repeat, seed),
+            "store_brands": bench_store_brands(corpus, repeat),
+            "to_json": bench_to_json(corpus, repeat),
+            "writers": bench_writers(corpus, repeat),
+        },
+    }
+
+
+def _flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> str:
+    """Side-by-side table of every numeric result present in both reports."""
+    old, new = _flatten(baseline["results"]), _flatten(current["results"])
+    lines = [f"{'metric':<60} {baseline['meta'].get('revision') or 'baseline':>12} "
+             f"{current['meta'].get('revision') or 'current':>12} {'ratio':>8}"]
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else float("nan")
+        lines.append(f"{key:<60} {old[key]:>12.4g} {new[key]:>12.4g} {ratio:>8.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000, help="number of synthetic records")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best is reported")
+    parser.add_argument("--per-family", type=int, default=200, help="descriptions per processor for match latency")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="print the ratio to an earlier JSON report")
+    parser.add_argument("--log", action="store_true", help="keep the per-item INFO logging enabled")
+    args = parser.parse_args(argv)
+
+    if not args.log:
+        logging.disable(logging.INFO)
+    report = run(args.items, args.seed, args.repeat, args.per_family)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=4))
+    if args.compare:
+        print(compare(json.loads(args.compare.read_text()), report))
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,59 @@
+import os
 import importlib
-import pkgutil
 from pathlib import Path
 from promo_processor.processor import PromoProcessor
+from promo_processor.registry import ProcessorRegistry
+from promo_processor.rules import load_rules
+from promo_processor.session import ProcessingSession, SessionConfig
 
 
 __all__ = []
 
 package_dir = Path(__file__).parent / "processors"
 
-def load_processors():
+def import_processors() -> None:
+    """Import every processor module, which registers its classes."""
+    import pkgutil
+
     for (_, module_name, _) in pkgutil.iter_modules([package_dir]):
         module = importlib.import_module(f"{__package__}.processors.{module_name}")
         if hasattr(module, '__all__'):
-            __all__.extend(module.__all__)
+            names = module.__all__
         else:
-            __all__.extend([attr for attr in dir(module) 
-                          if not attr.startswith('_') 
-                          and isinstance(getattr(module, attr), type)
-                          and issubclass(getattr(module, attr), PromoProcessor)])
+            names = [attr for attr in dir(module)
+                     if not attr.startswith('_')
+                     and isinstance(getattr(module, attr), type)
+                     and issubclass(getattr(module, attr), PromoProcessor)]
+        __all__.extend(name for name in names if name not in __all__)
+
+def load_processors(lazy: bool = True) -> ProcessorRegistry:
+    """Build the processor registry once.
+
+    With ``lazy`` the registry comes from the cached manifest while no
+    processor source has changed, and each processor module is only imported
+    when one of its patterns first wins a match; otherwise every module is
+    imported and the manifest is rewritten.
+    """
+    if PromoProcessor._registry is not None:
+        return PromoProcessor._registry
+    from promo_processor import manifest
+
+    load_rules()
+    cached = manifest.read_manifest() if lazy else None
+    if cached is not None:
+        registry = PromoProcessor._registry = manifest.load_registry(cached)
+        __all__.extend(name for name in cached["exports"] if name not in __all__)
+    else:
+        registry = PromoProcessor.build_registry()
+        manifest.save_manifest(registry, __all__)
+    if os.environ.get("PROMO_PROFILE_PATTERNS"):
+        PromoProcessor.profile_patterns()
+    return registry
 
-load_processors()
\ No newline at end of file
+def __getattr__(name: str):
+    # Processor classes resolve on first access; module names are left to the import system.
+    if name[:1].isupper():
+        for processor in load_processors().processors:
+            if type(processor).__name__ == name:
+                return type(processor.resolve()) if hasattr(type(processor), "resolve") else type(processor)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,48 @@
+import re
+from typing import Iterable, List, Mapping, NamedTuple, Optional
+
+
+class BrandMatch(NamedTuple):
+    retailer: str
+    brand: str
+
+
+class StoreBrandMatcher:
+    """Single compiled alternation over every retailer's store brands.
+
+    Brands are tried longest first, so one case-insensitive scan per title
+    finds the leftmost brand and reports which retailer it belongs to.
+    """
+
+    def __init__(self, store_brands: Mapping[str, Iterable[str]]) -> None:
+        brands = sorted(((retailer, brand) for retailer, group in store_brands.items() for brand in group),
+                        key=lambda item: (-len(item[1]), item[0], item[1]))
+        self._matches = {f"b{index}": BrandMatch(retailer, brand) for index, (retailer, brand) in enumerate(brands)}
+        self._by_text = {match.brand.casefold(): match for match in self._matches.values()}
+        alternation = "|".join(f"(?P<b{index}>{re.escape(brand)})" for index, (_, brand) in enumerate(brands))
+        self.pattern = re.compile(alternation or r"(?!)", re.IGNORECASE)
+        # Without groups, for ``Series.str.contains``, which warns about capturing ones.
+        self.contains_pattern = re.compile("|".join(re.escape(brand) for _, brand in brands) or r"(?!)",
+                                           re.IGNORECASE)
+        self._column_pattern = "(?P<brand>" + ("|".join(re.escape(brand) for _, brand in brands) or r"(?!)") + ")"
+
+    def match(self, title: str) -> Optional[BrandMatch]:
+        if not title:
+            return None
+        found = self.pattern.search(title)
+        return self._matches[found.lastgroup] if found else None
+
+    def match_many(self, titles: Iterable[str]) -> List[Optional[BrandMatch]]:
+        return [self.match(title) for title in titles]
+
+    def match_column(self, titles):
+        """Return a frame with ``retailer`` and ``brand`` columns for a pandas Series of titles."""
+        found = titles.fillna("").astype(str).str.extract(self._column_pattern, flags=re.IGNORECASE, expand=False)
+        matches = found.str.casefold().map(self._by_text)
+        frame = found.to_frame(name="brand")
+        frame["retailer"] = matches.map(lambda match: match.retailer, na_action="ignore")
+        frame["brand"] = matches.map(lambda match: match.brand, na_action="ignore")
+        return frame[["retailer", "brand"]]
+
+    def is_store_brand(self, title: str) -> str:
+        return "yes" if self.match(title) else "no"
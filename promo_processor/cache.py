@@ -0,0 +1,64 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+DEFAULT_CACHE_SIZE = 16384
+
+_MISSING = object()
+
+
+class MatchCache:
+    """Bounded LRU cache of match results keyed by description.
+
+    Keys are the descriptions exactly as matched: anchors and lookaheads in
+    the patterns see leading and repeated whitespace, so descriptions that
+    differ only in spacing can match differently and never share an entry.
+
+    Values are whatever the match function returns, normally the winning
+    processor, its ``PromoMatch`` and score, so a repeated description skips
+    the regex scan and group parsing entirely.  ``maxsize=0`` disables caching.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[Hashable], Any]) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+        value = compute(key)
+        if self.maxsize > 0:
+            with self._lock:
+                self._data[key] = value
+                if len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
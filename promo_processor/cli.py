@@ -0,0 +1,180 @@
+import os
+import sys
+import glob
+import json
+import time
+import logging
+import argparse
+from dataclasses import asdict, dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from promo_processor.logs import MATCH_LOG_ENV, MATCH_LOG_MODES, configure_logging
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE, EXECUTORS as POOL_EXECUTORS
+from promo_processor.processor import PromoProcessor
+from promo_processor.pipeline import READERS, process_stream, read_records
+from promo_processor.rules import RULES_ENV, load_rules, merge_rule_paths
+from promo_processor.store import ResultStore
+from promo_processor.writers import WRITERS, detect_format, write_records
+
+EXECUTORS = POOL_EXECUTORS + ("serial",)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunStats:
+    inputs: List[str] = field(default_factory=list)
+    output: str = ""
+    executor: str = "serial"
+    workers: int = 1
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    records: int = 0
+    deals_priced: int = 0
+    coupons_priced: int = 0
+    seconds: float = 0.0
+    store: Optional[Dict[str, Any]] = None
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "records_per_second": self.records_per_second}
+
+    def summary(self) -> str:
+        return (f"Processed {self.records} records from {len(self.inputs)} file(s) in {self.seconds:.2f}s "
+                f"({self.records_per_second:,.0f} records/s, {self.executor} x{self.workers}); "
+                f"{self.deals_priced} deals and {self.coupons_priced} coupons priced -> {self.output}")
+
+
+def expand_inputs(patterns: Sequence[str]) -> List[Path]:
+    """Input paths for ``patterns``, which may be globs (``**`` included); each file is listed once."""
+    paths: List[Path] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise FileNotFoundError(f"No input files match {pattern}")
+        for match in matches:
+            path = Path(match)
+            if not path.is_file():
+                raise FileNotFoundError(f"Input file not found: {match}")
+            if path.suffix.lower() not in READERS:
+                raise ValueError(f"Unsupported input format: {match}")
+            paths.append(path)
+    return list(dict.fromkeys(paths))
+
+
+def _track(records: Iterable[Dict[str, Any]], stats: RunStats, started: float,
+           progress_interval: float) -> Iterator[Dict[str, Any]]:
+    next_report = started + progress_interval
+    for record in records:
+        stats.records += 1
+        if record.get("volume_deals_price") not in (None, ""):
+            stats.deals_priced += 1
+        if record.get("digital_coupon_price") not in (None, ""):
+            stats.coupons_priced += 1
+        if progress_interval and stats.records % 100 == 0:
+            now = time.perf_counter()
+            if now >= next_report:
+                elapsed = now - started
+                print(f"... {stats.records} records, {stats.records / elapsed:,.0f} records/s", file=sys.stderr)
+                next_report = now + progress_interval
+        yield record
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m promo_processor",
+        description="Price promotions in JSON, JSONL, CSV, Excel or Parquet files without the Streamlit app.")
+    parser.add_argument("inputs", nargs="+", help="input files or glob patterns, e.g. 'feeds/**/*.jsonl'")
+    parser.add_argument("-o", "--output", required=True,
+                        help="output file, or - for standard output; the format follows the suffix")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), help="output format (default: from --output)")
+    parser.add_argument("--compression", help="gzip, bz2 or xz for JSON/JSONL; snappy, zstd, ... for Parquet/Arrow")
+    parser.add_argument("--executor", choices=EXECUTORS, default="process",
+                        help="run chunks in worker processes, threads or serially (default: process)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes or threads (default: CPU count)")
+    parser.add_argument("-c", "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"records per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--retailer", help="apply this retailer's patterns to every record")
+    parser.add_argument("--rules", action="append", default=[], metavar="PATH",
+                        help="also load the promo rules in this JSON/YAML file or directory (repeatable)")
+    parser.add_argument("--store", help="SQLite result store; only new or changed records are processed")
+    parser.add_argument("--progress", type=float, default=0, metavar="SECONDS",
+                        help="report progress on stderr every SECONDS (default: off)")
+    parser.add_argument("--stats-json", help="also write the run statistics to this JSON file")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not print the summary")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                        help="logging level; INFO logs matched records (default: WARNING)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="plain text or one JSON object per log record (default: text)")
+    parser.add_argument("--match-log", choices=MATCH_LOG_MODES, default="all",
+                        help="log every match, a sample, only per-processor counters, or nothing (default: all)")
+    return parser
+
+
+def run(args: argparse.Namespace) -> RunStats:
+    inputs = expand_inputs(args.inputs)
+    to_stdout = args.output == "-"
+    format, compression = args.format, args.compression
+    if format is None:
+        if to_stdout:
+            format = "jsonl"
+        else:
+            detected = detect_format(args.output)
+            format, compression = detected["format"], compression or detected["compression"]
+    workers = None if args.executor == "serial" else args.workers
+    stats = RunStats(inputs=[str(path) for path in inputs], output=args.output, executor=args.executor,
+                     workers=workers or 1, chunk_size=args.chunk_size)
+
+    store = ResultStore(args.store) if args.store else None
+    started = time.perf_counter()
+    try:
+        records = chain.from_iterable(read_records(path) for path in inputs)
+        processed = process_stream(records, args.chunk_size, workers, args.retailer, store, args.executor)
+        destination = sys.stdout.buffer if to_stdout else args.output
+        write_records(_track(processed, stats, started, args.progress), destination, format, compression,
+                      args.chunk_size)
+        if to_stdout:
+            sys.stdout.flush()
+    finally:
+        if store is not None:
+            stats.store = store.stats()
+            store.close()
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    configure_logging(args.log_level, structured=args.log_format == "json", use_queue=True)
+    # Worker processes create their sessions from the environment.
+    os.environ[MATCH_LOG_ENV] = args.match_log
+
+    try:
+        if args.rules:
+            # Worker processes, and the registry build below, load the rules named
+            # in the environment; load that same list here so each rule loads once.
+            os.environ[RULES_ENV] = os.pathsep.join(merge_rule_paths(args.rules))
+            load_rules()
+        stats = run(args)
+    except (OSError, ValueError, ImportError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if PromoProcessor._default_session is not None:
+            PromoProcessor._default_session.match_log.flush()
+
+    if args.stats_json:
+        Path(args.stats_json).write_text(json.dumps(stats.as_dict(), indent=2), encoding="utf-8")
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 0
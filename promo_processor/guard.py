@@ -0,0 +1,182 @@
+import re
+import math
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Sequence
+
+from promo_processor.matcher import sre_constants, sre_parse
+
+# Far longer than any real promotion text, so the cap only skips junk such as
+# a whole page pasted into one field; 0 disables it.
+DEFAULT_MAX_LENGTH = 4096
+DEFAULT_TIME_BUDGET = 0.05
+FUZZ_LENGTHS = (32, 128, 512)
+FUZZ_FILLERS = (" ", "1", "a", "1 ", "a ", "$1 ", "-", "1.", "a-1 ")
+SUPERLINEAR_GROWTH = 1.5
+
+NO_MATCH = (None, None, -1)
+
+logger = logging.getLogger(__name__)
+
+
+class PatternProfile(NamedTuple):
+    pattern: str
+    worst_seconds: float
+    worst_input: str
+    growth: float
+
+    @property
+    def superlinear(self) -> bool:
+        return self.growth > SUPERLINEAR_GROWTH
+
+
+def example_match(pattern: str) -> str:
+    """Build a short string shaped like a match of ``pattern``.
+
+    Takes the first branch of every alternation and the minimum (at least
+    one) repetition of every repeat; it is a fuzzing seed, not a guaranteed
+    match.
+    """
+    try:
+        return _example(sre_parse.parse(pattern))
+    except re.error:
+        return ""
+
+
+def _example(parsed) -> str:
+    out = []
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            out.append(chr(av))
+        elif op is sre_constants.NOT_LITERAL:
+            out.append("y" if chr(av) == "x" else "x")
+        elif op is sre_constants.ANY:
+            out.append("a")
+        elif op is sre_constants.IN:
+            out.append(_example_char(av))
+        elif op is sre_constants.BRANCH:
+            out.append(_example(av[1][0]))
+        elif op is sre_constants.SUBPATTERN:
+            out.append(_example(av[-1]))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) or op is getattr(sre_constants, "POSSESSIVE_REPEAT", None):
+            out.append(_example(av[2]) * max(av[0], 1))
+        elif op is getattr(sre_constants, "ATOMIC_GROUP", None):
+            out.append(_example(av))
+    return "".join(out)
+
+
+def _example_char(items) -> str:
+    for op, av in items:
+        if op is sre_constants.NEGATE:
+            return "#"
+        if op is sre_constants.LITERAL:
+            return chr(av)
+        if op is sre_constants.RANGE:
+            return chr(av[0])
+        if op is sre_constants.CATEGORY:
+            if av in (sre_constants.CATEGORY_DIGIT,):
+                return "1"
+            if av in (sre_constants.CATEGORY_SPACE,):
+                return " "
+            return "a"
+    return "a"
+
+
+def adversarial_inputs(pattern: str, length: int, fillers: Sequence[str] = FUZZ_FILLERS) -> List[str]:
+    """Near-misses for ``pattern``: a prefix of a matching string, a long run of filler, then a
+    character nothing expects.  Ambiguous quantifiers have to try every way of splitting the filler
+    before the search gives up at each start position."""
+    seed = example_match(pattern)
+    cuts = sorted({len(seed), len(seed) * 2 // 3, len(seed) // 3})
+    return [seed[:cut] + filler * (length // len(filler)) + "\x00" for cut in cuts for filler in fillers]
+
+
+def profile_pattern(pattern: str, lengths: Sequence[int] = FUZZ_LENGTHS, flags: int = re.IGNORECASE) -> PatternProfile:
+    """Time ``re.search`` of ``pattern`` over adversarial inputs of growing length.
+
+    Python's ``re`` exposes no step counter, so the cost is reported as the
+    worst wall time and as ``growth``, the exponent ``k`` in ``time ~ length**k``
+    between the shortest and longest inputs: about 1 for linear scans, 2 or
+    more for polynomial backtracking.
+    """
+    compiled = re.compile(pattern, flags)
+    worst_by_length = []
+    worst = (0.0, "")
+    for length in lengths:
+        length_worst = 0.0
+        for text in adversarial_inputs(pattern, length):
+            started = time.perf_counter()
+            compiled.search(text)
+            elapsed = time.perf_counter() - started
+            length_worst = max(length_worst, elapsed)
+            if elapsed > worst[0]:
+                worst = (elapsed, text)
+        worst_by_length.append(length_worst)
+    first, last = worst_by_length[0], worst_by_length[-1]
+    growth = math.log(last / first) / math.log(lengths[-1] / lengths[0]) if first > 0 and len(lengths) > 1 else 0.0
+    return PatternProfile(pattern, worst[0], worst[1], growth)
+
+
+def profile_patterns(patterns: Iterable[str], lengths: Sequence[int] = FUZZ_LENGTHS) -> List[PatternProfile]:
+    """Profile every pattern, most expensive first, and warn about super-linear ones."""
+    profiles = sorted((profile_pattern(pattern, lengths) for pattern in dict.fromkeys(patterns)),
+                      key=lambda profile: -profile.worst_seconds)
+    for profile in profiles:
+        if profile.superlinear:
+            logger.warning("Pattern %r grows super-linearly (time ~ length**%.1f, worst %.2f ms at %d chars)",
+                           profile.pattern, profile.growth, profile.worst_seconds * 1e3, len(profile.worst_input))
+    return profiles
+
+
+class MatchGuard:
+    """Bounds and reports the cost of matching a single description.
+
+    ``re`` cannot be interrupted, so the only hard bound is ``max_length``:
+    longer descriptions are logged and skipped before any regex runs, and
+    0 turns the cap off.  A match that takes longer than ``time_budget``
+    seconds is logged and counted but its result is kept, so output never
+    depends on how loaded the machine is.  ``compute`` should only search; callers compile what it needs first.
+    """
+
+    def __init__(self, max_length: int = DEFAULT_MAX_LENGTH, time_budget: float = DEFAULT_TIME_BUDGET) -> None:
+        self.max_length = max_length
+        self.time_budget = time_budget
+        self._lock = threading.Lock()
+        self.too_long = 0
+        self.over_budget = 0
+        self.slowest = 0.0
+
+    def run(self, key: Hashable, description: str, compute: Callable[[Hashable], Any]) -> Any:
+        if self.max_length and len(description) > self.max_length:
+            logger.warning("Skipping description of %d characters (limit %d): %.80r",
+                           len(description), self.max_length, description)
+            with self._lock:
+                self.too_long += 1
+            return NO_MATCH
+        if not self.time_budget:
+            return compute(key)
+        started = time.perf_counter()
+        result = compute(key)
+        elapsed = time.perf_counter() - started
+        if elapsed > self.time_budget:
+            logger.warning("Description took %.1f ms to match (budget %.1f ms): %.80r",
+                           elapsed * 1e3, self.time_budget * 1e3, description)
+            with self._lock:
+                self.over_budget += 1
+                self.slowest = max(self.slowest, elapsed)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self.too_long = self.over_budget = 0
+            self.slowest = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_length": self.max_length,
+            "time_budget": self.time_budget,
+            "too_long": self.too_long,
+            "over_budget": self.over_budget,
+            "slowest": self.slowest,
+        }
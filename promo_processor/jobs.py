@@ -0,0 +1,136 @@
+import math
+import time
+import logging
+import threading
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE, iter_chunks, process_parallel
+from promo_processor.session import ProcessingSession
+
+MODES = ("single", "pool", "vectorized")
+# Single-process jobs work in chunks of at most this fraction of the input,
+# so progress advances in small steps and cancellation takes effect quickly.
+PROGRESS_STEP = 0.01
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgress(NamedTuple):
+    status: str
+    done: int
+    total: int
+    elapsed: float
+    error: Optional[str]
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total else 1.0
+
+    @property
+    def remaining(self) -> Optional[float]:
+        """Estimated seconds left, or None before the first chunk has finished."""
+        if not self.done or not self.elapsed:
+            return None
+        return (self.total - self.done) / (self.done / self.elapsed)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "cancelled", "failed")
+
+
+class ProcessingJob:
+    """Processes a list of records on a background thread.
+
+    The caller polls ``progress()`` and ``partial_results()`` while the job
+    runs and may ``cancel()`` it; cancellation takes effect at the next chunk
+    boundary and keeps the results finished so far.  Vectorized jobs run as
+    a single step, so they report no progress until they are done and can
+    only be cancelled before they start.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], mode: str = "single",
+                 session: Optional[ProcessingSession] = None, retailer: Optional[str] = None,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, frame: Any = None) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        self.records = records
+        self.mode = mode
+        self.session = session or ProcessingSession()
+        self.retailer = retailer
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.frame = frame
+        self.results: List[Dict[str, Any]] = []
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="promo-job", daemon=True)
+
+    def start(self) -> "ProcessingJob":
+        self._started = time.perf_counter()
+        self.status = "running"
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def progress(self) -> JobProgress:
+        with self._lock:
+            done = len(self.results)
+        end = self._finished or time.perf_counter()
+        elapsed = end - self._started if self._started else 0.0
+        return JobProgress(self.status, done, len(self.records), elapsed, self.error)
+
+    def partial_results(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """A copy of the results so far; the last ``limit`` of them if given."""
+        with self._lock:
+            return self.results[-limit:] if limit else list(self.results)
+
+    def _run(self) -> None:
+        chunks = self._chunks()
+        try:
+            for chunk in chunks:
+                with self._lock:
+                    self.results.extend(chunk)
+                if self._cancel.is_set():
+                    break
+            self.status = "cancelled" if self._cancel.is_set() else "done"
+        except Exception as e:
+            logger.error("Processing job failed: %s", e, exc_info=True)
+            self.error = f"{type(e).__name__}: {e}"
+            self.status = "failed"
+        finally:
+            chunks.close()
+            self._finished = time.perf_counter()
+
+    def _chunks(self) -> Iterator[List[Dict[str, Any]]]:
+        if self._cancel.is_set():
+            return
+        if self.mode == "vectorized":
+            yield self._process_frame()
+        elif self.mode == "pool":
+            yield from process_parallel(self.records, workers=self.workers, chunk_size=self.chunk_size,
+                                        retailer=self.retailer)
+        else:
+            step = min(self.chunk_size, max(1, math.ceil(len(self.records) * PROGRESS_STEP)))
+            for chunk in iter_chunks(self.records, step):
+                yield self.session.process_batch(chunk, self.retailer)
+
+    def _process_frame(self) -> List[Dict[str, Any]]:
+        import pandas as pd
+        from promo_processor.vectorized import process_dataframe
+
+        frame = self.frame if self.frame is not None else pd.DataFrame(self.records)
+        return process_dataframe(frame, retailer=self.retailer).to_dict(orient="records")
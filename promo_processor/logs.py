@@ -0,0 +1,188 @@
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+import multiprocessing
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Dict, Optional, Union
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DEFAULT_LOG_FILE = "app.log"
+MATCH_LOG_ENV = "PROMO_MATCH_LOG"
+MATCH_LOG_MODES = ("all", "sample", "counters", "off")
+DEFAULT_SAMPLE_EVERY = 1000
+# Record attributes the structured formatter copies into each line when present.
+STRUCTURED_FIELDS = ("kind", "processor", "description", "counts")
+
+_listener: Optional[QueueListener] = None
+# Records from forked children: the parent listens on this queue with the
+# same handlers, so only the parent ever writes (and rotates) the log file.
+_fork_records: Optional["multiprocessing.Queue"] = None
+_fork_listener: Optional[QueueListener] = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {"time": round(record.created, 3), "level": record.levelname, "logger": record.name,
+                 "message": record.getMessage()}
+        for field in STRUCTURED_FIELDS:
+            value = record.__dict__.get(field)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class LocalQueueHandler(QueueHandler):
+    """Enqueues records unformatted; the listener thread formats them.
+
+    ``QueueHandler.prepare`` formats each record so it can be pickled, which
+    an in-process queue does not need.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.enqueue(record)
+        except Exception:
+            self.handleError(record)
+
+
+def configure_logging(level: Union[int, str] = logging.INFO, filename: Optional[str] = DEFAULT_LOG_FILE,
+                      structured: bool = False, use_queue: bool = False) -> None:
+    """Log to stderr and, unless ``filename`` is None, a rotating log file.
+
+    Importing the package no longer configures logging; entry points call
+    this.  With ``use_queue`` the handlers run on a ``QueueListener`` thread
+    and loggers only enqueue records, so formatting and file I/O stay off the
+    processing threads.  Calling it again only changes the level.
+    """
+    global _listener
+    root = logging.getLogger()
+    if not root.handlers:
+        formatter = StructuredFormatter() if structured else logging.Formatter(LOG_FORMAT)
+        handlers = [logging.StreamHandler()]
+        if filename:
+            handlers.append(RotatingFileHandler(filename, maxBytes=1000000, backupCount=10))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        if use_queue:
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            _listener = QueueListener(records, *handlers, respect_handler_level=True)
+            _listener.start()
+            atexit.register(stop_logging)
+            handlers = [LocalQueueHandler(records)]
+        for handler in handlers:
+            root.addHandler(handler)
+    root.setLevel(level)
+
+
+def _before_fork() -> None:
+    global _fork_records, _fork_listener
+    if _listener is not None and _fork_listener is None:
+        _fork_records = multiprocessing.Queue()
+        _fork_listener = QueueListener(_fork_records, *_listener.handlers, respect_handler_level=True)
+        _fork_listener.start()
+
+
+def _after_fork_in_child() -> None:
+    # A forked child inherits the queue but not the listener thread.  The
+    # parent still writes the records that were queued before the fork, so
+    # the child drops its copies and sends its own records to the parent.
+    global _listener, _fork_listener
+    if _listener is None:
+        return
+    records = _listener.queue
+    while True:
+        try:
+            records.get_nowait()
+        except queue.Empty:
+            break
+    _listener = _fork_listener = None
+    root = logging.getLogger()
+    for handler in [handler for handler in root.handlers if isinstance(handler, LocalQueueHandler)]:
+        root.removeHandler(handler)
+    root.addHandler(QueueHandler(_fork_records))
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(before=_before_fork, after_in_child=_after_fork_in_child)
+
+
+def stop_logging() -> None:
+    """Flush and stop the queue listeners started by ``configure_logging``.
+
+    In a forked child, whoever manages it calls this before it exits; it
+    waits until the child's records have reached the parent.
+    """
+    global _listener, _fork_listener, _fork_records
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _fork_listener is not None:
+        _fork_listener.stop()
+        _fork_listener = None
+    elif _fork_records is not None:
+        _fork_records.close()
+        _fork_records.join_thread()
+    _fork_records = None
+
+
+class MatchLog:
+    """How a session reports the processor each description matched.
+
+    ``"all"`` logs every match at INFO, ``"sample"`` every
+    ``sample_every``-th match of each processor, ``"counters"`` only counts matches
+    per processor until ``flush()`` logs the totals, and ``"off"`` does
+    nothing.  Every mode but ``"off"`` keeps the counters.
+    """
+
+    def __init__(self, logger: logging.Logger, mode: str = "all", sample_every: int = DEFAULT_SAMPLE_EVERY) -> None:
+        if mode not in MATCH_LOG_MODES:
+            raise ValueError(f"Unknown match log mode: {mode}")
+        self.logger = logger
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self.enabled = mode != "off"
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, processor: Any, description: str) -> None:
+        name = type(processor).__name__
+        with self._lock:
+            self._counts[kind, name] += 1
+            count = self._counts[kind, name]
+        if self.mode == "counters":
+            return
+        if self.mode == "sample" and count % self.sample_every != 1 % self.sample_every:
+            return
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("%s: %s: %s", kind, name, description,
+                             extra={"kind": kind, "processor": name, "description": description})
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Matches so far per kind (``"DEALS"``/``"COUPONS"``) and processor."""
+        with self._lock:
+            counts = dict(self._counts)
+        result: Dict[str, Dict[str, int]] = {}
+        for (kind, name), count in sorted(counts.items()):
+            result.setdefault(kind, {})[name] = count
+        return result
+
+    def flush(self) -> Dict[str, Dict[str, int]]:
+        """Log and reset the counters."""
+        counts = self.counts()
+        with self._lock:
+            self._counts.clear()
+        if counts and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Matches per processor: %s", json.dumps(counts, sort_keys=True), extra={"counts": counts})
+        return counts
+
+
+def default_match_log_mode() -> str:
+    return os.environ.get(MATCH_LOG_ENV, "all")
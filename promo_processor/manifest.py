@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+import threading
+import importlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from promo_processor.pattern_cache import load_table
+from promo_processor.processor import PromoProcessor
+from promo_processor.registry import ProcessorRegistry
+from promo_processor.rules import default_cache_dir
+
+# Bumped whenever the manifest layout changes, so old manifests are ignored.
+MANIFEST_VERSION = 2
+PACKAGE_DIR = Path(__file__).parent
+# The only modules a manifest entry may name; LazyProcessor imports them by name.
+PROCESSORS_PACKAGE = f"{__package__}.processors."
+
+logger = logging.getLogger(__name__)
+
+
+class LazyProcessor:
+    """Stands in for a processor class until one of its patterns wins a match.
+
+    ``load_registry`` derives one subclass per manifest entry, named after
+    the processor it replaces so stats and logs read the same.  The first
+    hook call imports the processor's module and rebinds the hooks on the
+    instance to the real processor's, so later calls go straight to it.
+    """
+
+    module: str = ""
+    qualname: str = ""
+    patterns: List[str] = []
+    retailers: Optional[List[str]] = None
+    PRECEDENCE = 0
+    applies_to = classmethod(PromoProcessor.applies_to.__func__)
+    _lock = threading.Lock()
+
+    def resolve(self) -> PromoProcessor:
+        target = self.__dict__.get("_target")
+        if target is None:
+            with self._lock:
+                target = self.__dict__.get("_target")
+                if target is None:
+                    processor_class = importlib.import_module(self.module)
+                    for name in self.qualname.split("."):
+                        processor_class = getattr(processor_class, name)
+                    processor_class.PRECEDENCE = self.PRECEDENCE
+                    target = processor_class()
+                    self.calculate_deal = target.calculate_deal
+                    self.calculate_coupon = target.calculate_coupon
+                    self.__dict__["_target"] = target
+                    logger.debug("Imported %s.%s on its first match", self.module, self.qualname)
+        return target
+
+    def calculate_deal(self, item: Dict[str, Any], match: Any) -> Dict[str, Any]:
+        return self.resolve().calculate_deal(item, match)
+
+    def calculate_coupon(self, item: Dict[str, Any], match: Any) -> Dict[str, Any]:
+        return self.resolve().calculate_coupon(item, match)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+
+def manifest_path(cache_dir=None) -> Path:
+    # One manifest per installed copy of the package.
+    checkout = hashlib.sha256(str(PACKAGE_DIR.resolve()).encode()).hexdigest()[:12]
+    return Path(cache_dir or default_cache_dir()) / f"manifest-{checkout}.json"
+
+
+def external_processors() -> List[str]:
+    """Qualified names of the registered processors defined outside the package's processor modules.
+
+    Such classes, e.g. one defined in a script's ``__main__``, cannot be
+    imported by name in another process, so a registry that has any is
+    built eagerly and never cached.
+    """
+    return sorted(f"{processor_class.__module__}.{processor_class.__qualname__}"
+                  for processor_class in PromoProcessor.subclasses
+                  if processor_class.__dict__.get("rule") is None
+                  and not processor_class.__module__.startswith(PROCESSORS_PACKAGE))
+
+
+def source_key() -> Dict[str, Any]:
+    """What a manifest is valid for: the package's sources, the loaded rule plans, the
+    processors registered outside the package and Python."""
+    from promo_processor.rules import _loaded
+
+    sources = {}
+    for path in sorted([*PACKAGE_DIR.glob("*.py"), *(PACKAGE_DIR / "processors").glob("*.py")]):
+        stat = path.stat()
+        sources[str(path.relative_to(PACKAGE_DIR))] = [stat.st_mtime_ns, stat.st_size]
+    return {"python": list(sys.version_info[:2]), "sources": sources, "rules": sorted(_loaded),
+            "external": external_processors()}
+
+
+def save_manifest(registry: ProcessorRegistry, exports: List[str], cache_dir=None) -> None:
+    """Record ``registry``, as built from the imported processors, for ``load_registry``.
+
+    Nothing is written while processors from outside the package are registered.
+    """
+    external = external_processors()
+    if external:
+        logger.debug("Not caching the processor manifest; registered outside the package: %s", ", ".join(external))
+        return
+    processors = []
+    for processor in registry.processors:
+        processor_class = type(processor)
+        rule = processor_class.__dict__.get("rule") is not None
+        if not rule and not processor_class.__module__.startswith(PROCESSORS_PACKAGE):
+            logger.debug("Not caching the processor manifest; %s.%s cannot be imported lazily",
+                         processor_class.__module__, processor_class.__qualname__)
+            return
+        processors.append({
+            "name": processor_class.__name__,
+            "module": processor_class.__module__,
+            "qualname": processor_class.__qualname__,
+            "rule": rule,
+            "patterns": list(processor.patterns),
+            "retailers": list(processor.retailers) if processor.retailers is not None else None,
+            "precedence": registry.precedence[processor_class],
+        })
+    manifest = {
+        "manifest_version": MANIFEST_VERSION,
+        "key": source_key(),
+        "registry_version": registry.version,
+        "exports": exports,
+        "pattern_scores": dict(registry.pattern_scores),
+        "processors": processors,
+    }
+    filename = manifest_path(cache_dir)
+    try:
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        temporary = filename.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(manifest), encoding="utf-8")
+        temporary.replace(filename)
+    except OSError as e:
+        logger.warning("Could not write processor manifest %s: %s", filename, e)
+
+
+def read_manifest(cache_dir=None) -> Optional[Dict[str, Any]]:
+    """The saved manifest, or ``None`` if there is none, any source or registered
+    processor changed since or an entry names a class it cannot load."""
+    try:
+        manifest = json.loads(manifest_path(cache_dir).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("manifest_version") != MANIFEST_VERSION or manifest.get("key") != source_key():
+        return None
+    rule_names = {processor_class.__name__ for processor_class in PromoProcessor.subclasses
+                  if processor_class.__dict__.get("rule") is not None}
+    for entry in manifest.get("processors", ()):
+        loadable = entry["name"] in rule_names if entry["rule"] else entry["module"].startswith(PROCESSORS_PACKAGE)
+        if not loadable:
+            return None
+    return manifest
+
+
+def load_registry(manifest: Dict[str, Any]) -> ProcessorRegistry:
+    """Registry from ``manifest`` without importing the processor modules.
+
+    Rule processors are already loaded and are used as they are; every
+    other processor is a ``LazyProcessor`` until its first match.
+    """
+    rule_classes = {processor_class.__name__: processor_class for processor_class in PromoProcessor.subclasses
+                    if processor_class.__dict__.get("rule") is not None}
+    processors = []
+    precedence = {}
+    for entry in manifest["processors"]:
+        if entry["rule"]:
+            processor_class = rule_classes[entry["name"]]
+        else:
+            processor_class = type(entry["name"], (LazyProcessor,), {
+                "module": entry["module"],
+                "qualname": entry["qualname"],
+                "patterns": entry["patterns"],
+                "retailers": entry["retailers"],
+                "PRECEDENCE": entry["precedence"],
+            })
+        precedence[processor_class] = entry["precedence"]
+        processors.append(processor_class())
+    table = load_table(manifest["pattern_scores"], PromoProcessor.calculate_pattern_precedence)
+    registry = ProcessorRegistry.assemble(tuple(processors), precedence, manifest["pattern_scores"],
+                                          PromoProcessor._store_brands, table.info)
+    # Computing the version needs the processors' source; the manifest has it.
+    registry.__dict__["version"] = manifest["registry_version"]
+    return registry
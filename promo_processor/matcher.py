@@ -0,0 +1,238 @@
+import re
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Type
+
+_GROUP_NAME = re.compile(r"\(\?P<(?P<name>\w+)>")
+_GROUP_REF = re.compile(r"\(\?P=(?P<name>\w+)\)")
+_LEADING_FLAGS = re.compile(r"^\(\?(?P<flags>[aiLmsux]+)\)")
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+_REPEATS = tuple(getattr(sre_constants, name) for name in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+                 if hasattr(sre_constants, name))
+_ATOMIC_GROUP = getattr(sre_constants, "ATOMIC_GROUP", None)
+
+
+class PromoMatch:
+    """Read-only view of one pattern's groups inside a combined match.
+
+    Exposes the part of the ``re.Match`` API the processors use (``group``,
+    ``groups``, ``groupdict`` and item access) with the group names and
+    numbers of the original pattern.
+    """
+
+    __slots__ = ("pattern", "_groups", "_names")
+
+    def __init__(self, pattern: str, groups: Tuple[Optional[str], ...], names: Dict[str, int]) -> None:
+        self.pattern = pattern
+        self._groups = groups
+        self._names = names
+
+    def _value(self, group) -> Optional[str]:
+        if isinstance(group, str):
+            group = self._names.get(group, -1)
+        if not 0 <= group < len(self._groups):
+            raise IndexError("no such group")
+        return self._groups[group]
+
+    def group(self, *groups):
+        if len(groups) > 1:
+            return tuple(self._value(g) for g in groups)
+        return self._value(groups[0] if groups else 0)
+
+    def __getitem__(self, group):
+        return self._value(group)
+
+    def groups(self, default=None) -> Tuple[Any, ...]:
+        return tuple(default if value is None else value for value in self._groups[1:])
+
+    def groupdict(self, default=None) -> Dict[str, Any]:
+        return {name: default if self._groups[index] is None else self._groups[index]
+                for name, index in self._names.items()}
+
+    def __repr__(self) -> str:
+        return f"<PromoMatch pattern={self.pattern!r} match={self._groups[0]!r}>"
+
+
+class PatternInfo(NamedTuple):
+    """What the combined matcher needs to know about one pattern."""
+
+    literal: str
+    group_count: int
+    names: Dict[str, int]
+
+
+def analyze_pattern(pattern: str) -> PatternInfo:
+    """Longest required literal, group count and group names of ``pattern``, from one parse."""
+    parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    literal = max((run.casefold() for run in _literal_runs(parsed)), key=len, default="")
+    return PatternInfo(literal, parsed.state.groups - 1, dict(parsed.state.groupdict))
+
+
+def _literal_runs(parsed) -> List[str]:
+    runs: List[str] = []
+    current: List[str] = []
+
+    def flush() -> None:
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            current.append(chr(av))
+        elif op is sre_constants.AT:
+            continue
+        elif op is sre_constants.SUBPATTERN:
+            flush()
+            runs.extend(_literal_runs(av[-1]))
+        elif op in _REPEATS:
+            flush()
+            if av[0] >= 1:
+                runs.extend(_literal_runs(av[2]))
+        elif op is _ATOMIC_GROUP:
+            flush()
+            runs.extend(_literal_runs(av))
+        else:
+            flush()
+    flush()
+    return runs
+
+
+class _Entry:
+    __slots__ = ("processor", "pattern", "score", "part", "group_count", "names", "literal")
+
+    def __init__(self, processor, pattern, score, part, group_count, names, literal):
+        self.processor = processor
+        self.pattern = pattern
+        self.score = score
+        self.part = part
+        self.group_count = group_count
+        self.names = names
+        self.literal = literal
+
+
+class PatternMatcher:
+    """One compiled alternation over every pattern of every processor.
+
+    Each pattern becomes a ``(?=.*?(?P<_pN>...))`` lookahead anchored at the
+    start of the description, and the alternatives are ordered by precedence
+    score.  A single ``match`` call therefore finds the highest scoring
+    pattern that ``re.search`` would have found anywhere in the text, with
+    ties going to the earlier processor in precedence order and then to the
+    earlier pattern of that processor.  Named groups are renamed to
+    ``_pN__name`` so patterns sharing a group name can live in one expression.
+
+    Before scanning, the longest required literal of each pattern (such as
+    ``"target circle"`` or ``"/lb"``) is looked up in the casefolded
+    description, and only the patterns whose literal occurs, plus those
+    without one, take part in the alternation.  Alternations are compiled
+    lazily per candidate set and kept in a bounded plan cache; the per-pattern
+    analysis can be passed in precomputed as ``pattern_info``.
+    """
+
+    MAX_PLANS = 1024
+
+    def __init__(self, processors: Sequence[Type], score: Callable[[str], int],
+                 pattern_info: Optional[Mapping[str, PatternInfo]] = None) -> None:
+        candidates = []
+        for rank, processor in enumerate(processors):
+            for position, pattern in enumerate(processor.patterns):
+                candidates.append((-score(pattern), rank, position, processor, pattern))
+        candidates.sort(key=lambda c: c[:3])
+
+        self._entries: List[_Entry] = []
+        self._literal_index: Dict[str, int] = {}
+        self._unfiltered = 0
+        for index, (neg_score, _, _, processor, pattern) in enumerate(candidates):
+            info = pattern_info.get(pattern) if pattern_info is not None else None
+            literal, group_count, names = info or analyze_pattern(pattern)
+            part = f"(?=(?s:.*?)(?P<_p{index}>{self._prefix_groups(pattern, f'_p{index}__')}))"
+            self._entries.append(_Entry(processor, pattern, -neg_score, part, group_count, names, literal))
+            if literal:
+                self._literal_index[literal] = self._literal_index.get(literal, 0) | 1 << index
+            else:
+                self._unfiltered |= 1 << index
+
+        self._all = (1 << len(self._entries)) - 1
+        self._plans: Dict[int, Tuple[re.Pattern, Dict[int, _Entry]]] = {}
+
+    @property
+    def pattern(self) -> str:
+        """Source of the alternation over every entry; only compiled when a description needs all of them."""
+        return "|".join(entry.part for entry in self._entries) or r"(?!)"
+
+    @staticmethod
+    def _prefix_groups(pattern: str, prefix: str) -> str:
+        flags = _LEADING_FLAGS.match(pattern)
+        if flags:
+            pattern = f"(?{flags.group('flags')}:{pattern[flags.end():]})"
+        pattern = _GROUP_NAME.sub(lambda m: f"(?P<{prefix}{m.group('name')}>", pattern)
+        return _GROUP_REF.sub(lambda m: f"(?P={prefix}{m.group('name')})", pattern)
+
+    @property
+    def entries(self) -> List[_Entry]:
+        return list(self._entries)
+
+    def _plan(self, mask: int) -> Tuple[re.Pattern, Dict[int, _Entry]]:
+        plan = self._plans.get(mask)
+        if plan is None:
+            parts: List[str] = []
+            markers: Dict[int, _Entry] = {}
+            marker = 1
+            for index, entry in enumerate(self._entries):
+                if mask >> index & 1:
+                    parts.append(entry.part)
+                    markers[marker] = entry
+                    marker += entry.group_count + 1
+            plan = (re.compile("|".join(parts) or r"(?!)", re.IGNORECASE), markers)
+            if len(self._plans) >= self.MAX_PLANS:
+                self._plans.clear()
+            self._plans[mask] = plan
+        return plan
+
+    def candidate_mask(self, description: str) -> int:
+        """Bit mask of the entries whose required literal occurs in ``description``."""
+        folded = description.casefold()
+        mask = self._unfiltered
+        for literal, bits in self._literal_index.items():
+            if literal in folded:
+                mask |= bits
+        return mask
+
+    def candidates(self, description: str) -> List[Tuple[Any, str]]:
+        """``(processor, pattern)`` pairs that ``match`` would evaluate for ``description``."""
+        mask = self.candidate_mask(description) if description else 0
+        return [(entry.processor, entry.pattern) for index, entry in enumerate(self._entries) if mask >> index & 1]
+
+    def plan_for(self, description: str) -> Optional[Tuple[re.Pattern, Dict[int, _Entry]]]:
+        """The compiled alternation ``match`` runs on ``description``, or ``None`` if nothing can match."""
+        if not description:
+            return None
+        mask = self.candidate_mask(description)
+        return self._plan(mask) if mask else None
+
+    def match(self, description: str) -> Tuple[Optional[Type], Optional[PromoMatch], int]:
+        """Return ``(processor, match, score)`` for the winning pattern.
+
+        ``(None, None, -1)`` is returned when no pattern matches.
+        """
+        return self.search(description, self.plan_for(description))
+
+    def search(self, description: str,
+               plan: Optional[Tuple[re.Pattern, Dict[int, _Entry]]]) -> Tuple[Optional[Type], Optional[PromoMatch], int]:
+        """``match`` with the plan from ``plan_for`` already compiled."""
+        if plan is None:
+            return None, None, -1
+        compiled, markers = plan
+        found = compiled.match(description)
+        if found is None:
+            return None, None, -1
+        # The winning lookahead's outer group is the last one to close.
+        marker = found.lastindex
+        entry = markers[marker]
+        groups = found.groups()[marker - 1:marker + entry.group_count]
+        return entry.processor, PromoMatch(entry.pattern, groups, entry.names), entry.score
@@ -0,0 +1,74 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from promo_processor.logs import stop_logging
+from promo_processor.processor import PromoProcessor
+
+DEFAULT_CHUNK_SIZE = 500
+EXECUTORS = ("process", "thread")
+
+
+def _init_worker() -> None:
+    from multiprocessing import util
+
+    PromoProcessor.get_registry()
+    # Workers leave through os._exit, so log this worker's match counters and
+    # hand its remaining log records to the parent from multiprocessing's exit hooks.
+    util.Finalize(None, PromoProcessor.default_session().match_log.flush, exitpriority=20)
+    util.Finalize(None, stop_logging, exitpriority=10)
+
+
+def _process_chunk(chunk: List[Dict[str, Any]], retailer: Optional[str] = None) -> List[Dict[str, Any]]:
+    return PromoProcessor.process_batch(chunk, retailer)
+
+
+def iter_chunks(items: Iterable[Dict[str, Any]], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def process_parallel(items: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE, retailer: Optional[str] = None,
+                     executor: str = "process") -> Iterator[List[Dict[str, Any]]]:
+    """Shard ``items`` across worker processes and yield processed chunks in input order.
+
+    Each worker loads the processor registry once in its initializer.  At most
+    two chunks per worker are in flight, so the input iterable is consumed
+    lazily and memory stays bounded for large feeds.  ``executor="thread"``
+    uses worker threads sharing this process's registry and match cache
+    instead, which starts faster but is bound by the GIL.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return process_chunks(iter_chunks(items, chunk_size), workers, retailer, executor)
+
+
+def process_chunks(chunks: Iterable[List[Dict[str, Any]]], workers: Optional[int] = None,
+                   retailer: Optional[str] = None, executor: str = "process") -> Iterator[List[Dict[str, Any]]]:
+    """``process_parallel`` for input that is already split into chunks."""
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
+    workers = workers or os.cpu_count() or 1
+    if executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="promo-chunk")
+    else:
+        # Built before the pool starts, forked workers inherit the registry instead of loading their own.
+        PromoProcessor.get_registry()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    with pool:
+        pending = deque()
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(_process_chunk, chunk, retailer))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Closing the generator early skips chunks that have not started yet.
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import hashlib
+import logging
+import marshal
+from pathlib import Path
+from typing import Callable, Dict, Iterable, NamedTuple, Optional
+
+from promo_processor.matcher import PatternInfo, analyze_pattern
+
+# Bumped whenever PatternInfo or the analysis behind it changes.
+CACHE_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+class PatternTable(NamedTuple):
+    """Precedence score and matcher analysis of every registered pattern."""
+
+    scores: Dict[str, int]
+    info: Dict[str, PatternInfo]
+
+
+def table_key(patterns: Iterable[str], score: Callable[[str], int]) -> str:
+    """Digest of the patterns, the scoring function's bytecode and the Python version."""
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{sys.version_info[:2]}".encode())
+    digest.update(marshal.dumps(getattr(score, "__wrapped__", score).__code__))
+    for pattern in patterns:
+        digest.update(pattern.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def compute_table(patterns: Iterable[str], score: Callable[[str], int]) -> PatternTable:
+    patterns = list(dict.fromkeys(patterns))
+    return PatternTable({pattern: score(pattern) for pattern in patterns},
+                        {pattern: analyze_pattern(pattern) for pattern in patterns})
+
+
+def load_table(patterns: Iterable[str], score: Callable[[str], int],
+               cache_dir: Optional[Path] = None) -> PatternTable:
+    """``compute_table`` through a JSON cache file keyed by ``table_key``.
+
+    With hundreds of patterns the scoring regexes and ``sre_parse`` runs are
+    most of a cold registry build; a worker or rerun that finds the file
+    only reads it.
+    """
+    from promo_processor.rules import default_cache_dir
+
+    patterns = list(dict.fromkeys(patterns))
+    filename = Path(cache_dir or default_cache_dir()) / f"patterns-{table_key(patterns, score)}.json"
+    try:
+        cached = json.loads(filename.read_text(encoding="utf-8"))
+        table = PatternTable({pattern: cached[pattern][0] for pattern in patterns},
+                             {pattern: PatternInfo(*cached[pattern][1:]) for pattern in patterns})
+    except (OSError, ValueError, KeyError, TypeError):
+        table = None
+    if table is not None:
+        return table
+
+    table = compute_table(patterns, score)
+    try:
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        temporary = filename.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_text(json.dumps({pattern: [table.scores[pattern], *table.info[pattern]]
+                                         for pattern in patterns}), encoding="utf-8")
+        temporary.replace(filename)
+    except OSError as e:
+        logger.warning("Could not cache pattern table %s: %s", filename, e)
+    return table
@@ -0,0 +1,154 @@
+import io
+import csv
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from promo_processor.processor import PromoProcessor
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE, iter_chunks, process_parallel
+from promo_processor.store import ResultStore, process_incremental
+from promo_processor.writers import detect_format, write_records
+
+Source = Union[str, Path, IO]
+
+# CSV cells are always strings; these are the columns the processors do arithmetic on.
+NUMERIC_FIELDS = frozenset(["regular_price", "sale_price", "promo_price", "price", "unit_price", "quantity", "weight"])
+
+
+@contextmanager
+def _open(source: Source):
+    if isinstance(source, (str, Path)):
+        with open(source, encoding="utf-8", newline="") as f:
+            yield f
+    else:
+        yield source
+
+
+def _to_number(value: str) -> Union[int, float, str]:
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+def read_jsonl(source: Source) -> Iterator[Dict[str, Any]]:
+    with _open(source) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(source: Source) -> Iterator[Dict[str, Any]]:
+    with _open(source) as f:
+        if not isinstance(f, io.TextIOBase):
+            f = io.TextIOWrapper(f, encoding="utf-8", newline="")
+        for row in csv.DictReader(f):
+            yield {key: _to_number(value) if key in NUMERIC_FIELDS and value else value
+                   for key, value in row.items()}
+
+
+def read_json(source: Source) -> Iterator[Dict[str, Any]]:
+    with _open(source) as f:
+        data = json.load(f)
+    yield from data if isinstance(data, list) else [data]
+
+
+def _frame_records(frame) -> List[Dict[str, Any]]:
+    # Same clean-up as the Streamlit upload: blank cells become "" and
+    # crawl dates are kept as text.
+    frame = frame.fillna("")
+    if "crawl_date" in frame:
+        frame["crawl_date"] = frame["crawl_date"].astype(str)
+    return frame.to_dict(orient="records")
+
+
+def read_excel(source: Source) -> Iterator[Dict[str, Any]]:
+    import pandas as pd
+
+    yield from _frame_records(pd.read_excel(source))
+
+
+def read_parquet(source: Source) -> Iterator[Dict[str, Any]]:
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(source).iter_batches():
+        yield from _frame_records(batch.to_pandas())
+
+
+READERS = {
+    ".jsonl": read_jsonl,
+    ".ndjson": read_jsonl,
+    ".csv": read_csv,
+    ".json": read_json,
+    ".xlsx": read_excel,
+    ".xls": read_excel,
+    ".parquet": read_parquet,
+    ".pq": read_parquet,
+}
+
+
+def read_records(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Yield records from ``path`` one at a time, picking the reader by suffix.
+
+    JSONL, CSV and Parquet are read incrementally, Parquet one record batch
+    at a time; ``.json`` arrays and Excel sheets have to be loaded whole
+    before their records can be yielded.  Excel needs pandas and Parquet
+    needs pyarrow.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in READERS:
+        raise ValueError(f"Unsupported input format: {suffix}")
+    return READERS[suffix](path)
+
+
+def _output_format(destination: Path) -> Dict[str, Optional[str]]:
+    try:
+        return detect_format(destination)
+    except ValueError:
+        return {"format": "jsonl", "compression": None}
+
+
+def process_stream(records: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   workers: Optional[int] = None, retailer: Optional[str] = None,
+                   store: Optional[ResultStore] = None, executor: str = "process") -> Iterator[Dict[str, Any]]:
+    """Push ``records`` through the processors ``chunk_size`` records at a time.
+
+    With ``workers`` set, chunks are sharded across worker processes, or
+    threads with ``executor="thread"``.  With a ``store``, records it has
+    already seen are merged from it instead.
+    """
+    if store is not None:
+        yield from process_incremental(records, store, chunk_size, workers, retailer, executor)
+        return
+    if workers:
+        chunks = process_parallel(records, workers=workers, chunk_size=chunk_size, retailer=retailer,
+                                  executor=executor)
+    else:
+        chunks = (PromoProcessor.process_batch(chunk, retailer) for chunk in iter_chunks(records, chunk_size))
+    for chunk in chunks:
+        yield from chunk
+
+
+def run_pipeline(source: Union[str, Path], destination: Union[str, Path], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 workers: Optional[int] = None, retailer: Optional[str] = None,
+                 store: Optional[ResultStore] = None, format: Optional[str] = None,
+                 compression: Optional[str] = None, executor: str = "process") -> int:
+    """Read ``source``, process it in chunks and write it to ``destination``.
+
+    The output format follows the destination's suffix (JSON, JSONL,
+    Parquet, Arrow/Feather, optionally ``.gz``/``.bz2``/``.xz``) unless
+    ``format`` is given, and is JSONL for unknown suffixes.  Returns the
+    number of records written.  Only a bounded number of chunks is held in
+    memory at a time, whatever the input size.
+    """
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    if format is None:
+        detected = _output_format(destination)
+        format, compression = detected["format"], compression or detected["compression"]
+    records = process_stream(read_records(source), chunk_size, workers, retailer, store, executor)
+    return write_records(records, destination, format, compression, chunk_size)
@@ -1,27 +1,29 @@
 import re
 import json
 import logging
-import asyncio
-from logging.handlers import RotatingFileHandler
-from typing import Dict, Any, TypeVar, Union, List, Callable, Tuple
+from typing import Dict, Any, TypeVar, Union, List, Callable, Tuple, Iterable, Iterator, Optional
 from pathlib import Path
 from abc import ABC, abstractmethod
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor
 import threading
 import os
+import time
+from promo_processor.matcher import PatternMatcher
+from promo_processor.registry import ProcessorRegistry, normalize_retailer
+from promo_processor.cache import MatchCache
+from promo_processor.brands import BrandMatch
+from promo_processor.stats import ProcessingStats
+from promo_processor.guard import MatchGuard, PatternProfile, profile_patterns
 
 T = TypeVar("T", bound="PromoProcessor")
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-handler = RotatingFileHandler('app.log', maxBytes=1000000, backupCount=10)
-handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logging.getLogger().addHandler(handler)
 
 class PromoProcessor(ABC):
     subclasses = []
     results = []
+    retailers = None
+    RETAILER_FIELD = "retailer"
     _lock = threading.Lock()
     _thread_pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
     NUMBER_MAPPING = {"ONE": 1, "TWO": 2, "THREE": 3, "FOUR": 4, "FIVE": 5, "SIX": 6, "SEVEN": 7, "EIGHT": 8, "NINE": 9, "TEN": 10}
@@ -34,161 +36,176 @@ class PromoProcessor(ABC):
                     "Co Squared", "Best Occasions", "Mash-Up Coffee", "World Table"])
     }
     _compiled_patterns = {}
+    _compile_lock = threading.Lock()
+    _registry = None
+    _match_cache = MatchCache()
+    _stats = ProcessingStats()
+    _match_guard = MatchGuard()
+    _default_session = None
 
-    def __init_subclass__(cls, **kwargs) -> None:
+    def __init_subclass__(cls, register: bool = True, **kwargs) -> None:
         super().__init_subclass__(**kwargs)
-        PromoProcessor.subclasses.append(cls)
+        if register:
+            PromoProcessor.subclasses.append(cls)
     
     def __init__(self) -> None:
         super().__init__()
         self.logger = logging.getLogger(self.__class__.__name__)
-        PromoProcessor.set_processor_precedence()
-        self.update_save()
+
+    @classmethod
+    def applies_to(cls, retailer: str) -> bool:
+        return cls.retailers is None or normalize_retailer(retailer) in {normalize_retailer(r) for r in cls.retailers}
 
     @classmethod
     def apply(cls, func: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> T:
         cls.results = func(cls.results)
         return cls
 
-    def update_save(self):
-        with open("patterns.json", "w") as f:
-            patterns = [pattern for subclass in self.subclasses for pattern in subclass.patterns]
-            json.dump(patterns, f, indent=4)
+    def update_save(self, filename: Union[str, Path] = "patterns.json") -> None:
+        self.get_registry().save_patterns(filename)
 
     @classmethod
-    @lru_cache(maxsize=1024)
     def apply_store_brands(cls, product_title: str) -> str:
-        title_lower = product_title.casefold()
-        for brands in cls._store_brands.values():
-            if any(brand.casefold() in title_lower for brand in brands):
-                return "yes"
-        return "no"
+        return cls.get_registry().store_brands.is_store_brand(product_title)
+
+    @classmethod
+    def match_store_brand(cls, product_title: str) -> Optional[BrandMatch]:
+        return cls.get_registry().store_brands.match(product_title)
 
     @property
     @abstractmethod
     def patterns(self):
         pass
 
+    # The hooks receive the engine's private copy of the record and write the
+    # computed price fields into it in place, returning the same dict; the
+    # record is copied once per item rather than once per hook call.
     @abstractmethod
-    async def calculate_deal(self, item_data: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
+    def calculate_deal(self, item_data: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
         pass
 
     @abstractmethod
-    async def calculate_coupon(self, item_data: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
+    def calculate_coupon(self, item_data: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
         pass
 
+    # Optional column-wise versions of the hooks used by promo_processor.vectorized.
+    # They receive the winning rows' numeric price columns and extracted groups and
+    # return a mapping of output column to values, or None to fall back to rows.
+    def calculate_deal_vectorized(self, frame, groups):
+        return None
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        return None
+
+    @staticmethod
+    def round_column(values, ndigits: int = 2):
+        """Python's ``round`` per value, as the row hooks round.
+
+        ``Series.round`` scales, rounds half to even and scales back, which
+        is a cent off ``round`` for prices like 0.765.
+        """
+        return values.map(lambda value: round(value, ndigits))
+
     @classmethod
-    async def process_item(cls, item_data: Dict[str, Any]) -> T:
-        if isinstance(item_data, list):
-            loop = asyncio.get_event_loop()
-            tasks = [loop.run_in_executor(cls._thread_pool, lambda x: asyncio.run(cls.process_single_item(x)), item) 
-                    for item in item_data]
-            processed_items = await asyncio.gather(*tasks)
-            with cls._lock:
-                cls.results.extend(processed_items)
-        else:
-            processed_item = await cls.process_single_item(item_data)
-            with cls._lock:
-                cls.results.append(processed_item)
+    async def process_item(cls, item_data: Dict[str, Any], retailer: Optional[str] = None, store=None) -> T:
+        await cls.default_session().process_item(item_data, retailer, store)
         return cls
 
     @classmethod
-    async def to_json(cls, filename: Union[str, Path]) -> None:
+    def process_parallel(cls, items: Iterable[Dict[str, Any]], workers: Optional[int] = None,
+                         chunk_size: Optional[int] = None, retailer: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        from promo_processor.parallel import DEFAULT_CHUNK_SIZE, process_parallel
+        for chunk in process_parallel(items, workers=workers, chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                                      retailer=retailer):
+            yield from chunk
+
+    @classmethod
+    async def to_json(cls, filename: Union[str, Path], indent: Optional[int] = 4) -> None:
         if not isinstance(filename, Path):
             filename = Path(filename)
         filename = filename.with_suffix(".json") if not filename.suffix else filename
-        filename.parent.mkdir(parents=True, exist_ok=True)
-        
-        def write_to_file():
-            with open(filename, "w") as f:
-                json.dump(cls.results, f, indent=4)
-                
-        await asyncio.get_event_loop().run_in_executor(cls._thread_pool, write_to_file)
+        await cls.to_file(filename, format="json", indent=indent)
+
+    @classmethod
+    async def to_file(cls, filename: Union[str, Path], format: Optional[str] = None,
+                      compression: Optional[str] = None, **options: Any) -> int:
+        """Stream ``results`` to ``filename`` as JSON, JSONL, Parquet or Arrow IPC/Feather.
+
+        The format and compression default to what the file name says, e.g.
+        ``results.parquet`` or ``results.jsonl.gz``.
+        """
+        return await cls.default_session().to_file(filename, format, compression, **options)
 
     @classmethod
     def _get_compiled_pattern(cls, pattern: str) -> re.Pattern:
-        if pattern not in cls._compiled_patterns:
-            cls._compiled_patterns[pattern] = re.compile(pattern, re.IGNORECASE)
-        return cls._compiled_patterns[pattern]
+        compiled = cls._compiled_patterns.get(pattern)
+        if compiled is None:
+            with cls._compile_lock:
+                compiled = cls._compiled_patterns.get(pattern)
+                if compiled is None:
+                    compiled = cls._compiled_patterns[pattern] = re.compile(pattern, re.IGNORECASE)
+        return compiled
+
+    @classmethod
+    def build_registry(cls) -> ProcessorRegistry:
+        from promo_processor import import_processors
+        import_processors()
+        registry = ProcessorRegistry.build(cls.subclasses, cls.calculate_pattern_precedence, cls._store_brands)
+        # The registry's scores may come from the pattern cache, so they are not recomputed here.
+        for processor_class, precedence in registry.precedence.items():
+            processor_class.PRECEDENCE = precedence
+        PromoProcessor._registry = registry
+        return registry
+
+    @classmethod
+    def get_registry(cls) -> ProcessorRegistry:
+        if PromoProcessor._registry is None:
+            from promo_processor import load_processors
+            return load_processors()
+        return PromoProcessor._registry
+
+    @classmethod
+    def get_matcher(cls) -> PatternMatcher:
+        return cls.get_registry().matcher
 
     @classmethod
     def find_best_match(cls, description: str, patterns: List[str]) -> Tuple[str, re.Match, int]:
-        def process_pattern(pattern):
-            compiled_pattern = cls._get_compiled_pattern(pattern)
-            match = compiled_pattern.search(description)
+        best_result = (None, None, -1)
+        timed = cls._stats.enabled
+        owners = cls.get_registry().pattern_owners if timed else None
+        for pattern in patterns:
+            if timed:
+                started = time.perf_counter_ns()
+            match = cls._get_compiled_pattern(pattern).search(description)
+            if timed:
+                owner = owners.get(pattern)
+                cls._stats.record_pattern(pattern, match is not None, time.perf_counter_ns() - started,
+                                          type(owner).__name__ if owner else None)
             if match:
                 score = cls.calculate_pattern_precedence(pattern)
-                return pattern, match, score
-            return pattern, None, -1
-
-        results = list(cls._thread_pool.map(process_pattern, patterns))
-        best_result = max(results, key=lambda x: x[2])
+                if score > best_result[2]:
+                    best_result = (pattern, match, score)
         return best_result
 
     @classmethod
-    async def process_single_item(cls, item_data: Dict[str, Any]) -> Dict[str, Any]:
-        updated_item = item_data.copy()
-        if not hasattr(cls, "logger"):
-            cls.logger = logging.getLogger(cls.__name__)
-
-        sorted_processors = sorted(cls.subclasses, key=lambda x: getattr(x, 'PRECEDENCE', float('inf')))
-        
-        loop = asyncio.get_event_loop()
-        
-        async def process_description(desc, processor_type):
-            if not desc:
-                return None, None
-                
-            best_processor = None
-            best_match = None
-            best_score = -1
-            
-            async def check_processor(processor_class):
-                processor = processor_class()
-                pattern, match, score = await loop.run_in_executor(
-                    cls._thread_pool, 
-                    cls.find_best_match, 
-                    desc, 
-                    processor.patterns
-                )
-                return processor, match, score
-            
-            tasks = [check_processor(p) for p in sorted_processors]
-            results = await asyncio.gather(*tasks)
-            
-            for processor, match, score in results:
-                if match and score > best_score:
-                    best_score = score
-                    best_match = match
-                    best_processor = processor
-                    
-            return best_processor, best_match
-
-        # Process deals
-        deals_desc = updated_item.get("volume_deals_description", "")
-        best_deal_processor, best_deal_match = await process_description(deals_desc, "DEALS")
-        
-        if best_deal_processor and best_deal_match:
-            cls.logger.info(f"DEALS: {best_deal_processor.__class__.__name__}: {deals_desc}")
-            updated_item = await best_deal_processor.calculate_deal(updated_item, best_deal_match)
-            if updated_item.get("sale_price") == updated_item.get("unit_price"):
-                updated_item["volume_deals_description"] = ""
-                updated_item["volume_deals_price"] = ""
-
-        # Process coupons
-        coupon_desc = updated_item.get("digital_coupon_description", "")
-        best_coupon_processor, best_coupon_match = await process_description(coupon_desc, "COUPONS")
-        
-        if best_coupon_processor and best_coupon_match:
-            cls.logger.info(f"COUPONS: {best_coupon_processor.__class__.__name__}: {coupon_desc}")
-            updated_item = await best_coupon_processor.calculate_coupon(updated_item, best_coupon_match)
-
-        updated_item["store_brand"] = await loop.run_in_executor(
-            cls._thread_pool,
-            cls.apply_store_brands,
-            updated_item["product_title"]
-        )
-        return updated_item
+    def process_batch(cls, items: List[Dict[str, Any]], retailer: Optional[str] = None) -> List[Dict[str, Any]]:
+        return cls.default_session().process_batch(items, retailer)
+
+    @classmethod
+    async def process_single_item(cls, item_data: Dict[str, Any], retailer: Optional[str] = None) -> Dict[str, Any]:
+        return cls.process_record(item_data, retailer)
+
+    @classmethod
+    def process_record(cls, item_data: Dict[str, Any], retailer: Optional[str] = None) -> Dict[str, Any]:
+        return cls.default_session().process_record(item_data, retailer)
+
+    @classmethod
+    def default_session(cls) -> "ProcessingSession":
+        """The session the classmethods run in; create a ``ProcessingSession`` for isolated runs."""
+        if PromoProcessor._default_session is None:
+            from promo_processor.session import DefaultSession
+            PromoProcessor._default_session = DefaultSession()
+        return PromoProcessor._default_session
 
     @staticmethod
     @lru_cache(maxsize=1024)
@@ -213,22 +230,31 @@ class PromoProcessor(ABC):
             )
 
     @classmethod
-    @lru_cache(maxsize=1024)
     def matcher(cls, description: str) -> str:
-        def process_pattern(args):
-            pattern, processor_class = args
-            if cls._get_compiled_pattern(pattern).search(description):
-                return pattern, cls.calculate_pattern_precedence(pattern)
-            return None
-
-        patterns = [(pattern, processor_class) 
-                   for processor_class in cls.subclasses 
-                   for pattern in processor_class.patterns]
-        
-        results = list(cls._thread_pool.map(process_pattern, patterns))
-        valid_results = [r for r in results if r is not None]
-        
-        if not valid_results:
-            return None
-            
-        return max(valid_results, key=lambda x: x[1])[0]
\ No newline at end of file
+        return cls.default_session().matcher(description)
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        return cls._match_cache.stats()
+
+    @classmethod
+    def enable_stats(cls, enabled: bool = True) -> None:
+        """Turn the hot-path instrumentation on or off; it is off by default."""
+        PromoProcessor._stats.enabled = enabled
+
+    @classmethod
+    def reset_stats(cls) -> None:
+        PromoProcessor._stats.reset()
+
+    @classmethod
+    def performance_stats(cls) -> Dict[str, Any]:
+        return cls.default_session().performance_stats()
+
+    @classmethod
+    def configure_guard(cls, max_length: Optional[int] = None, time_budget: Optional[float] = None) -> None:
+        cls.default_session().configure_guard(max_length, time_budget)
+
+    @classmethod
+    def profile_patterns(cls) -> List[PatternProfile]:
+        """Fuzz every registered pattern with adversarial inputs, most expensive first."""
+        return profile_patterns(cls.get_registry().patterns)
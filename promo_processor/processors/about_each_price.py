@@ -6,27 +6,25 @@ class AboutEachPriceProcessor(PromoProcessor):
     
     # Example: "$5.99 Each" or "$2.50 Each"
 
-    async def calculate_deal(self, item, match):
-        item_data = item.copy()
+    def calculate_deal(self, item, match):
         unit_price = float(match.group('unit_price'))
-        quantity = item_data.get("quantity", 1)
+        quantity = item.get("quantity", 1)
         volume_deals_price = unit_price * quantity
         unit_price_calculated = volume_deals_price / quantity
         
-        item_data['volume_deals_price'] = round(volume_deals_price, 2)
-        item_data['unit_price'] = round(unit_price_calculated, 2)
-        item_data['digital_coupon_price'] = ""
+        item['volume_deals_price'] = round(volume_deals_price, 2)
+        item['unit_price'] = round(unit_price_calculated, 2)
+        item['digital_coupon_price'] = ""
         
-        return item_data
+        return item
 
-    async def calculate_coupon(self, item, match):
-        item_data = item.copy()
+    def calculate_coupon(self, item, match):
         unit_price = float(match.group('unit_price'))
-        quantity = item_data.get("quantity", 1)
+        quantity = item.get("quantity", 1)
         volume_deals_price = unit_price * quantity
         unit_price_calculated = volume_deals_price / quantity
         
-        item_data['digital_coupon_price'] = round(unit_price_calculated, 2)
-        item_data["unit_price"] = round(unit_price_calculated, 2)
+        item['digital_coupon_price'] = round(unit_price_calculated, 2)
+        item["unit_price"] = round(unit_price_calculated, 2)
         
-        return item_data
\ No newline at end of file
+        return item
\ No newline at end of file
@@ -7,21 +7,19 @@ class AddTotalForOfferProcessor(PromoProcessor):
     
     # Example: "Add 2 Total For Offer"
 
-    async def calculate_deal(self, item, match):
-        item_data = item.copy()
+    def calculate_deal(self, item, match):
         quantity = int(match.group('quantity'))
-        unit_price = item_data.get("sale_price") or item_data.get("regular_price", 0)
+        unit_price = item.get("sale_price") or item.get("regular_price", 0)
         
-        item_data['volume_deals_price'] = round(unit_price * quantity, 2)
-        item_data['unit_price'] = round(unit_price, 2)
-        item_data['digital_coupon_price'] = ""
-        return item_data
+        item['volume_deals_price'] = round(unit_price * quantity, 2)
+        item['unit_price'] = round(unit_price, 2)
+        item['digital_coupon_price'] = ""
+        return item
 
-    async def calculate_coupon(self, item, match):
-        item_data = item.copy()
+    def calculate_coupon(self, item, match):
         quantity = int(match.group('quantity'))
-        unit_price = item_data.get("unit_price") or item_data.get("sale_price") or item_data.get("regular_price", 0)
+        unit_price = item.get("unit_price") or item.get("sale_price") or item.get("regular_price", 0)
         
-        item_data['digital_coupon_price'] = round(unit_price * quantity, 2)
-        item_data['unit_price'] = round(unit_price, 2)
-        return item_data
\ No newline at end of file
+        item['digital_coupon_price'] = round(unit_price * quantity, 2)
+        item['unit_price'] = round(unit_price, 2)
+        return item
\ No newline at end of file
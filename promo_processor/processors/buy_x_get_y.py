@@ -8,10 +8,9 @@ class BuyGetFreeProcessor(PromoProcessor):
     
     
 
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process 'Buy X Get Y Free' and 'Buy X Get Y % off' specific promotions."""
         
-        item_data = item.copy()
         
         quantity = int(match.group('quantity'))
         free = int(match.group('free'))
@@ -22,31 +21,30 @@ class BuyGetFreeProcessor(PromoProcessor):
             full_price_items = quantity
             discounted_items = free
             
-            full_price_total = item_data['regular_price'] * full_price_items
-            discounted_total = (item_data['regular_price'] * (1 - discount_decimal)) * discounted_items
+            full_price_total = item['regular_price'] * full_price_items
+            discounted_total = (item['regular_price'] * (1 - discount_decimal)) * discounted_items
             volume_deals_price = full_price_total + discounted_total
             total_quantity = quantity + free
         else:
-            volume_deals_price = item_data['regular_price'] * quantity
+            volume_deals_price = item['regular_price'] * quantity
             total_quantity = quantity + free
         
         unit_price = volume_deals_price / total_quantity
         
-        item_data['volume_deals_price'] = round(volume_deals_price, 2)
-        item_data['unit_price'] = round(unit_price, 2)
-        item_data['digital_coupon_price'] = ""
+        item['volume_deals_price'] = round(volume_deals_price, 2)
+        item['unit_price'] = round(unit_price, 2)
+        item['digital_coupon_price'] = ""
         
-        return item_data
+        return item
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Calculate the price after applying a coupon discount for 'Buy X Get Y Free' promotions."""
         # Target Circle Deal : Buy 1, get 1 25%
-        item_data = item.copy()
         
         quantity = int(match.group('quantity'))
         free = int(match.group('free'))
         discount = match.groupdict().get('discount')
-        price = item_data.get('unit_price') or item_data.get("sale_price") or item_data.get("regular_price", 0)
+        price = item.get('unit_price') or item.get("sale_price") or item.get("regular_price", 0)
         
         total_quantity = quantity + free
         
@@ -64,7 +62,43 @@ class BuyGetFreeProcessor(PromoProcessor):
         
             unit_price = volume_deals_price / total_quantity
         
-        item_data['unit_price'] = round(unit_price, 2)
-        item_data['digital_coupon_price'] = round(volume_deals_price, 2)
+        item['unit_price'] = round(unit_price, 2)
+        item['digital_coupon_price'] = round(volume_deals_price, 2)
         
-        return item_data
\ No newline at end of file
+        return item
+
+    def calculate_deal_vectorized(self, frame, groups):
+        """Column-wise 'Buy X Get Y Free' and 'Buy X Get Y % off' deal prices."""
+        quantity = groups['quantity'].astype(int)
+        free = groups['free'].astype(int)
+        regular_price = frame['regular_price']
+        volume_deals_price = regular_price * quantity
+        if 'discount' in groups:
+            discount = groups['discount']
+            discount_decimal = discount.fillna(0).astype(int) / 100
+            discounted_total = (regular_price * (1 - discount_decimal)) * free
+            volume_deals_price = volume_deals_price.where(discount.isna(), volume_deals_price + discounted_total)
+        unit_price = volume_deals_price / (quantity + free)
+        return {
+            "volume_deals_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(unit_price),
+            "digital_coupon_price": "",
+        }
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        """Column-wise coupon prices for 'Buy X Get Y Free' promotions."""
+        quantity = groups['quantity'].astype(int)
+        free = groups['free'].astype(int)
+        price = frame['unit_price'].where(frame['unit_price'] != 0,
+                                          frame['sale_price'].where(frame['sale_price'] != 0, frame['regular_price']))
+        total_quantity = quantity + free
+        volume_deals_price = price * quantity
+        if 'discount' in groups:
+            discount = groups['discount']
+            total_price = price * total_quantity
+            discounted = total_price - total_price * (discount.fillna(0).astype(int) / 100)
+            volume_deals_price = volume_deals_price.where(discount.isna(), discounted)
+        return {
+            "unit_price": self.round_column(volume_deals_price / total_quantity),
+            "digital_coupon_price": self.round_column(volume_deals_price),
+        }
@@ -6,29 +6,42 @@ class CouponDiscountProcessor(PromoProcessor):
     ]
     
     
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process 'Coupon: $X off' type promotions."""        
-        item_data = item.copy()
         discount = float(match.group('discount'))
-        price = item_data.get("promo_price", item_data.get("regular_price", 0))
+        price = item.get("promo_price", item.get("regular_price", 0))
         volume_deals_price = price - discount
         
-        item_data['volume_deals_price'] = round(volume_deals_price, 2)
-        item_data['unit_price'] = round(volume_deals_price / 1, 2)
-        item_data['digital_coupon_price'] = ""
+        item['volume_deals_price'] = round(volume_deals_price, 2)
+        item['unit_price'] = round(volume_deals_price / 1, 2)
+        item['digital_coupon_price'] = ""
         
-        return item_data
+        return item
     
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Process coupon discount calculation."""
         
-        item_data = item.copy()
         discount = float(match.group('discount'))
-        price = item_data.get("promo_price", item_data.get("regular_price", 0))
+        price = item.get("promo_price", item.get("regular_price", 0))
         volume_deals_price = price - discount
         
-        item_data['digital_coupon_price'] = round(volume_deals_price, 2)
-        item_data['unit_price'] = round(volume_deals_price / 1, 2)
-        return item_data
-        
-        
\ No newline at end of file
+        item['digital_coupon_price'] = round(volume_deals_price, 2)
+        item['unit_price'] = round(volume_deals_price / 1, 2)
+        return item
+
+    def calculate_deal_vectorized(self, frame, groups):
+        discount = groups['discount'].astype(float)
+        volume_deals_price = frame.get('promo_price', frame['regular_price']) - discount
+        return {
+            "volume_deals_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(volume_deals_price),
+            "digital_coupon_price": "",
+        }
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        discount = groups['discount'].astype(float)
+        volume_deals_price = frame.get('promo_price', frame['regular_price']) - discount
+        return {
+            "digital_coupon_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(volume_deals_price),
+        }
@@ -4,6 +4,7 @@ from promo_processor.processor import PromoProcessor
 class TargetCircleDealProcessor(PromoProcessor):
     """Processor for Target Circle Deals"""
 
+    retailers = ["target"]
     patterns = [
             r"Target Circle Deal\s*:\s*\$(\d+\.?\d*)\s+price\s+on\s+select\s+(.+)"
         ]
@@ -12,21 +13,19 @@ class TargetCircleDealProcessor(PromoProcessor):
     
     # Example: "Target Circle Deal: $10.99 price on select items"
 
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Calculate the final price after applying a coupon discount."""
-        item_data = item.copy()
         select_price = float(match.group(1))
         
-        item_data['volume_deals_price'] = round(select_price, 2)
-        item_data['unit_price'] = round(select_price, 2)
-        item_data['digital_coupon_price'] = ""
-        return item_data
+        item['volume_deals_price'] = round(select_price, 2)
+        item['unit_price'] = round(select_price, 2)
+        item['digital_coupon_price'] = ""
+        return item
 
-    async def calculate_coupon(self, item, match):
-        item_data = item.copy()
+    def calculate_coupon(self, item, match):
         select_price = float(match.group(1))
         
-        item_data['volume_deals_price'] = round(select_price, 2)
-        item_data['unit_price'] = round(select_price, 2)
-        item_data['digital_coupon_price'] = ""
-        return item_data
\ No newline at end of file
+        item['volume_deals_price'] = round(select_price, 2)
+        item['unit_price'] = round(select_price, 2)
+        item['digital_coupon_price'] = ""
+        return item
\ No newline at end of file
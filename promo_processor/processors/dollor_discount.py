@@ -7,27 +7,43 @@ class DollarDiscountProcessor(PromoProcessor):
     
     
     
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process '$X off' type promotions for deals."""
         
-        item_data = item.copy()
         discount_value = float(match.group('discount'))
-        price = item_data.get('price', 0)  
+        price = item.get('price', 0)  
         volume_deals_price = price - discount_value
         
-        item_data["volume_deals_price"] = round(volume_deals_price, 2)
-        item_data["unit_price"] = round(volume_deals_price / 1, 2)
-        item_data["digital_coupon_price"] = ""
-        return item_data
+        item["volume_deals_price"] = round(volume_deals_price, 2)
+        item["unit_price"] = round(volume_deals_price / 1, 2)
+        item["digital_coupon_price"] = ""
+        return item
         
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Process '$X off' type promotions for coupons."""
-        item_data = item.copy()
         discount_value = float(match.group('discount'))
-        price = item_data.get('unit_price') or item_data.get("sale_price") or item_data.get("regular_price", 0)
+        price = item.get('unit_price') or item.get("sale_price") or item.get("regular_price", 0)
         volume_deals_price = price - discount_value
         
-        item_data["unit_price"] = round(volume_deals_price / 1, 2)
-        item_data["digital_coupon_price"] = round(discount_value, 2)
-        return item_data
\ No newline at end of file
+        item["unit_price"] = round(volume_deals_price / 1, 2)
+        item["digital_coupon_price"] = round(discount_value, 2)
+        return item
+
+    def calculate_deal_vectorized(self, frame, groups):
+        discount_value = groups['discount'].astype(float)
+        volume_deals_price = frame.get('price', 0) - discount_value
+        return {
+            "volume_deals_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(volume_deals_price),
+            "digital_coupon_price": "",
+        }
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        discount_value = groups['discount'].astype(float)
+        price = frame['unit_price'].where(frame['unit_price'] != 0,
+                                          frame['sale_price'].where(frame['sale_price'] != 0, frame['regular_price']))
+        return {
+            "unit_price": self.round_column(price - discount_value),
+            "digital_coupon_price": self.round_column(discount_value),
+        }
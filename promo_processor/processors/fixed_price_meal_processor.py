@@ -7,21 +7,19 @@ class FixedPriceMealProcessor(PromoProcessor):
         r'\$(?P<price>\d+\.?\d*)'
     ]
     
-    async def calculate_deal(self, item: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
-        item_data = item.copy()
+    def calculate_deal(self, item: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
         price = float(match.group('price'))
         
-        item_data["volume_deals_price"] = round(price, 2)
-        item_data["unit_price"] = round(price / 1, 2)
-        item_data["digital_coupon_price"] = "" 
+        item["volume_deals_price"] = round(price, 2)
+        item["unit_price"] = round(price / 1, 2)
+        item["digital_coupon_price"] = "" 
         
-        return item_data
+        return item
     
-    async def calculate_coupon(self, item: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
-        item_data = item.copy()
+    def calculate_coupon(self, item: Dict[str, Any], match: re.Match) -> Dict[str, Any]:
         price = float(match.group('price'))
         
-        item_data["digital_coupon_price"] = round(price, 2)
-        item_data["unit_price"] = round(price / 1, 2)
+        item["digital_coupon_price"] = round(price, 2)
+        item["unit_price"] = round(price / 1, 2)
         
-        return item_data
\ No newline at end of file
+        return item
\ No newline at end of file
@@ -10,27 +10,46 @@ class PercentageDiscountProcessor(PromoProcessor):
     
     
     
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process 'X% off' type promotions."""
-        item_data = item.copy()
         discount_percentage = float(match.group('discount'))
-        discount_amount = item_data.get("sale_price") or item_data.get('regular_price', 0) * (discount_percentage / 100)
-        volume_deals_price = item_data['regular_price'] - discount_amount
+        discount_amount = item.get("sale_price") or item.get('regular_price', 0) * (discount_percentage / 100)
+        volume_deals_price = item['regular_price'] - discount_amount
         
-        item_data["volume_deals_price"] = round(volume_deals_price, 2)
-        item_data["unit_price"] = round(volume_deals_price / 1, 2)
-        item_data["digital_coupon_price"] = ""
-        return item_data
+        item["volume_deals_price"] = round(volume_deals_price, 2)
+        item["unit_price"] = round(volume_deals_price / 1, 2)
+        item["digital_coupon_price"] = ""
+        return item
         
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Calculate the price after applying a coupon for percentage-based discounts."""
-        item_data = item.copy()
         discount_percentage = float(match.group('discount'))
-        price = item_data.get('unit_price') or item_data.get("sale_price") or item_data.get("regular_price", 0)
+        price = item.get('unit_price') or item.get("sale_price") or item.get("regular_price", 0)
         price = float(price) if price else 0
         discount_amount = price * (discount_percentage / 100)
         volume_deals_price = price - discount_amount
         
-        item_data["unit_price"] = round(volume_deals_price / 1, 2)
-        item_data["digital_coupon_price"] = round(volume_deals_price, 2)
-        return item_data
\ No newline at end of file
+        item["unit_price"] = round(volume_deals_price / 1, 2)
+        item["digital_coupon_price"] = round(volume_deals_price, 2)
+        return item
+
+    def calculate_deal_vectorized(self, frame, groups):
+        discount_percentage = groups['discount'].astype(float)
+        sale_price = frame['sale_price']
+        discount_amount = sale_price.where(sale_price != 0, frame['regular_price'] * (discount_percentage / 100))
+        volume_deals_price = frame['regular_price'] - discount_amount
+        return {
+            "volume_deals_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(volume_deals_price),
+            "digital_coupon_price": "",
+        }
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        discount_percentage = groups['discount'].astype(float)
+        price = frame['unit_price'].where(frame['unit_price'] != 0,
+                                          frame['sale_price'].where(frame['sale_price'] != 0, frame['regular_price']))
+        volume_deals_price = price - price * (discount_percentage / 100)
+        return {
+            "unit_price": self.round_column(volume_deals_price),
+            "digital_coupon_price": self.round_column(volume_deals_price),
+        }
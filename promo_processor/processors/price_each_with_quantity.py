@@ -7,27 +7,25 @@ class PriceEachWithQuantityProcessor(PromoProcessor):
     
     
     
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process '$X price each with Y' type promotions for deals."""
-        item_data = item.copy()
         price_each = float(match.group('price'))
         quantity = int(match.group('quantity'))
         total_price = price_each * quantity
         
-        item_data["volume_deals_price"] = round(total_price, 2)
-        item_data["unit_price"] = round(price_each, 2)
-        item_data["digital_coupon_price"] = ""
-        return item_data
+        item["volume_deals_price"] = round(total_price, 2)
+        item["unit_price"] = round(price_each, 2)
+        item["digital_coupon_price"] = ""
+        return item
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Process '$X price each with Y' type promotions for coupons."""
-        item_data = item.copy()
         price_each = float(match.group('price'))
         quantity = int(match.group('quantity'))
-        unit_price = round(item_data['unit_price'] - (price_each / quantity), 2)
+        unit_price = round(item['unit_price'] - (price_each / quantity), 2)
         
-        item_data["unit_price"] = round(unit_price)
-        item_data["digital_coupon_price"] = round(price_each)
-        return item_data
+        item["unit_price"] = round(unit_price)
+        item["digital_coupon_price"] = round(price_each)
+        return item
         
         
\ No newline at end of file
@@ -1,30 +1,47 @@
 from promo_processor.processor import PromoProcessor
 
 class QuantityForPriceProcessor(PromoProcessor):
+    # The lookbehind starts a match only at the first digit of a number; without
+    # it a long run of digits is retried from every position, in quadratic time.
     patterns = [
-        r"(?P<quantity>\d+)\s+For\s+\$(?P<volume_deals_price>\d+(?:\.\d+)?)",
+        r"(?<!\d)(?P<quantity>\d+)\s+For\s+\$(?P<volume_deals_price>\d+(?:\.\d+)?)",
         r"Buy\s+(?P<quantity>\d+)\s+for\s+\$(?P<volume_deals_price>\d+(?:\.\d+)?)"
     ]
     
 
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Calculate promotion price for 'X for $Y' promotions."""
         
-        item_data = item.copy()
         quantity = int(match.group('quantity'))
         volume_deals_price = float(match.group('volume_deals_price'))
         
-        item_data["volume_deals_price"] = round(volume_deals_price, 2)
-        item_data["unit_price"] = round(volume_deals_price / quantity, 2)
-        item_data["digital_coupon_price"] = ""
-        return item_data
+        item["volume_deals_price"] = round(volume_deals_price, 2)
+        item["unit_price"] = round(volume_deals_price / quantity, 2)
+        item["digital_coupon_price"] = ""
+        return item
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Calculate the price after applying a coupon discount."""
-        item_data = item.copy()
         quantity = int(match.group('quantity'))
         volume_deals_price = float(match.group('volume_deals_price'))
         
-        item_data["unit_price"] = round(volume_deals_price / quantity, 2)
-        item_data["digital_coupon_price"] = round(volume_deals_price, 2)
-        return item_data
\ No newline at end of file
+        item["unit_price"] = round(volume_deals_price / quantity, 2)
+        item["digital_coupon_price"] = round(volume_deals_price, 2)
+        return item
+
+    def calculate_deal_vectorized(self, frame, groups):
+        quantity = groups['quantity'].astype(int)
+        volume_deals_price = groups['volume_deals_price'].astype(float)
+        return {
+            "volume_deals_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(volume_deals_price / quantity),
+            "digital_coupon_price": "",
+        }
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        quantity = groups['quantity'].astype(int)
+        volume_deals_price = groups['volume_deals_price'].astype(float)
+        return {
+            "unit_price": self.round_column(volume_deals_price / quantity),
+            "digital_coupon_price": self.round_column(volume_deals_price),
+        }
@@ -7,28 +7,26 @@ class SaveOnQuantityProcessor(PromoProcessor):
         r"(?i)SAVE\s+\$(?P<discount>\d+(?:\.\d+)?)\s+on\s+(?P<quantity>\d+)\s+(?P<product>[\w\s-]+)"
     ]
 
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process '$X SAVE $Y on Z' type promotions."""
-        item_data = item.copy()
         try:
             total_price = float(match.group('total_price'))
         except IndexError:
-            total_price = item_data.get("sale_price", item_data.get("regular_price", 0))
+            total_price = item.get("sale_price", item.get("regular_price", 0))
             
         discount = float(match.group('discount'))
         quantity = float(match.group('quantity'))        
         
         volume_deals_price = total_price - discount
         
-        item_data["volume_deals_price"] = round(volume_deals_price, 2)
-        item_data["unit_price"] = round(volume_deals_price / quantity, 2)
-        item_data["digital_coupon_price"] = ""
-        return item_data
+        item["volume_deals_price"] = round(volume_deals_price, 2)
+        item["unit_price"] = round(volume_deals_price / quantity, 2)
+        item["digital_coupon_price"] = ""
+        return item
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Calculate the price after applying a coupon discount for Save $X on Y promotions."""
-        item_data = item.copy()
-        unit_price = item_data.get("unit_price") or item_data.get("sale_price") or item_data.get("regular_price", 0)
+        unit_price = item.get("unit_price") or item.get("sale_price") or item.get("regular_price", 0)
         if isinstance(unit_price, str) and not unit_price:
             unit_price = 0
         price = float(unit_price)
@@ -37,7 +35,43 @@ class SaveOnQuantityProcessor(PromoProcessor):
         
         unit_price = ((price * quantity) - discount) / quantity
         
-        item_data["unit_price"] = round(unit_price, 2)
-        item_data["digital_coupon_price"] = round(discount, 2)
-        return item_data
-        
\ No newline at end of file
+        item["unit_price"] = round(unit_price, 2)
+        item["digital_coupon_price"] = round(discount, 2)
+        return item
+
+    @staticmethod
+    def _quantity_column(groups):
+        """The quantity group as floats, or None if a row's quantity is a word
+        or 0, which the row hooks reject by raising."""
+        quantity = groups['quantity']
+        if not quantity.str.isdecimal().all():
+            return None
+        quantity = quantity.astype(float)
+        return None if quantity.eq(0).any() else quantity
+
+    def calculate_deal_vectorized(self, frame, groups):
+        quantity = self._quantity_column(groups)
+        if quantity is None:
+            return None
+        if 'total_price' in groups:
+            total_price = groups['total_price'].astype(float)
+        else:
+            total_price = frame['sale_price']
+        volume_deals_price = total_price - groups['discount'].astype(float)
+        return {
+            "volume_deals_price": self.round_column(volume_deals_price),
+            "unit_price": self.round_column(volume_deals_price / quantity),
+            "digital_coupon_price": "",
+        }
+
+    def calculate_coupon_vectorized(self, frame, groups):
+        quantity = self._quantity_column(groups)
+        if quantity is None:
+            return None
+        discount = groups['discount'].astype(float)
+        price = frame['unit_price'].where(frame['unit_price'] != 0,
+                                          frame['sale_price'].where(frame['sale_price'] != 0, frame['regular_price']))
+        return {
+            "unit_price": self.round_column((price * quantity - discount) / quantity),
+            "digital_coupon_price": self.round_column(discount),
+        }
@@ -10,11 +10,10 @@ class SavingsProcessor(PromoProcessor):
 
     
        
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Calculate the volume deals price for a deal."""
-        item_data = item.copy()
         savings_value = float(match.group('savings'))
-        price = item_data.get('sale_price') or item_data.get('regular_price')
+        price = item.get('sale_price') or item.get('regular_price')
         
         price_for_quantity = price * quantity
         savings_value_for_quantity = price_for_quantity - savings_value
@@ -28,17 +27,16 @@ class SavingsProcessor(PromoProcessor):
             volume_deals_price = price - savings_value
             unit_price = volume_deals_price
             
-        item_data["volume_deals_price"] = round(volume_deals_price, 2)
-        item_data["unit_price"] = round(unit_price, 2)
-        item_data["digital_coupon_price"] = ""
-        return item_data
+        item["volume_deals_price"] = round(volume_deals_price, 2)
+        item["unit_price"] = round(unit_price, 2)
+        item["digital_coupon_price"] = ""
+        return item
         
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Calculate the price after applying a coupon discount."""
-        item_data = item.copy()
         savings_value = float(match.group('savings'))
-        price = item_data.get('sale_price') or item_data.get('regular_price')
+        price = item.get('sale_price') or item.get('regular_price')
         
         
         quantity = 1
@@ -52,6 +50,26 @@ class SavingsProcessor(PromoProcessor):
             volume_deals_price = price - savings_value
             unit_price = volume_deals_price
         
-        item_data["unit_price"] = round(unit_price, 2)
-        item_data["digital_coupon_price"] = round(savings_value, 2)
-        return item_data
\ No newline at end of file
+        item["unit_price"] = round(unit_price, 2)
+        item["digital_coupon_price"] = round(savings_value, 2)
+        return item
+
+    # calculate_deal reads quantity before assigning it, so deal rows keep
+    # falling back to it; only the coupon hook has a column-wise version.
+    def calculate_coupon_vectorized(self, frame, groups):
+        savings_value = groups['savings'].astype(float)
+        price = frame['sale_price'].where(frame['sale_price'] != 0, frame['regular_price'])
+        quantity = groups.get('quantity')
+        if quantity is None or quantity.isna().all():
+            unit_price = price - savings_value
+        else:
+            has_quantity = quantity.notna()
+            quantity = quantity.where(has_quantity).astype(float)
+            if quantity.eq(0).any():
+                # The row hook raises ZeroDivisionError for these.
+                return None
+            unit_price = ((price * quantity - savings_value) / quantity).where(has_quantity, price - savings_value)
+        return {
+            "unit_price": self.round_column(unit_price),
+            "digital_coupon_price": self.round_column(savings_value),
+        }
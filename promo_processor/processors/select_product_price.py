@@ -6,25 +6,23 @@ class SelectProductPriceProcessor(PromoProcessor):
     patterns = [r'\$(?P<price>\d+(?:\.\d{2})?)\s+price\s+on\s+select\s+(?P<product>[\w\s-]+)']
     
     
-    async def calculate_deal(self, item, match):
+    def calculate_deal(self, item, match):
         """Process '$X price on select Product' type promotions for deals."""
-        item_data = item.copy()
         select_price = float(match.group('price'))
-        weight = item_data.get('weight', 1)
+        weight = item.get('weight', 1)
         
-        item_data["volume_deals_price"] = round(select_price, 2)
-        item_data["unit_price"] = round(select_price / weight if weight else 1, 2)
-        item_data["digital_coupon_price"] = ""
+        item["volume_deals_price"] = round(select_price, 2)
+        item["unit_price"] = round(select_price / weight if weight else 1, 2)
+        item["digital_coupon_price"] = ""
         
 
-    async def calculate_coupon(self, item, match):
+    def calculate_coupon(self, item, match):
         """Process '$X price on select Product' type promotions for coupons."""
-        item_data = item.copy()
         select_price = float(match.group('price'))
-        weight = item_data.get('weight', 1)
+        weight = item.get('weight', 1)
         
-        item_data["unit_price"] = round(select_price / weight if weight else 1, 2)
-        item_data["digital_coupon_price"] = round(select_price, 2)
-        return item_data
+        item["unit_price"] = round(select_price / weight if weight else 1, 2)
+        item["digital_coupon_price"] = round(select_price, 2)
+        return item
         
        
\ No newline at end of file
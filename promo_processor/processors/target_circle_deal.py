@@ -1,24 +1,23 @@
 from promo_processor.processor import PromoProcessor
 
 class TargetCircleDealProcessor(PromoProcessor):
+    retailers = ["target"]
     patterns = [
         r'Target Circle Deal\s*:\s*Buy\s+(?P<buy_qty>\d+),\s*get\s+(?P<get_qty>\d+)\s+(?P<discount>\d+)%\s+off\s+select\s+(?P<product>[\w\s]+)',
     ]
     
     
-    async def calculate_deal(self, item, match) -> dict:
+    def calculate_deal(self, item, match) -> dict:
         """No volume deals calculation needed for this case"""
-        item_data = item.copy()
-        return item_data
+        return item
 
-    async def calculate_coupon(self, item, match) -> dict:
+    def calculate_coupon(self, item, match) -> dict:
         """Calculate coupon price for buy X get Y Z% off deals"""
-        item_data = item.copy()
         buy_qty = int(match.group('buy_qty'))
         get_qty = int(match.group('get_qty'))
         discount_percent = int(match.group('discount'))
     
-        base_price = item_data.get('sale_price') or item_data.get("regular_price", 0)
+        base_price = item.get('sale_price') or item.get("regular_price", 0)
         
         base_price = float(base_price)
     
@@ -28,6 +27,6 @@ class TargetCircleDealProcessor(PromoProcessor):
     
         unit_price = final_price / (buy_qty + get_qty)
     
-        item_data["digital_coupon_price"] = round(final_price, 2)
-        item_data["unit_price"] = round(unit_price, 2)
-        return item_data
+        item["digital_coupon_price"] = round(final_price, 2)
+        item["unit_price"] = round(unit_price, 2)
+        return item
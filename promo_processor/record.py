@@ -0,0 +1,112 @@
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Mapping
+
+# The fields the engine and the processors' hooks read and write.
+ENGINE_FIELDS = (
+    "product_title", "regular_price", "sale_price", "unit_price",
+    "volume_deals_description", "volume_deals_price",
+    "digital_coupon_description", "digital_coupon_price", "store_brand",
+)
+
+_ENGINE_FIELDS = frozenset(ENGINE_FIELDS)
+_MISSING = object()
+
+
+class PromoRecord(MutableMapping):
+    """Compact, mapping-compatible processing result.
+
+    The input record is kept by reference and never modified; engine fields
+    written by the engine or a hook live in slots and any other written key
+    in a small overflow dict.  Reads fall through to the input, so a result
+    costs a few slots instead of a copy of every passthrough column.  Keys
+    iterate in the order a ``dict`` copy of the input would have them.
+    """
+
+    __slots__ = ENGINE_FIELDS + ("_source", "_extra", "_added")
+
+    def __init__(self, source: Mapping[str, Any]) -> None:
+        self._source = source
+        self._extra = None
+        self._added = ()
+        # Unset slots would make every lookup raise and catch AttributeError.
+        self.product_title = self.regular_price = self.sale_price = self.unit_price = _MISSING
+        self.volume_deals_description = self.volume_deals_price = _MISSING
+        self.digital_coupon_description = self.digital_coupon_price = self.store_brand = _MISSING
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _ENGINE_FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        return self._source[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _ENGINE_FIELDS:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        elif self._extra is not None and key in self._extra:
+            return self._extra[key]
+        return self._source.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _ENGINE_FIELDS:
+            if getattr(self, key) is _MISSING and key not in self._source:
+                self._added += (key,)
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        if key not in self._extra and key not in self._source:
+            self._added += (key,)
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("PromoRecord fields cannot be deleted; use to_dict() for a mutable copy")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._source or key in self._added
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._source
+        yield from self._added
+
+    def __len__(self) -> int:
+        return len(self._source) + len(self._added)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = dict(self._source)
+        result.update(dict.fromkeys(self._added))
+        for field in ENGINE_FIELDS:
+            value = getattr(self, field)
+            if value is not _MISSING:
+                result[field] = value
+        if self._extra:
+            result.update(self._extra)
+        return result
+
+    copy = to_dict
+
+    def __getstate__(self):
+        fields = {field: getattr(self, field) for field in ENGINE_FIELDS if getattr(self, field) is not _MISSING}
+        return self._source, self._extra, self._added, fields
+
+    def __setstate__(self, state) -> None:
+        source, extra, added, fields = state
+        self.__init__(source)
+        self._extra = extra
+        self._added = added
+        for field, value in fields.items():
+            setattr(self, field, value)
+
+    def __repr__(self) -> str:
+        return f"PromoRecord({self.to_dict()!r})"
+
+
+def json_default(value: Any) -> Any:
+    """``default`` for ``json.dumps`` so records serialize like the dicts they stand for."""
+    if isinstance(value, PromoRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,146 @@
+import json
+import hashlib
+import inspect
+import importlib.util
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Mapping, Optional, Tuple, Type, Union
+
+from promo_processor.matcher import PatternInfo, PatternMatcher, PromoMatch, analyze_pattern
+from promo_processor.pattern_cache import load_table
+from promo_processor.brands import StoreBrandMatcher
+
+# Modules besides the processor classes whose code decides a record's output;
+# ``ProcessorRegistry.version`` hashes their source.
+ENGINE_MODULES = ("promo_processor.processor", "promo_processor.session", "promo_processor.matcher",
+                  "promo_processor.brands", "promo_processor.record")
+
+
+def normalize_retailer(retailer: str) -> str:
+    return str(retailer).strip().casefold()
+
+
+@dataclass(frozen=True)
+class ProcessorRegistry:
+    """Immutable snapshot of every registered processor.
+
+    Built once by ``promo_processor.load_processors()``, from the imported
+    processor classes or from the cached manifest; the processing hot path
+    only reads from it.
+    """
+
+    processors: Tuple[Any, ...]
+    precedence: Mapping[Type, int]
+    pattern_scores: Mapping[str, int]
+    matcher: PatternMatcher
+    store_brands: StoreBrandMatcher
+    retailer_matchers: Mapping[str, PatternMatcher]
+
+    @classmethod
+    def build(cls, processor_classes: Iterable[Type], score: Callable[[str], int],
+              store_brands: Mapping[str, Iterable[str]]) -> "ProcessorRegistry":
+        classes = [processor_class for processor_class in dict.fromkeys(processor_classes)
+                   if not inspect.isabstract(processor_class)]
+        table = load_table([pattern for processor_class in classes for pattern in processor_class.patterns], score)
+        pattern_scores = table.scores
+        precedence = {processor_class: max((pattern_scores[p] for p in processor_class.patterns), default=0)
+                      for processor_class in classes}
+        processors = tuple(processor_class() for processor_class in
+                           sorted(classes, key=lambda processor_class: precedence[processor_class]))
+        return cls.assemble(processors, precedence, pattern_scores, store_brands, table.info)
+
+    @classmethod
+    def assemble(cls, processors: Tuple[Any, ...], precedence: Mapping[Type, int], pattern_scores: Mapping[str, int],
+                 store_brands: Mapping[str, Iterable[str]],
+                 pattern_info: Optional[Mapping[str, PatternInfo]] = None) -> "ProcessorRegistry":
+        """Registry over ``processors``, already instantiated and in precedence order.
+
+        Every matcher shares ``pattern_info``; it is computed here if not given.
+        """
+        if pattern_info is None:
+            pattern_info = {pattern: analyze_pattern(pattern) for pattern in pattern_scores}
+        retailers = {normalize_retailer(retailer) for processor in processors for retailer in processor.retailers or ()}
+        retailers.update(normalize_retailer(retailer) for retailer in store_brands)
+        return cls(
+            processors=processors,
+            precedence=MappingProxyType(precedence),
+            pattern_scores=MappingProxyType(pattern_scores),
+            matcher=PatternMatcher(processors, pattern_scores.__getitem__, pattern_info),
+            store_brands=StoreBrandMatcher(store_brands),
+            retailer_matchers=MappingProxyType({
+                retailer: PatternMatcher([processor for processor in processors if processor.applies_to(retailer)],
+                                         pattern_scores.__getitem__, pattern_info)
+                for retailer in sorted(retailers)
+            }),
+        )
+
+    @property
+    def patterns(self) -> Tuple[str, ...]:
+        return tuple(pattern for processor in self.processors for pattern in processor.patterns)
+
+    @cached_property
+    def pattern_owners(self) -> Mapping[str, Any]:
+        """Pattern to the processor singleton that declares it."""
+        return MappingProxyType({pattern: processor for processor in reversed(self.processors)
+                                 for pattern in processor.patterns})
+
+    @cached_property
+    def version(self) -> str:
+        """Digest of everything that decides a record's output: each processor's
+        patterns and the source of its classes (or rule), the precedence order, the
+        store brands and the source of the ``ENGINE_MODULES``."""
+        digest = hashlib.sha256()
+        sources = {}
+        for processor in self.processors:
+            processor_class = type(processor)
+            digest.update(f"{processor_class.__module__}.{processor_class.__qualname__}".encode())
+            digest.update(json.dumps([list(processor.patterns), processor.retailers]).encode())
+            for klass in processor_class.__mro__:
+                if klass.__module__.startswith("promo_processor") and klass not in sources:
+                    rule = klass.__dict__.get("rule")
+                    if rule is not None:
+                        sources[klass] = rule.source
+                        continue
+                    try:
+                        sources[klass] = inspect.getsource(klass)
+                    except (OSError, TypeError):
+                        sources[klass] = klass.__qualname__
+        for source in sorted(sources.values()):
+            digest.update(source.encode())
+        digest.update(self.store_brands.pattern.pattern.encode())
+        for name in ENGINE_MODULES:
+            spec = importlib.util.find_spec(name)
+            try:
+                digest.update(Path(spec.origin).read_bytes())
+            except (AttributeError, OSError, TypeError):
+                digest.update(name.encode())
+        return digest.hexdigest()[:16]
+
+    def scope_for(self, retailer: Optional[str]) -> Optional[str]:
+        """Normalized retailer name if it has its own pattern set, else ``None``."""
+        if not retailer:
+            return None
+        retailer = normalize_retailer(retailer)
+        return retailer if retailer in self.retailer_matchers else None
+
+    def matcher_for(self, retailer: Optional[str] = None) -> PatternMatcher:
+        scope = self.scope_for(retailer)
+        return self.matcher if scope is None else self.retailer_matchers[scope]
+
+    def match(self, description: str, retailer: Optional[str] = None) -> Tuple[Optional[Any], Optional[PromoMatch], int]:
+        """Return the winning processor singleton, its match and score.
+
+        With a known ``retailer`` only processors that apply to it are tried.
+        """
+        return self.matcher_for(retailer).match(description)
+
+    def match_key(self, key: Tuple[Optional[str], str]) -> Tuple[Optional[Any], Optional[PromoMatch], int]:
+        """``match`` for a ``(scope, description)`` cache key."""
+        scope, description = key
+        return self.match(description, scope)
+
+    def save_patterns(self, filename: Union[str, Path] = "patterns.json") -> None:
+        with open(filename, "w") as f:
+            json.dump(list(self.patterns), f, indent=4)
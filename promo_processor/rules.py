@@ -0,0 +1,379 @@
+import os
+import re
+import ast
+import json
+import marshal
+import hashlib
+import logging
+import importlib.util
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Type, Union
+
+from promo_processor.processor import PromoProcessor
+
+RULES_ENV = "PROMO_RULES"
+CACHE_ENV = "PROMO_RULES_CACHE"
+RULE_SUFFIXES = (".json", ".yaml", ".yml")
+# Bumped whenever the generated code changes shape, so stale cached plans are ignored.
+PLAN_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def _number(value: str) -> int:
+    """Digits or a number word such as ``"two"``; unknown words count as 1."""
+    value = value.strip()
+    return int(value) if value.isdigit() else PromoProcessor.NUMBER_MAPPING.get(value.upper(), 1)
+
+
+GROUP_TYPES: Mapping[str, Callable[[str], Any]] = MappingProxyType({
+    "str": str,
+    "int": int,
+    "float": float,
+    "number": _number,
+})
+
+FUNCTIONS: Mapping[str, Callable] = MappingProxyType({
+    "round": round,
+    "min": min,
+    "max": max,
+    "abs": abs,
+    "int": int,
+    "float": float,
+    "str": str,
+})
+
+_RESERVED = frozenset(("item", "match", "self")) | frozenset(FUNCTIONS)
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.USub, ast.UAdd, ast.Not,
+              ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn,
+              ast.Is, ast.IsNot)
+
+
+class RuleError(ValueError):
+    """A rule file or formula is malformed."""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One declarative promo shape.
+
+    ``groups`` maps the named groups the formulas use to a type in
+    ``GROUP_TYPES``; a group missing from the winning pattern is ``None``.
+    ``let`` holds intermediate values, and ``deal`` and ``coupon`` map output
+    fields to the expressions written into the record by ``calculate_deal``
+    and ``calculate_coupon``.
+    """
+
+    name: str
+    patterns: Tuple[str, ...]
+    groups: Mapping[str, str]
+    deal: Mapping[str, str]
+    coupon: Mapping[str, str]
+    let: Mapping[str, str]
+    retailers: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Rule":
+        try:
+            name = data["name"]
+            patterns = data["patterns"]
+        except (KeyError, TypeError) as e:
+            raise RuleError(f"Rule needs a name and patterns: {data!r}") from e
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        retailers = data.get("retailers")
+        if isinstance(retailers, str):
+            retailers = [retailers]
+        return cls(
+            name=str(name),
+            patterns=tuple(str(pattern) for pattern in patterns),
+            groups=dict(data.get("groups") or {}),
+            deal={str(field): str(expression) for field, expression in (data.get("deal") or {}).items()},
+            coupon={str(field): str(expression) for field, expression in (data.get("coupon") or {}).items()},
+            let={str(name): str(expression) for name, expression in (data.get("let") or {}).items()},
+            retailers=tuple(retailers) if retailers is not None else None,
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "patterns": list(self.patterns), "groups": dict(self.groups),
+                "let": dict(self.let), "deal": dict(self.deal), "coupon": dict(self.coupon),
+                "retailers": list(self.retailers) if self.retailers is not None else None}
+
+    @property
+    def source(self) -> str:
+        """Canonical JSON of the rule; part of the registry version."""
+        return json.dumps(self.as_dict(), sort_keys=True)
+
+
+class RuleProcessor(PromoProcessor, register=False):
+    """Base of the processor classes generated from rules.
+
+    Each rule becomes a subclass whose hooks are compiled from its formulas,
+    so rule processors join the registry's combined matcher like hand-written
+    ones and cost nothing extra per record.
+    """
+
+    patterns = ()
+    rule: Optional[Rule] = None
+
+    def calculate_deal(self, item, match):
+        return item
+
+    def calculate_coupon(self, item, match):
+        return item
+
+
+class _FormulaChecker(ast.NodeVisitor):
+    """Rejects everything but arithmetic over known names, ``item[...]``/``item.get(...)`` and ``FUNCTIONS``."""
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names = set(names)
+
+    def generic_visit(self, node: ast.AST) -> None:
+        if isinstance(node, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+                             ast.Load) + _OPERATORS):
+            super().generic_visit(node)
+        else:
+            raise RuleError(f"{type(node).__name__} is not allowed in a formula")
+
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if not isinstance(node.value, (int, float, str, bool, type(None))):
+            raise RuleError(f"Constant {node.value!r} is not allowed in a formula")
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id not in self.names:
+            raise RuleError(f"Unknown name {node.id!r}")
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        if not (isinstance(node.value, ast.Name) and node.value.id == "item"
+                and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str)):
+            raise RuleError("Only item['field'] subscripts are allowed")
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        is_item_get = (isinstance(func, ast.Attribute) and func.attr == "get"
+                       and isinstance(func.value, ast.Name) and func.value.id == "item")
+        if not is_item_get and not (isinstance(func, ast.Name) and func.id in FUNCTIONS):
+            raise RuleError(f"Call to {ast.unparse(func)} is not allowed")
+        if node.keywords:
+            raise RuleError("Keyword arguments are not allowed in a formula")
+        for arg in node.args:
+            self.visit(arg)
+
+
+def _parse_formula(expression: str, names: Iterable[str], where: str) -> ast.expr:
+    try:
+        tree = ast.parse(expression, mode="eval")
+        _FormulaChecker(names).visit(tree)
+    except (SyntaxError, RuleError) as e:
+        raise RuleError(f"{where}: {e}") from e
+    return tree.body
+
+
+def _check_name(name: str, where: str) -> None:
+    if not name.isidentifier() or name.startswith("_") or name in _RESERVED:
+        raise RuleError(f"{where}: {name!r} cannot be used as a name")
+
+
+def _hook_source(function: str, rule: Rule, fields: Mapping[str, str]) -> List[str]:
+    """Source of one hook: convert the groups, evaluate every formula, then write the fields."""
+    lines = [f"def {function}(self, item, match):"]
+    if rule.groups:
+        lines.append("    _g = match.groupdict()")
+    for group, group_type in rule.groups.items():
+        lines.append(f"    {group} = _g.get({group!r})")
+        lines.append(f"    {group} = None if {group} is None else _t_{group_type}({group})")
+    names = list(rule.groups)
+    for name, expression in rule.let.items():
+        tree = _parse_formula(expression, names, f"{rule.name}.let.{name}")
+        lines.append(f"    {name} = {ast.unparse(tree)}")
+        names.append(name)
+    # Like the hand-written hooks, every value is computed before the record is updated.
+    values = []
+    for index, (field, expression) in enumerate(fields.items()):
+        tree = _parse_formula(expression, names, f"{rule.name}.{function.split('_')[0]}.{field}")
+        lines.append(f"    _v{index} = {ast.unparse(tree)}")
+        values.append(f"    item[{field!r}] = _v{index}")
+    lines.extend(values)
+    lines.append("    return item")
+    return lines
+
+
+def _validate(rule: Rule) -> None:
+    groups = set()
+    for pattern in rule.patterns:
+        try:
+            groups.update(re.compile(pattern, re.IGNORECASE).groupindex)
+        except re.error as e:
+            raise RuleError(f"{rule.name}: invalid pattern {pattern!r}: {e}") from e
+    for group, group_type in rule.groups.items():
+        _check_name(group, rule.name)
+        if group_type not in GROUP_TYPES:
+            raise RuleError(f"{rule.name}: unknown type {group_type!r} for group {group!r}")
+        if group not in groups:
+            raise RuleError(f"{rule.name}: group {group!r} is not in any pattern")
+    for name in rule.let:
+        _check_name(name, rule.name)
+        if name in rule.groups:
+            raise RuleError(f"{rule.name}: {name!r} is both a group and a let name")
+
+
+class RulePlan(NamedTuple):
+    """Every rule compiled into one code object defining each rule's hooks."""
+
+    digest: str
+    rules: Tuple[Rule, ...]
+    code: Any
+
+    def hooks(self) -> Dict[str, Callable]:
+        namespace: Dict[str, Any] = {"__builtins__": {}, **FUNCTIONS}
+        namespace.update({f"_t_{name}": convert for name, convert in GROUP_TYPES.items()})
+        exec(self.code, namespace)
+        return namespace
+
+    def processor_classes(self) -> List[Type[RuleProcessor]]:
+        """One ``RuleProcessor`` subclass per rule; defining them registers them."""
+        hooks = self.hooks()
+        return [type(rule.name, (RuleProcessor,), {
+            "__module__": __name__,
+            "__doc__": f"Processor generated from rule {rule.name!r}.",
+            "patterns": list(rule.patterns),
+            "retailers": list(rule.retailers) if rule.retailers is not None else None,
+            "rule": rule,
+            "calculate_deal": hooks[f"deal_{index}"],
+            "calculate_coupon": hooks[f"coupon_{index}"],
+        }) for index, rule in enumerate(self.rules)]
+
+
+def compile_plan(rules: Iterable[Rule], digest: str = "") -> RulePlan:
+    rules = tuple(rules)
+    lines: List[str] = []
+    for index, rule in enumerate(rules):
+        _validate(rule)
+        lines.extend(_hook_source(f"deal_{index}", rule, rule.deal))
+        lines.extend(_hook_source(f"coupon_{index}", rule, rule.coupon))
+    code = compile("\n".join(lines) + "\n", f"<promo rules {digest or 'inline'}>", "exec")
+    return RulePlan(digest, rules, code)
+
+
+def rule_files(paths: Iterable[Union[str, Path]]) -> List[Path]:
+    """Rule files in ``paths``; directories contribute their rule files in name order."""
+    files: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in RULE_SUFFIXES))
+        elif path.is_file():
+            files.append(path)
+        else:
+            raise FileNotFoundError(f"Rule file not found: {path}")
+    return list(dict.fromkeys(files))
+
+
+def read_rules(path: Union[str, Path]) -> List[Rule]:
+    """Rules from a JSON or YAML file holding a list of rules or ``{"rules": [...]}``."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yaml", ".yml"):
+        import yaml
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    if not isinstance(data, list):
+        raise RuleError(f"{path}: expected a list of rules")
+    return [Rule.from_dict(rule) for rule in data]
+
+
+def default_rule_paths() -> List[str]:
+    return [path for path in os.environ.get(RULES_ENV, "").split(os.pathsep) if path]
+
+
+def merge_rule_paths(paths: Iterable[Union[str, Path]]) -> List[str]:
+    """``$PROMO_RULES`` followed by ``paths``, naming each file or directory once."""
+    merged: Dict[str, str] = {}
+    for path in [*default_rule_paths(), *map(str, paths)]:
+        merged.setdefault(os.path.realpath(path), path)
+    return list(merged.values())
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_ENV) or Path.home() / ".cache" / "promo_processor")
+
+
+def _digest(files: Iterable[Path]) -> str:
+    digest = hashlib.sha256(f"{PLAN_VERSION}".encode() + importlib.util.MAGIC_NUMBER)
+    for path in files:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _read_cached(filename: Path, digest: str) -> Optional[RulePlan]:
+    try:
+        version, cached_digest, rules, code = marshal.loads(filename.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if version != PLAN_VERSION or cached_digest != digest:
+        return None
+    return RulePlan(digest, tuple(Rule.from_dict(rule) for rule in rules), code)
+
+
+def _write_cached(filename: Path, plan: RulePlan) -> None:
+    try:
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        temporary = filename.with_suffix(f".{os.getpid()}.tmp")
+        temporary.write_bytes(marshal.dumps((PLAN_VERSION, plan.digest,
+                                             [rule.as_dict() for rule in plan.rules], plan.code)))
+        os.replace(temporary, filename)
+    except OSError as e:
+        logger.warning("Could not cache rule plan %s: %s", filename, e)
+
+
+def load_plan(paths: Iterable[Union[str, Path]], cache_dir: Union[str, Path, None] = None,
+              use_cache: bool = True) -> RulePlan:
+    """Compile the rule files in ``paths`` into one plan.
+
+    The plan is cached in ``cache_dir`` (``$PROMO_RULES_CACHE`` or
+    ``~/.cache/promo_processor``) under a digest of the files and the Python
+    bytecode version, so later starts skip parsing, validation and
+    compilation.  The cache is trusted like ``__pycache__``.
+    """
+    files = rule_files(paths)
+    digest = _digest(files)
+    cached = Path(cache_dir or default_cache_dir()) / f"rules-{digest}.plan"
+    if use_cache:
+        plan = _read_cached(cached, digest)
+        if plan is not None:
+            return plan
+    plan = compile_plan([rule for path in files for rule in read_rules(path)], digest)
+    if use_cache:
+        _write_cached(cached, plan)
+    return plan
+
+
+_loaded: Dict[str, List[Type[RuleProcessor]]] = {}
+
+
+def load_rules(paths: Optional[Iterable[Union[str, Path]]] = None, cache_dir: Union[str, Path, None] = None,
+               use_cache: bool = True) -> List[Type[RuleProcessor]]:
+    """Register a processor class for every rule in ``paths`` (default: ``$PROMO_RULES``).
+
+    Loading the same files again is a no-op.  If the registry was already
+    built it is rebuilt, and the shared match cache cleared, so the new rules
+    take part in matching.
+    """
+    paths = default_rule_paths() if paths is None else list(paths)
+    if not paths:
+        return []
+    plan = load_plan(paths, cache_dir, use_cache)
+    if plan.digest in _loaded:
+        return _loaded[plan.digest]
+    classes = _loaded[plan.digest] = plan.processor_classes()
+    logger.info("Loaded %d promo rules (plan %s)", len(classes), plan.digest)
+    if PromoProcessor._registry is not None:
+        PromoProcessor.build_registry()
+        PromoProcessor._match_cache.clear()
+    return classes
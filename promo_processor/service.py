@@ -0,0 +1,447 @@
+import json
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+
+from promo_processor.record import json_default
+from promo_processor.session import ProcessingSession, SessionConfig
+
+DEFAULT_MAX_BATCH_SIZE = 256
+DEFAULT_MAX_WAIT = 0.005
+DEFAULT_MAX_BODY_SIZE = 64 * 1024 * 1024
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+class BatcherStopped(RuntimeError):
+    """Raised by ``MicroBatcher.submit`` once the batcher has been stopped."""
+
+
+class MicroBatcher:
+    """Collects records submitted by concurrent requests into batches.
+
+    A batch is closed once it holds ``max_batch_size`` records or ``max_wait``
+    seconds after its first record arrived, then processed on a single worker
+    thread, so the event loop keeps accepting requests while the previous
+    batch runs and many small calls share one pass through the engine.
+    Submitting starts the batcher on first use; after ``stop()`` it refuses
+    new records until ``start()`` is called again.
+    """
+
+    def __init__(self, session: ProcessingSession, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MAX_WAIT) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.session = session
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stopped = False
+        self.batches = 0
+        self.records = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        self._stopped = False
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="promo-batch")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Process everything already submitted, then stop."""
+        self._stopped = True
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._executor.shutdown(wait=True)
+        self._task = None
+
+    async def submit(self, item: Dict[str, Any], retailer: Optional[str] = None) -> Dict[str, Any]:
+        return (await self.submit_many([item], retailer))[0]
+
+    async def submit_many(self, items: Sequence[Dict[str, Any]], retailer: Optional[str] = None) -> List[Any]:
+        """Results in input order; a record that failed yields its exception instead of raising."""
+        if self._stopped:
+            raise BatcherStopped("The batcher has been stopped")
+        if not self.running:
+            await self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for item in items:
+            future = loop.create_future()
+            futures.append(future)
+            self._queue.put_nowait((item, retailer, future))
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    entry = self._queue.get_nowait()
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            try:
+                await self._process(batch)
+            except Exception as e:
+                # Keep serving later batches; this one's callers get the error.
+                logger.error("Processing a batch of %d records failed: %r", len(batch), e, exc_info=True)
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _process(self, batch: List[Tuple[Dict[str, Any], Optional[str], asyncio.Future]]) -> None:
+        loop = asyncio.get_running_loop()
+        outcomes = await loop.run_in_executor(self._executor, self._process_batch, batch)
+        self.batches += 1
+        self.records += len(batch)
+        for (_, _, future), (ok, value) in zip(batch, outcomes):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _process_batch(self, batch) -> List[Tuple[bool, Any]]:
+        outcomes = []
+        for item, retailer, _ in batch:
+            try:
+                outcomes.append((True, self.session.process_record(item, retailer)))
+            except Exception as e:
+                outcomes.append((False, e))
+        return outcomes
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait": self.max_wait,
+            "batches": self.batches,
+            "records": self.records,
+            "mean_batch_size": self.records / self.batches if self.batches else 0.0,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class PromoService:
+    """ASGI application around a ``ProcessingSession``.
+
+    Routes:
+
+    * ``POST /process`` takes one JSON record or a JSON array of records and
+      answers with the processed record or array.
+    * ``POST /process/stream`` takes NDJSON and streams NDJSON back, one
+      line per input line, while the request body is still arriving.
+    * ``GET /health`` and ``GET /stats``.
+
+    A ``retailer`` query parameter sets the run-level retailer.  Request
+    bodies over ``max_body_size`` bytes are rejected on both POST routes; a
+    stream that has already answered some lines ends with an error line
+    instead.  Serve it with any ASGI server, e.g.
+    ``uvicorn promo_processor.service:app``.
+    """
+
+    def __init__(self, session: Optional[ProcessingSession] = None, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MAX_WAIT, max_body_size: int = DEFAULT_MAX_BODY_SIZE) -> None:
+        self.session = session or ProcessingSession()
+        self.batcher = MicroBatcher(self.session, max_batch_size, max_wait)
+        self.max_body_size = max_body_size
+        self._routes = {
+            ("POST", "/process"): self._process,
+            ("POST", "/process/stream"): self._process_stream,
+            ("GET", "/health"): self._health,
+            ("GET", "/stats"): self._stats,
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.batcher.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.batcher.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope["path"].rstrip("/") or "/"
+        handler = self._routes.get((scope["method"], path))
+        try:
+            if handler is None:
+                if any(route_path == path for _, route_path in self._routes):
+                    raise HTTPError(405, "Method not allowed")
+                raise HTTPError(404, "Not found")
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            retailer = query.get("retailer", [None])[0]
+            await handler(receive, send, retailer)
+        except HTTPError as e:
+            await _send_json(send, e.status, {"error": str(e)})
+
+    async def _process(self, receive: Receive, send: Send, retailer: Optional[str]) -> None:
+        body = await self._read_body(receive)
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}")
+        batch = isinstance(payload, list)
+        items = payload if batch else [payload]
+        if not all(isinstance(item, dict) for item in items):
+            raise HTTPError(400, "Expected a JSON object or an array of objects")
+        results = await self._submit(items, retailer)
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to process record %d: %r", index, result)
+                message = f"Record {index}: {type(result).__name__}: {result}" if batch else f"{type(result).__name__}: {result}"
+                raise HTTPError(422, message)
+        await _send_json(send, 200, results if batch else results[0])
+
+    async def _process_stream(self, receive: Receive, send: Send, retailer: Optional[str]) -> None:
+        # The response starts with its first output, so errors until then still
+        # get a status; later ones end the stream with an error line.
+        started = False
+
+        async def respond(body: bytes, more_body: bool = True) -> None:
+            nonlocal started
+            if not started:
+                await send({"type": "http.response.start", "status": 200,
+                            "headers": [(b"content-type", b"application/x-ndjson")]})
+                started = True
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+        line_number = 0
+        size = 0
+        buffer = b""
+        more_body = True
+        chunk_size = self.session.config.chunk_size
+        try:
+            while more_body:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                body = message.get("body", b"")
+                size += len(body)
+                if size > self.max_body_size:
+                    raise HTTPError(413, f"Request body larger than {self.max_body_size} bytes")
+                buffer += body
+                more_body = message.get("more_body", False)
+                lines = buffer.split(b"\n")
+                buffer = b"" if not more_body else lines.pop()
+                for start in range(0, len(lines), chunk_size):
+                    chunk = lines[start:start + chunk_size]
+                    output = await self._process_lines(chunk, line_number, retailer)
+                    line_number += len(chunk)
+                    if output:
+                        await respond(output)
+        except HTTPError as e:
+            if not started:
+                raise
+            await respond(json.dumps({"error": str(e), "line": line_number + 1}).encode("utf-8") + b"\n", False)
+            return
+        await respond(b"", more_body=False)
+
+    async def _process_lines(self, lines: List[bytes], first_line: int, retailer: Optional[str]) -> bytes:
+        """NDJSON output for ``lines``; bad lines become ``{"error": ..., "line": n}`` objects."""
+        items, errors = [], {}
+        for offset, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                errors[offset] = f"Invalid JSON: {e}"
+                continue
+            if isinstance(item, dict):
+                items.append((offset, item))
+            else:
+                errors[offset] = "Expected a JSON object"
+        results = await self._submit([item for _, item in items], retailer)
+        for (offset, _), result in zip(items, results):
+            if isinstance(result, Exception):
+                errors[offset] = f"{type(result).__name__}: {result}"
+        output = dict(zip((offset for offset, _ in items), results))
+        output.update((offset, {"error": message, "line": first_line + offset + 1})
+                      for offset, message in errors.items())
+        return "".join(json.dumps(output[offset], separators=(",", ":"), default=json_default) + "\n"
+                       for offset in sorted(output)).encode("utf-8")
+
+    async def _submit(self, items: List[Dict[str, Any]], retailer: Optional[str]) -> List[Any]:
+        try:
+            return await self.batcher.submit_many(items, retailer)
+        except BatcherStopped:
+            raise HTTPError(503, "Service is shutting down")
+
+    async def _health(self, receive: Receive, send: Send, retailer: Optional[str]) -> None:
+        await _send_json(send, 200, {"status": "ok", "batcher": self.batcher.running})
+
+    async def _stats(self, receive: Receive, send: Send, retailer: Optional[str]) -> None:
+        await _send_json(send, 200, {"batcher": self.batcher.stats(), "session": self.session.performance_stats()})
+
+    async def _read_body(self, receive: Receive) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise HTTPError(400, "Client disconnected")
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > self.max_body_size:
+                raise HTTPError(413, f"Request body larger than {self.max_body_size} bytes")
+            chunks.append(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+
+async def _send_json(send: Send, status: int, payload: Any) -> None:
+    body = json.dumps(payload, default=json_default).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]})
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_app(config: Optional[SessionConfig] = None, **options: Any) -> PromoService:
+    return PromoService(ProcessingSession(config), **options)
+
+
+class ServiceResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+    def lines(self) -> List[Any]:
+        return [json.loads(line) for line in self.body.splitlines() if line.strip()]
+
+
+class ServiceClient:
+    """Drives an ASGI app in-process, without a server or sockets.
+
+    ``async with ServiceClient(app) as client`` runs the app's lifespan
+    startup and shutdown around the block::
+
+        async with ServiceClient(create_app()) as client:
+            response = await client.post("/process", json={"product_title": ...})
+    """
+
+    def __init__(self, app: Callable, body_chunk_size: int = 64 * 1024) -> None:
+        self.app = app
+        self.body_chunk_size = body_chunk_size
+        self._lifespan: Optional[asyncio.Task] = None
+        self._lifespan_in: Optional[asyncio.Queue] = None
+        self._lifespan_out: Optional[asyncio.Queue] = None
+
+    async def __aenter__(self) -> "ServiceClient":
+        self._lifespan_in, self._lifespan_out = asyncio.Queue(), asyncio.Queue()
+        self._lifespan = asyncio.get_running_loop().create_task(
+            self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, self._lifespan_in.get, self._lifespan_out.put))
+        await self._lifespan_in.put({"type": "lifespan.startup"})
+        await self._lifespan_out.get()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._lifespan_in.put({"type": "lifespan.shutdown"})
+        await self._lifespan_out.get()
+        await self._lifespan
+
+    async def request(self, method: str, path: str, body: bytes = b"",
+                      headers: Optional[Dict[str, str]] = None) -> ServiceResponse:
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method.upper(),
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in (headers or {}).items()],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        chunks = [body[start:start + self.body_chunk_size]
+                  for start in range(0, len(body), self.body_chunk_size)] or [b""]
+        messages = [{"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+                    for index, chunk in enumerate(chunks)]
+        messages.reverse()
+        status, response_headers, parts = 500, {}, []
+
+        async def receive() -> Dict[str, Any]:
+            if messages:
+                return messages.pop()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status, response_headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_headers = {name.decode("latin-1"): value.decode("latin-1")
+                                    for name, value in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                parts.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return ServiceResponse(status, response_headers, b"".join(parts))
+
+    async def get(self, path: str) -> ServiceResponse:
+        return await self.request("GET", path)
+
+    async def post(self, path: str, json: Any = None, data: bytes = b"",
+                   headers: Optional[Dict[str, str]] = None) -> ServiceResponse:
+        if json is not None:
+            data = _dumps(json)
+            headers = {"content-type": "application/json", **(headers or {})}
+        return await self.request("POST", path, data, headers)
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+app = create_app()
@@ -0,0 +1,247 @@
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from promo_processor.processor import PromoProcessor
+from promo_processor.registry import ProcessorRegistry
+from promo_processor.cache import DEFAULT_CACHE_SIZE, MatchCache
+from promo_processor.guard import DEFAULT_MAX_LENGTH, DEFAULT_TIME_BUDGET, MatchGuard
+from promo_processor.stats import ProcessingStats
+from promo_processor.record import PromoRecord
+from promo_processor.logs import DEFAULT_SAMPLE_EVERY, MatchLog, default_match_log_mode
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE, process_parallel
+
+
+@dataclass
+class SessionConfig:
+    retailer: Optional[str] = None
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    workers: Optional[int] = None
+    cache_size: int = DEFAULT_CACHE_SIZE
+    max_description_length: int = DEFAULT_MAX_LENGTH
+    time_budget: float = DEFAULT_TIME_BUDGET
+    collect_stats: bool = False
+    # "all", "sample", "counters" or "off"; see promo_processor.logs.MatchLog.
+    match_log: str = field(default_factory=default_match_log_mode)
+    log_sample_every: int = DEFAULT_SAMPLE_EVERY
+    # Return PromoRecords that reference the input instead of dict copies of it.
+    compact_records: bool = False
+
+
+class ProcessingSession:
+    """One processing pipeline with its own results, match cache, guard, stats and config.
+
+    Sessions share only the immutable processor registry, so any number of
+    them can run side by side in one process, e.g. one per Streamlit user,
+    without their results interleaving or contending on a common lock.
+    """
+
+    def __init__(self, config: Optional[SessionConfig] = None, registry: Optional[ProcessorRegistry] = None,
+                 cache: Optional[MatchCache] = None, stats: Optional[ProcessingStats] = None,
+                 guard: Optional[MatchGuard] = None) -> None:
+        self.config = config or SessionConfig()
+        self._registry = registry
+        self.cache = cache if cache is not None else MatchCache(self.config.cache_size)
+        self.stats = stats if stats is not None else ProcessingStats()
+        self.guard = guard if guard is not None else MatchGuard(self.config.max_description_length,
+                                                                 self.config.time_budget)
+        if stats is None:
+            self.stats.enabled = self.config.collect_stats
+        self._results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(PromoProcessor.__name__)
+        self.match_log = MatchLog(self.logger, self.config.match_log, self.config.log_sample_every)
+
+    @property
+    def results(self) -> List[Dict[str, Any]]:
+        return self._results
+
+    @results.setter
+    def results(self, results: List[Dict[str, Any]]) -> None:
+        self._results = results
+
+    @property
+    def registry(self) -> ProcessorRegistry:
+        return self._registry or PromoProcessor.get_registry()
+
+    def process_record(self, item_data: Dict[str, Any], retailer: Optional[str] = None) -> Dict[str, Any]:
+        timed = self.stats.enabled
+        match_log = self.match_log
+        if timed:
+            item_started = time.perf_counter_ns()
+        # The only copy of the record; the processors' hooks update it in place.
+        updated_item = PromoRecord(item_data) if self.config.compact_records else item_data.copy()
+
+        registry = self.registry
+        # A run-level retailer wins over the record's own retailer field.
+        scope = registry.scope_for(retailer or self.config.retailer or item_data.get(PromoProcessor.RETAILER_FIELD))
+
+        def process_description(desc, processor_type):
+            if not desc:
+                return None, None
+            key = (scope, desc)
+            processor, match, _ = self.cache.get_or_compute(key, self._guarded_match)
+            return processor, match
+
+        # Process deals
+        deals_desc = updated_item.get("volume_deals_description", "")
+        best_deal_processor, best_deal_match = process_description(deals_desc, "DEALS")
+
+        if best_deal_processor and best_deal_match:
+            if match_log.enabled:
+                match_log.record("DEALS", best_deal_processor, deals_desc)
+            if timed:
+                updated_item = self._timed_calculation(best_deal_processor, best_deal_processor.calculate_deal,
+                                                       updated_item, best_deal_match)
+            else:
+                updated_item = best_deal_processor.calculate_deal(updated_item, best_deal_match)
+            if updated_item.get("sale_price") == updated_item.get("unit_price"):
+                updated_item["volume_deals_description"] = ""
+                updated_item["volume_deals_price"] = ""
+
+        # Process coupons
+        coupon_desc = updated_item.get("digital_coupon_description", "")
+        best_coupon_processor, best_coupon_match = process_description(coupon_desc, "COUPONS")
+
+        if best_coupon_processor and best_coupon_match:
+            if match_log.enabled:
+                match_log.record("COUPONS", best_coupon_processor, coupon_desc)
+            if timed:
+                updated_item = self._timed_calculation(best_coupon_processor, best_coupon_processor.calculate_coupon,
+                                                       updated_item, best_coupon_match)
+            else:
+                updated_item = best_coupon_processor.calculate_coupon(updated_item, best_coupon_match)
+
+        updated_item["store_brand"] = registry.store_brands.is_store_brand(updated_item["product_title"])
+        if timed:
+            self.stats.record_latency(time.perf_counter_ns() - item_started)
+        return updated_item
+
+    def process_batch(self, items: List[Dict[str, Any]], retailer: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [self.process_record(item, retailer) for item in items]
+
+    async def process_item(self, item_data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                           retailer: Optional[str] = None, store=None) -> "ProcessingSession":
+        """Process one record or a list of records and append the output to ``results``."""
+        if isinstance(item_data, list):
+            if store is not None:
+                from promo_processor.store import process_incremental
+                processed_items = list(process_incremental(item_data, store, self.config.chunk_size,
+                                                           retailer=retailer or self.config.retailer))
+            else:
+                processed_items = self.process_batch(item_data, retailer)
+            with self._lock:
+                self.results.extend(processed_items)
+        else:
+            processed_item = self.process_record(item_data, retailer)
+            with self._lock:
+                self.results.append(processed_item)
+        return self
+
+    def process_parallel(self, items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Process ``items`` in worker processes with this session's workers, chunk size and retailer.
+
+        Workers use their own default session, so this session's cache and
+        stats are not involved.
+        """
+        for chunk in process_parallel(items, workers=self.config.workers, chunk_size=self.config.chunk_size,
+                                      retailer=self.config.retailer):
+            yield from chunk
+
+    def apply(self, func: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> "ProcessingSession":
+        self.results = func(self.results)
+        return self
+
+    def clear(self) -> None:
+        with self._lock:
+            self.results = []
+
+    async def to_file(self, filename: Union[str, Path], format: Optional[str] = None,
+                      compression: Optional[str] = None, **options: Any) -> int:
+        import asyncio
+        from promo_processor.writers import write_records
+
+        results = list(self.results)
+        return await asyncio.get_event_loop().run_in_executor(
+            None, lambda: write_records(results, filename, format, compression, **options))
+
+    def matcher(self, description: str) -> Optional[str]:
+        _, match, _ = self.cache.get_or_compute((None, description), self._guarded_match)
+        return match.pattern if match else None
+
+    def _guarded_match(self, key: Tuple[Optional[str], str]) -> Tuple[Any, Any, int]:
+        scope, description = key
+        matcher = self.registry.matcher_for(scope)
+        # Compiled outside the guard, so its time budget only covers the search.
+        plan = matcher.plan_for(description)
+        if self.stats.enabled:
+            return self.guard.run(key, description, lambda key: self._timed_search(matcher, description, plan))
+        return self.guard.run(key, description, lambda key: matcher.search(description, plan))
+
+    def _timed_search(self, matcher, description: str, plan) -> Tuple[Any, Any, int]:
+        candidates = matcher.candidates(description)
+        started = time.perf_counter_ns()
+        result = matcher.search(description, plan)
+        processor, match, _ = result
+        self.stats.record_match(candidates, processor, match.pattern if match else None,
+                                time.perf_counter_ns() - started)
+        return result
+
+    def _timed_calculation(self, processor: PromoProcessor, calculation: Callable, item_data: Dict[str, Any],
+                           match: Any) -> Dict[str, Any]:
+        started = time.perf_counter_ns()
+        try:
+            return calculation(item_data, match)
+        finally:
+            self.stats.record_calculation(processor, time.perf_counter_ns() - started)
+
+    def configure_guard(self, max_length: Optional[int] = None, time_budget: Optional[float] = None) -> None:
+        """Set the description length cap and the match time in seconds above which a match is
+        logged as slow; 0 disables either."""
+        if max_length is not None:
+            self.guard.max_length = self.config.max_description_length = max_length
+        if time_budget is not None:
+            self.guard.time_budget = self.config.time_budget = time_budget
+        self.cache.clear()
+        self.guard.clear()
+
+    def performance_stats(self) -> Dict[str, Any]:
+        """Per-processor and per-pattern counters, latency percentiles, match cache, guard and match log stats."""
+        snapshot = self.stats.snapshot()
+        snapshot["cache"] = self.cache.stats()
+        snapshot["guard"] = self.guard.stats()
+        snapshot["matches"] = self.match_log.counts()
+        return snapshot
+
+
+class DefaultSession(ProcessingSession):
+    """The session behind the ``PromoProcessor`` classmethods.
+
+    Its state lives on the class attributes they have always used
+    (``PromoProcessor.results``, ``_match_cache``, ``_stats`` and
+    ``_match_guard``), so code that reads or reassigns those keeps working.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(cache=PromoProcessor._match_cache, stats=PromoProcessor._stats,
+                         guard=PromoProcessor._match_guard)
+        self._lock = PromoProcessor._lock
+
+    @property
+    def results(self) -> List[Dict[str, Any]]:
+        return PromoProcessor.results
+
+    @results.setter
+    def results(self, results: List[Dict[str, Any]]) -> None:
+        PromoProcessor.results = results
+
+    async def to_file(self, filename: Union[str, Path], format: Optional[str] = None,
+                      compression: Optional[str] = None, **options: Any) -> int:
+        import asyncio
+        from promo_processor.writers import write_records
+
+        return await asyncio.get_event_loop().run_in_executor(
+            PromoProcessor._thread_pool, lambda: write_records(self.results, filename, format, compression, **options))
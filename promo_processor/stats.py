@@ -0,0 +1,151 @@
+import threading
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional
+
+DEFAULT_LATENCY_SAMPLES = 65536
+
+
+class _Counter:
+    __slots__ = ("attempts", "hits", "regex_ns", "calculations", "calc_ns")
+
+    def __init__(self) -> None:
+        self.attempts = 0
+        self.hits = 0
+        self.regex_ns = 0
+        self.calculations = 0
+        self.calc_ns = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.attempts if self.attempts else 0.0,
+            "regex_ms": self.regex_ns / 1e6,
+            "calculations": self.calculations,
+            "calc_ms": self.calc_ns / 1e6,
+            "calc_mean_us": self.calc_ns / self.calculations / 1e3 if self.calculations else 0.0,
+        }
+
+
+def _percentile(samples: List[int], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))] / 1e3
+
+
+class ProcessingStats:
+    """Opt-in counters and timings for the processing hot path.
+
+    Disabled by default; while ``enabled`` is false the engine skips every
+    timer.  Per processor and per pattern it counts regex attempts (patterns
+    that were actually evaluated against a description), hits, regex time and
+    calculation time, and it keeps the most recent ``max_samples`` end-to-end
+    item latencies for percentiles.  Match-cache hits do not touch the regex,
+    so they only show up in the latency distribution.
+    """
+
+    def __init__(self, max_samples: int = DEFAULT_LATENCY_SAMPLES) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._processors: Dict[str, _Counter] = defaultdict(_Counter)
+        self._patterns: Dict[str, _Counter] = defaultdict(_Counter)
+        self._latencies: deque = deque(maxlen=max_samples)
+        self.items = 0
+        self.unmatched_regex_ns = 0
+
+    def record_match(self, candidates: Iterable[Any], winner: Optional[Any], pattern: Optional[str],
+                     elapsed_ns: int) -> None:
+        """Record one combined-alternation scan over ``candidates`` (``(processor, pattern)`` pairs).
+
+        The scan is a single regex call, so its time is charged to the winning
+        pattern and processor, or to ``unmatched_regex_ms`` when nothing matched.
+        """
+        with self._lock:
+            processors = set()
+            for processor, candidate in candidates:
+                processors.add(type(processor).__name__)
+                self._patterns[candidate].attempts += 1
+            for name in processors:
+                self._processors[name].attempts += 1
+            if winner is None:
+                self.unmatched_regex_ns += elapsed_ns
+                return
+            for counter in (self._processors[type(winner).__name__], self._patterns[pattern]):
+                counter.hits += 1
+                counter.regex_ns += elapsed_ns
+
+    def record_pattern(self, pattern: str, hit: bool, elapsed_ns: int, processor: Optional[str] = None) -> None:
+        """Record one standalone ``re.search`` of ``pattern``."""
+        with self._lock:
+            counters = [self._patterns[pattern]]
+            if processor:
+                counters.append(self._processors[processor])
+            for counter in counters:
+                counter.attempts += 1
+                counter.hits += hit
+                counter.regex_ns += elapsed_ns
+
+    def record_calculation(self, processor: Any, elapsed_ns: int) -> None:
+        with self._lock:
+            counter = self._processors[type(processor).__name__]
+            counter.calculations += 1
+            counter.calc_ns += elapsed_ns
+
+    def record_latency(self, elapsed_ns: int) -> None:
+        with self._lock:
+            self.items += 1
+            self._latencies.append(elapsed_ns)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._processors.clear()
+            self._patterns.clear()
+            self._latencies.clear()
+            self.items = 0
+            self.unmatched_regex_ns = 0
+
+    def latency(self) -> Dict[str, Any]:
+        """End-to-end item latency percentiles in microseconds."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        return {
+            "samples": len(samples),
+            "mean_us": sum(samples) / len(samples) / 1e3 if samples else 0.0,
+            "p50_us": _percentile(samples, 0.50),
+            "p95_us": _percentile(samples, 0.95),
+            "p99_us": _percentile(samples, 0.99),
+            "max_us": samples[-1] / 1e3 if samples else 0.0,
+        }
+
+    def histogram(self, buckets: int = 20) -> List[Dict[str, float]]:
+        """Latency histogram as ``[{"upper_us": ..., "count": ...}]`` with log-spaced buckets."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return []
+        low, high = max(samples[0], 1), max(samples[-1], 2)
+        ratio = (high / low) ** (1 / buckets) if high > low else 2.0
+        bounds = [low * ratio ** (index + 1) for index in range(buckets)]
+        counts = [0] * buckets
+        position = 0
+        for sample in samples:
+            while position < buckets - 1 and sample > bounds[position]:
+                position += 1
+            counts[position] += 1
+        return [{"upper_us": bound / 1e3, "count": count} for bound, count in zip(bounds, counts)]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            processors = {name: counter.as_dict() for name, counter in self._processors.items()}
+            patterns = {pattern: counter.as_dict() for pattern, counter in self._patterns.items()}
+            items = self.items
+            unmatched = self.unmatched_regex_ns
+        return {
+            "enabled": self.enabled,
+            "items": items,
+            "unmatched_regex_ms": unmatched / 1e6,
+            "latency": self.latency(),
+            "histogram": self.histogram(),
+            "processors": dict(sorted(processors.items(), key=lambda entry: -entry[1]["regex_ms"] - entry[1]["calc_ms"])),
+            "patterns": dict(sorted(patterns.items(), key=lambda entry: -entry[1]["regex_ms"])),
+        }
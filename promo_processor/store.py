@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from promo_processor.processor import PromoProcessor
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE, iter_chunks, process_chunks
+
+# Every field a processor or the engine reads; two records that agree on
+# these always produce the same computed fields.
+INPUT_FIELDS = (
+    "volume_deals_description",
+    "digital_coupon_description",
+    "regular_price",
+    "sale_price",
+    "product_title",
+    PromoProcessor.RETAILER_FIELD,
+    "unit_price",
+    "volume_deals_price",
+    "digital_coupon_price",
+    "price",
+    "promo_price",
+    "quantity",
+    "weight",
+)
+
+_MISSING = object()
+_QUERY_BATCH = 500
+
+
+def record_key(item: Dict[str, Any], version: str, retailer: Optional[str] = None) -> str:
+    """Content hash of the fields the processors read, the run retailer and the registry version."""
+    fields = [version, retailer, [[field, item[field]] for field in INPUT_FIELDS if field in item]]
+    payload = json.dumps(fields, separators=(",", ":"), sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def changed_fields(item: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of ``result`` that processing added or changed relative to ``item``."""
+    return {key: value for key, value in result.items() if item.get(key, _MISSING) != value}
+
+
+class ResultStore:
+    """Persistent SQLite store of computed fields keyed by ``record_key``.
+
+    Only the fields processing changed are stored, so the cached output of
+    an unchanged record is rebuilt by laying them over today's copy of the
+    record, which keeps its pass-through columns current.  Keys include the
+    registry version, so entries written by another set of processors are
+    never reused; ``prune`` drops them.
+    """
+
+    def __init__(self, path: Union[str, Path], version: Optional[str] = None) -> None:
+        self.path = Path(path)
+        self.version = version or PromoProcessor.get_registry().version
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, version TEXT NOT NULL, "
+                           "fields TEXT NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, item: Dict[str, Any], retailer: Optional[str] = None) -> str:
+        return record_key(item, self.version, retailer)
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for start in range(0, len(unique), _QUERY_BATCH):
+                batch = unique[start:start + _QUERY_BATCH]
+                rows = self._conn.execute(
+                    f"SELECT key, fields FROM results WHERE key IN ({','.join('?' * len(batch))})", batch)
+                found.update((key, json.loads(fields)) for key, fields in rows)
+            self.hits += sum(key in found for key in keys)
+            self.misses += sum(key not in found for key in keys)
+        return found
+
+    def put_many(self, entries: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        rows = [(key, self.version, json.dumps(fields, separators=(",", ":"))) for key, fields in entries]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO results (key, version, fields) VALUES (?, ?, ?)", rows)
+
+    def prune(self) -> int:
+        """Delete entries written by other registry versions; returns how many were removed."""
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM results WHERE version != ?", (self.version,)).rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def process_incremental(records: Iterable[Dict[str, Any]], store: ResultStore, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        workers: Optional[int] = None, retailer: Optional[str] = None,
+                        executor: str = "process") -> Iterator[Dict[str, Any]]:
+    """Process only the records ``store`` has not seen and merge cached output for the rest.
+
+    Output keeps input order.  New results are written back to the store one
+    chunk at a time; with ``workers`` set, only the unseen records of each
+    chunk are sent to the ``executor`` workers.
+    """
+    pending: deque = deque()
+
+    def unseen() -> Iterator[List[Dict[str, Any]]]:
+        for chunk in iter_chunks(records, chunk_size):
+            keys = [store.key(record, retailer) for record in chunk]
+            cached = store.get_many(keys)
+            pending.append((chunk, keys, cached))
+            yield [record for record, key in zip(chunk, keys) if key not in cached]
+
+    if workers:
+        processed_chunks = process_chunks(unseen(), workers, retailer, executor)
+    else:
+        processed_chunks = (PromoProcessor.process_batch(chunk, retailer) for chunk in unseen())
+
+    for processed in processed_chunks:
+        chunk, keys, cached = pending.popleft()
+        fresh = iter(processed)
+        new_entries = []
+        for record, key in zip(chunk, keys):
+            if key not in cached:
+                result = next(fresh)
+                new_entries.append((key, changed_fields(record, result)))
+                yield result
+            else:
+                yield {**record, **cached[key]}
+        store.put_many(new_entries)
@@ -0,0 +1,174 @@
+import re
+from numbers import Number
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from promo_processor.matcher import PatternMatcher, PromoMatch
+from promo_processor.processor import PromoProcessor
+from promo_processor.registry import ProcessorRegistry
+
+NUMERIC_FIELDS = ("regular_price", "sale_price", "promo_price", "price", "unit_price", "quantity", "weight")
+# Price columns the numeric view always has, as 0 when the input lacks them.
+BASE_PRICE_FIELDS = ("regular_price", "sale_price", "unit_price")
+OUTPUT_FIELDS = ("volume_deals_description", "volume_deals_price", "unit_price", "digital_coupon_price")
+_MATCH_COLUMN = "_match"
+
+
+def _extract_pattern(pattern: str) -> str:
+    return f"(?P<{_MATCH_COLUMN}>{PatternMatcher._prefix_groups(pattern, '')})"
+
+
+def match_descriptions(descriptions: pd.Series, matcher: PatternMatcher,
+                       max_length: Optional[int] = None) -> Tuple[pd.Series, Dict[int, pd.DataFrame]]:
+    """Resolve the winning pattern for every row of ``descriptions``.
+
+    Patterns are tried in precedence order with ``Series.str.extract``, each
+    one only on the rows no better pattern has claimed yet and whose text
+    contains the pattern's required literal.  Returns the
+    winning entry position per row (``-1`` for no match) and, per position,
+    the extracted groups of the rows it won.  Group columns keep the original
+    pattern's names, unnamed groups are labelled by their number.  Rows
+    longer than ``max_length`` are left unmatched, as ``MatchGuard`` does.
+    """
+    text = descriptions.fillna("").astype(str)
+    folded = text.str.casefold()
+    winners = pd.Series(-1, index=text.index)
+    pending = text.ne("")
+    if max_length:
+        pending &= text.str.len().le(max_length)
+    groups: Dict[int, pd.DataFrame] = {}
+    for position, entry in enumerate(matcher.entries):
+        if not pending.any():
+            break
+        candidates = pending & folded.str.contains(entry.literal, regex=False) if entry.literal else pending
+        if not candidates.any():
+            continue
+        extracted = text[candidates].str.extract(_extract_pattern(entry.pattern), flags=re.IGNORECASE)
+        hit = extracted[_MATCH_COLUMN].notna()
+        if hit.any():
+            rows = hit.index[hit]
+            winners.loc[rows] = position
+            groups[position] = extracted.loc[rows]
+            pending.loc[rows] = False
+    return winners, groups
+
+
+def _numeric_view(frame: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """Float copies of the price columns with empty values as 0, plus a mask
+    of rows whose price columns only hold numbers or empty values.
+
+    Other columns than ``BASE_PRICE_FIELDS`` are only included when the input
+    has them, so a hook can mirror ``item.get(column, default)`` with
+    ``frame.get(column, default)``.
+    """
+    numeric = pd.DataFrame(index=frame.index)
+    valid = pd.Series(True, index=frame.index)
+    for column in NUMERIC_FIELDS:
+        if column not in frame:
+            if column in BASE_PRICE_FIELDS:
+                numeric[column] = 0.0
+            continue
+        values = frame[column]
+        if values.dtype == object:
+            empty = values.isna() | values.eq("")
+            valid &= empty | values.map(lambda v: isinstance(v, Number) and not isinstance(v, bool))
+            values = values.where(~empty, 0)
+        numeric[column] = pd.to_numeric(values, errors="coerce").fillna(0.0).astype(float)
+    return numeric, valid
+
+
+def _assign(frame: pd.DataFrame, rows: pd.Index, values: Dict[str, Any]) -> None:
+    for column, value in values.items():
+        if column not in frame:
+            frame[column] = ""
+        frame.loc[rows, column] = value
+
+
+def _row_match(entry, groups: pd.Series) -> PromoMatch:
+    return PromoMatch(entry.pattern, tuple(None if pd.isna(value) else value for value in groups), entry.names)
+
+
+def _row_scopes(frame: pd.DataFrame, registry: ProcessorRegistry, retailer: Optional[str]) -> Dict[Optional[str], pd.Index]:
+    """Group row labels by the retailer pattern set that applies to them."""
+    if retailer or PromoProcessor.RETAILER_FIELD not in frame:
+        return {registry.scope_for(retailer): frame.index}
+    values = frame[PromoProcessor.RETAILER_FIELD].fillna("").astype(str)
+    scopes = values.map({value: registry.scope_for(value) or "" for value in values.unique()})
+    return {scope or None: rows for scope, rows in scopes.groupby(scopes).groups.items()}
+
+
+def _apply_stage(frame: pd.DataFrame, column: str, registry: ProcessorRegistry, stage: str,
+                 scopes: Dict[Optional[str], pd.Index]) -> pd.Index:
+    matched = frame.index[:0]
+    if column not in frame:
+        return matched
+    numeric, valid = _numeric_view(frame)
+    for scope, scope_rows in scopes.items():
+        matcher = registry.matcher_for(scope)
+        entries = matcher.entries
+        winners, groups = match_descriptions(frame.loc[scope_rows, column], matcher,
+                                            PromoProcessor._match_guard.max_length)
+        matched = matched.append(winners.index[winners.ne(-1)])
+        for position, extracted in groups.items():
+            entry = entries[position]
+            processor = entry.processor
+            rows = extracted.index
+            vector_rows = rows[valid.loc[rows].to_numpy()]
+            result = None
+            if len(vector_rows):
+                result = getattr(processor, f"calculate_{stage}_vectorized")(
+                    numeric.loc[vector_rows], extracted.loc[vector_rows].drop(columns=_MATCH_COLUMN))
+            if result is None:
+                fallback_rows = rows
+            else:
+                _assign(frame, vector_rows, result)
+                fallback_rows = rows.difference(vector_rows)
+            calculate = getattr(processor, f"calculate_{stage}")
+            # Changed fields are written back one column at a time; per-row .loc
+            # assignment of whole records dominated the run.
+            updates: Dict[str, Dict[int, Any]] = {}
+            for row in fallback_rows:
+                source = frame.loc[row].to_dict()
+                record = calculate(dict(source), _row_match(entry, extracted.loc[row]))
+                for field, value in record.items():
+                    if field not in source or value is not source[field]:
+                        updates.setdefault(field, {})[row] = value
+            for field, values in updates.items():
+                _assign(frame, pd.Index(list(values)), {field: pd.Series(values)})
+    return matched
+
+
+def store_brand_column(titles: pd.Series, registry: Optional[ProcessorRegistry] = None) -> pd.Series:
+    registry = registry or PromoProcessor.get_registry()
+    found = titles.fillna("").astype(str).str.contains(registry.store_brands.contains_pattern)
+    return found.map({True: "yes", False: "no"})
+
+
+def process_dataframe(df: pd.DataFrame, registry: Optional[ProcessorRegistry] = None,
+                      retailer: Optional[str] = None) -> pd.DataFrame:
+    """Columnar counterpart of ``PromoProcessor.process_batch`` for tabular input.
+
+    Matching runs one ``str.extract`` per pattern over the description
+    columns, and processors with ``calculate_*_vectorized`` hooks compute
+    their prices as column arithmetic; the rest fall back to their row-wise
+    hooks.  Rows are routed to their retailer's pattern set like
+    ``process_record`` does.  Missing prices count as 0 in the vectorized
+    hooks.  Returns a new
+    frame; ``df`` is left untouched.
+    """
+    registry = registry or PromoProcessor.get_registry()
+    frame = df.reset_index(drop=True)
+    for column in OUTPUT_FIELDS:
+        frame[column] = frame[column].astype(object) if column in frame else ""
+
+    scopes = _row_scopes(frame, registry, retailer)
+    deal_rows = _apply_stage(frame, "volume_deals_description", registry, "deal", scopes)
+    if len(deal_rows) and "sale_price" in frame:
+        cleared = deal_rows[(frame.loc[deal_rows, "sale_price"] == frame.loc[deal_rows, "unit_price"]).to_numpy()]
+        frame.loc[cleared, ["volume_deals_description", "volume_deals_price"]] = ""
+
+    _apply_stage(frame, "digital_coupon_description", registry, "coupon", scopes)
+    frame["store_brand"] = store_brand_column(frame["product_title"], registry)
+    frame.index = df.index
+    return frame
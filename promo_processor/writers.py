@@ -0,0 +1,324 @@
+import io
+import bz2
+import gzip
+import json
+import lzma
+from numbers import Number
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Type, Union
+
+from promo_processor.parallel import DEFAULT_CHUNK_SIZE, iter_chunks
+from promo_processor.record import ENGINE_FIELDS, json_default
+
+Destination = Union[str, Path, IO[bytes]]
+
+# Price-like columns hold numbers or "" depending on the processor; the
+# columnar writers always store them as nullable floats.
+FLOAT_FIELDS = frozenset([
+    "regular_price", "sale_price", "promo_price", "price", "unit_price", "quantity", "weight",
+    "volume_deals_price", "digital_coupon_price",
+])
+
+COMPRESSORS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+_COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+class ResultWriter:
+    """Writes result records to a file one chunk at a time.
+
+    Subclasses implement ``_write`` and ``_close``; ``destination`` is a path
+    or a binary file object, which is left open.
+    """
+
+    format = ""
+    suffixes = ()
+
+    def __init__(self, destination: Destination, compression: Optional[str] = None) -> None:
+        self.destination = destination
+        self.compression = compression
+        self.count = 0
+        self._closed = False
+
+    def write(self, records: Sequence[Dict[str, Any]]) -> None:
+        if records:
+            self._write(records)
+            self.count += len(records)
+
+    def write_all(self, records: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        for chunk in iter_chunks(records, chunk_size):
+            self.write(chunk)
+        return self.count
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._close()
+
+    def _write(self, records: Sequence[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class _TextWriter(ResultWriter):
+    def __init__(self, destination: Destination, compression: Optional[str] = None) -> None:
+        super().__init__(destination, compression)
+        if compression and compression not in COMPRESSORS:
+            raise ValueError(f"Unsupported compression for {self.format}: {compression}")
+        owns = isinstance(destination, (str, Path))
+        if owns:
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+        if compression:
+            self._binary = COMPRESSORS[compression](destination, "wb")
+        else:
+            self._binary = open(destination, "wb") if owns else destination
+        self._owns_binary = owns or bool(compression)
+        self._stream = io.TextIOWrapper(self._binary, encoding="utf-8", newline="\n", write_through=False)
+
+    def _close(self) -> None:
+        self._stream.flush()
+        if self._owns_binary:
+            self._stream.close()
+        else:
+            self._stream.detach()
+
+
+class JsonWriter(_TextWriter):
+    """A JSON array, streamed record by record; ``indent=None`` writes it compactly."""
+
+    format = "json"
+    suffixes = (".json",)
+
+    def __init__(self, destination: Destination, compression: Optional[str] = None,
+                 indent: Optional[int] = None) -> None:
+        super().__init__(destination, compression)
+        self.indent = indent
+        self._separators = None if indent is not None else (",", ":")
+        self._delimiter = ""
+        self._stream.write("[")
+
+    def _write(self, records: Sequence[Dict[str, Any]]) -> None:
+        for record in records:
+            text = json.dumps(record, indent=self.indent, separators=self._separators, default=json_default)
+            if self.indent is not None:
+                # Same layout as json.dumps(records, indent=indent).
+                text = "\n" + " " * self.indent + text.replace("\n", "\n" + " " * self.indent)
+            self._stream.write(self._delimiter + text)
+            self._delimiter = ","
+
+    def _close(self) -> None:
+        self._stream.write("\n]" if self.indent is not None and self.count else "]")
+        super()._close()
+
+
+class JsonlWriter(_TextWriter):
+    """Newline-delimited compact JSON, one record per line."""
+
+    format = "jsonl"
+    suffixes = (".jsonl", ".ndjson")
+
+    def _write(self, records: Sequence[Dict[str, Any]]) -> None:
+        self._stream.writelines(json.dumps(record, separators=(",", ":"), default=json_default) + "\n"
+                                for record in records)
+
+
+class _ArrowWriter(ResultWriter):
+    """Shared schema handling of the pyarrow based writers.
+
+    The schema is fixed by the first chunk plus the engine's output fields,
+    which a chunk may lack when none of its records matched a promotion.
+    Price columns are nullable floats with ``""`` stored as null unless they
+    hold text; other columns take the type of their values and fall back to
+    strings when a column mixes types.  A later value that does not fit its
+    column, or a column the schema lacks, raises ``ValueError`` rather than
+    being dropped; write such data as JSON or JSONL instead.
+    """
+
+    def __init__(self, destination: Destination, compression: Optional[str] = None) -> None:
+        super().__init__(destination, compression)
+        import pyarrow as pa
+
+        self._pa = pa
+        self._schema = None
+        self._writer = None
+        if isinstance(destination, (str, Path)):
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+            self._sink = str(destination)
+        else:
+            self._sink = destination
+
+    def _infer_type(self, name: str, values: List[Any]):
+        pa = self._pa
+        present = [value for value in values if value is not None]
+        if name in FLOAT_FIELDS:
+            return pa.float64() if all(_fits_float(value) for value in present) else pa.string()
+        if present and all(isinstance(value, bool) for value in present):
+            return pa.bool_()
+        if present and all(isinstance(value, int) and not isinstance(value, bool) for value in present):
+            return pa.int64()
+        if present and all(isinstance(value, Number) and not isinstance(value, bool) for value in present):
+            return pa.float64()
+        return pa.string()
+
+    def _convert(self, name: str, values: List[Any], type_) -> List[Any]:
+        pa = self._pa
+        if type_ == pa.string():
+            return [value if value is None or isinstance(value, str)
+                    else json.dumps(value, default=json_default) if isinstance(value, (dict, list))
+                    else str(value) for value in values]
+        if type_ == pa.float64():
+            fits = _fits_float
+        elif type_ == pa.int64():
+            fits = _fits_int
+        else:
+            fits = _fits_bool
+        for value in values:
+            if not fits(value):
+                raise ValueError(f"Column {name!r} was inferred as {type_} from the first chunk, "
+                                 f"which cannot hold {value!r}; write this data as JSON or JSONL")
+        if type_ == pa.float64():
+            return [None if value is None or value == "" else float(value) for value in values]
+        if type_ == pa.int64():
+            return [None if value is None or value == "" else int(value) for value in values]
+        return [None if value is None or value == "" else value for value in values]
+
+    def _batch(self, records: Sequence[Dict[str, Any]]):
+        pa = self._pa
+        if self._schema is None:
+            names = list(dict.fromkeys([*(name for record in records for name in record), *ENGINE_FIELDS]))
+            self._schema = pa.schema([pa.field(name, self._infer_type(name, [record.get(name) for record in records]))
+                                      for name in names])
+            self._open(self._schema)
+        else:
+            extra = {name for record in records for name in record} - set(self._schema.names)
+            if extra:
+                raise ValueError(f"Columns not present in the first chunk: {', '.join(sorted(extra))}; "
+                                 f"write this data as JSON or JSONL")
+        arrays = [pa.array(self._convert(field.name, [record.get(field.name) for record in records], field.type),
+                           type=field.type)
+                  for field in self._schema]
+        return pa.RecordBatch.from_arrays(arrays, schema=self._schema)
+
+    def _open(self, schema) -> None:
+        raise NotImplementedError
+
+
+def _fits_float(value: Any) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, Number):
+        return True
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _fits_int(value: Any) -> bool:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or isinstance(value, float) and value.is_integer()
+
+
+def _fits_bool(value: Any) -> bool:
+    return value is None or value == "" or isinstance(value, bool)
+
+
+class ParquetWriter(_ArrowWriter):
+    """Parquet with one row group per chunk; ``compression`` defaults to snappy."""
+
+    format = "parquet"
+    suffixes = (".parquet", ".pq")
+
+    def _open(self, schema) -> None:
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(self._sink, schema, compression=self.compression or "snappy")
+
+    def _write(self, records: Sequence[Dict[str, Any]]) -> None:
+        batch = self._batch(records)  # opens the writer on the first chunk
+        self._writer.write_table(self._pa.Table.from_batches([batch]))
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ArrowWriter(_ArrowWriter):
+    """Arrow IPC file format, which is also Feather v2; ``compression`` is ``lz4`` or ``zstd``."""
+
+    format = "arrow"
+    suffixes = (".arrow", ".feather", ".ipc")
+
+    def _open(self, schema) -> None:
+        options = self._pa.ipc.IpcWriteOptions(compression=self.compression) if self.compression else None
+        self._writer = self._pa.ipc.new_file(self._sink, schema, options=options)
+
+    def _write(self, records: Sequence[Dict[str, Any]]) -> None:
+        batch = self._batch(records)  # opens the writer on the first chunk
+        self._writer.write_batch(batch)
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+WRITERS: Dict[str, Type[ResultWriter]] = {
+    "json": JsonWriter,
+    "jsonl": JsonlWriter,
+    "parquet": ParquetWriter,
+    "arrow": ArrowWriter,
+    "feather": ArrowWriter,
+}
+
+
+def detect_format(path: Union[str, Path]) -> Dict[str, Optional[str]]:
+    """``{"format": ..., "compression": ...}`` from a file name such as ``results.jsonl.gz``."""
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    compression = _COMPRESSION_SUFFIXES.get(suffixes[-1]) if suffixes else None
+    if compression:
+        suffixes = suffixes[:-1]
+    suffix = suffixes[-1] if suffixes else ""
+    for name, writer in WRITERS.items():
+        if suffix in writer.suffixes:
+            return {"format": name, "compression": compression}
+    raise ValueError(f"Unsupported output format: {suffix or path}")
+
+
+def open_writer(destination: Destination, format: Optional[str] = None, compression: Optional[str] = None,
+                **options: Any) -> ResultWriter:
+    """Writer for ``destination``; the format and compression default to what its file name says."""
+    if format is None:
+        if not isinstance(destination, (str, Path)):
+            raise ValueError("format is required when writing to a file object")
+        detected = detect_format(destination)
+        format, compression = detected["format"], compression or detected["compression"]
+    if format not in WRITERS:
+        raise ValueError(f"Unsupported output format: {format}")
+    return WRITERS[format](destination, compression, **options)
+
+
+def write_records(records: Iterable[Dict[str, Any]], destination: Destination, format: Optional[str] = None,
+                  compression: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, **options: Any) -> int:
+    """Stream ``records`` to ``destination`` ``chunk_size`` records at a time; returns the count."""
+    with open_writer(destination, format, compression, **options) as writer:
+        return writer.write_all(records, chunk_size)
+
+
+def to_bytes(records: Iterable[Dict[str, Any]], format: str, compression: Optional[str] = None,
+             **options: Any) -> bytes:
+    buffer = io.BytesIO()
+    write_records(records, buffer, format, compression, **options)
+    return buffer.getvalue()
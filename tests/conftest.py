@@ -0,0 +1,31 @@
+import os
+import logging
+import tempfile
+
+import pytest
+
+# Rule plans, the manifest and the pattern table go to a scratch directory
+# rather than the user's cache; set before promo_processor reads it.
+os.environ.setdefault("PROMO_RULES_CACHE", tempfile.mkdtemp(prefix="promo-tests-"))
+os.environ.setdefault("PROMO_MATCH_LOG", "off")
+
+import promo_processor  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.fixture(scope="session")
+def registry():
+    return promo_processor.load_processors()
+
+
+@pytest.fixture
+def fresh_session():
+    def make(**config):
+        return promo_processor.ProcessingSession(promo_processor.SessionConfig(**config))
+    return make
@@ -0,0 +1,36 @@
+from typing import Any, Callable, Dict
+
+DESCRIPTIONS = sorted({
+    "", " ", "Rollback", "Clearance", "Limit 4 per customer", "20% OFF PAPER TOWELS - $3.58 EACH",
+    "  20% OFF PAPER TOWELS - $3.58 EACH", " Deal: 15% off", "Deal: 25% off", "Save 20% on coffee",
+    "40% off yogurt", "Buy 2, Get 1 Free", "Buy 2, Get 1 Free and save $1.00", "Buy 1, get 1 50% off",
+    "Buy 3 get 20% off", "2 For $5.00", "Buy 3 for $10.00", "2 For $5.00 or $3.00 Each", "$2.49 Each",
+    "$1.99/lb", "$3.49/lb When you buy TWO (1)", "$4.99 When you buy TWO (1)", "$6.99 When you buy THREE",
+    "Add 3 Total For Offer", "Coupon: $2.00 off", "$1.00 off", "$2.50 price each when you buy 3",
+    "$9.99 SAVE $2.00 on 3 (2)", "Save $1.00 on 2 coffee", "Spend $30 Save $5 on pet food", "Save $1.50",
+    "Deal: $3.99 price on cereal", "$4.49 price on select snacks", "$12 meal deal",
+    "Target Circle Deal: Buy 1, get 1 50% off select snacks", "TARGET CIRCLE: 15% OFF YOGURT",
+    "Target Circle Deal: 20% off snacks", "Target Circle Deal: Save 25% on coffee - 4pk",
+    "Target Circle Deal: $2.99 price on cereal", "Target Circle Coupon: $3 off",
+})
+
+
+def make_item(deal: str = "", coupon: str = "", regular_price: Any = 10, sale_price: Any = 8,
+              **fields: Any) -> Dict[str, Any]:
+    item = {
+        "product_title": "Bounty Paper Towels 8 oz",
+        "regular_price": regular_price,
+        "sale_price": sale_price,
+        "volume_deals_description": deal,
+        "digital_coupon_description": coupon,
+    }
+    item.update(fields)
+    return item
+
+
+def process_or_error(process: Callable[[Dict[str, Any]], Any], item: Dict[str, Any]) -> Any:
+    """``process(item)``, or the exception type's name for the records some processors reject."""
+    try:
+        return process(item)
+    except Exception as e:
+        return type(e).__name__
@@ -0,0 +1,38 @@
+import warnings
+
+import pytest
+
+from promo_processor.brands import StoreBrandMatcher
+from promo_processor.processor import PromoProcessor
+
+TITLES = ["Great Value Milk 1 gal", "great value eggs", "Good & Gather Pasta", "Bounty Paper Towels",
+          "Simple Truth Organic Milk", "", None, "Up & Up Wipes", "Marketside Salad"]
+
+
+@pytest.fixture
+def matcher():
+    return StoreBrandMatcher({"walmart": ["Great Value", "Marketside"], "target": ["Good & Gather", "Up & Up"],
+                              "marianos": ["Simple Truth"]})
+
+
+def test_match_reports_retailer_and_brand(matcher):
+    assert matcher.match("GREAT VALUE Milk") == ("walmart", "Great Value")
+    assert matcher.match("Bounty") is None
+    assert [matcher.is_store_brand(title) for title in TITLES] == [
+        "yes", "yes", "yes", "no", "yes", "no", "no", "yes", "yes"]
+
+
+def test_longest_brand_wins(registry):
+    assert PromoProcessor.match_store_brand("Simple Truth Organic Milk") == ("marianos", "Simple Truth Organic")
+    assert PromoProcessor.apply_store_brands("Kindfull Dog Treats") == "yes"
+
+
+def test_store_brand_column_matches_rows_without_warnings(registry):
+    pd = pytest.importorskip("pandas")
+    from promo_processor.vectorized import store_brand_column
+
+    titles = pd.Series(TITLES + [f"{brand.upper()} Snacks" for brand in registry.store_brands._by_text])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        column = store_brand_column(titles, registry)
+    assert column.tolist() == [registry.store_brands.is_store_brand(title) for title in titles]
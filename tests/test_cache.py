@@ -0,0 +1,52 @@
+import pytest
+
+from promo_processor.cache import MatchCache
+from tests.helpers import make_item, process_or_error
+
+# Spacing the patterns are sensitive to: ``^`` anchors and ``\s+`` lookaheads.
+WHITESPACE_VARIANTS = [
+    ["20% OFF PAPER TOWELS - $3.58 EACH", "  20% OFF PAPER TOWELS - $3.58 EACH",
+     "20% OFF PAPER TOWELS - $3.58 EACH  ", "20%  OFF  PAPER TOWELS  -  $3.58 EACH"],
+    ["Deal: 15% off", " Deal: 15% off", "Deal:  15% off", "Deal: 15% off "],
+    ["2 For $5.00", " 2 For $5.00", "2  For  $5.00", "2 For $5.00\t"],
+    ["Buy 2, Get 1 Free", "  Buy 2, Get 1 Free", "Buy 2,  Get 1 Free"],
+    ["Save $1.00 on 2 paper towels", " Save $1.00 on 2 paper towels", "Save $1.00 on  2 paper towels"],
+]
+
+
+@pytest.mark.parametrize("variants", WHITESPACE_VARIANTS)
+@pytest.mark.parametrize("field", ["deal", "coupon"])
+def test_cached_results_match_uncached_for_whitespace_variants(registry, fresh_session, variants, field):
+    uncached = fresh_session(cache_size=0)
+    expected = [process_or_error(uncached.process_record, make_item(**{field: description}))
+                for description in variants]
+    for order in (variants, variants[::-1]):
+        session = fresh_session()
+        for _ in range(2):
+            got = {description: process_or_error(session.process_record, make_item(**{field: description}))
+                   for description in order}
+            assert [got[description] for description in variants] == expected
+
+
+def test_match_runs_on_the_raw_description(registry, fresh_session):
+    session = fresh_session()
+    for description in [variant for variants in WHITESPACE_VARIANTS for variant in variants]:
+        processor, match = registry.match(description)[:2]
+        assert session.matcher(description) == (match.pattern if match else None)
+
+
+def test_leading_whitespace_keeps_baseline_winner(registry, fresh_session):
+    session = fresh_session()
+    item = session.process_record(make_item("  20% OFF PAPER TOWELS - $3.58 EACH"))
+    assert item["unit_price"] == 3.58
+    assert session.process_record(make_item(" Deal: 15% off")).get("volume_deals_price") in (None, "")
+
+
+def test_lru_eviction_and_stats():
+    cache = MatchCache(maxsize=2)
+    calls = []
+    compute = lambda key: calls.append(key) or key.upper()
+    assert [cache.get_or_compute(key, compute) for key in ("a", "b", "a", "c", "b")] == ["A", "B", "A", "C", "B"]
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (1, 4, 2, 2)
@@ -0,0 +1,85 @@
+import os
+import sys
+import json
+import subprocess
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from promo_processor.cli import expand_inputs, main
+from promo_processor.pipeline import read_jsonl
+from promo_processor.processor import PromoProcessor
+from tests.helpers import make_item
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RULES_RUN = """
+import os
+import sys
+from promo_processor.cli import main
+from promo_processor.processor import PromoProcessor
+from promo_processor.rules import RULES_ENV, RuleProcessor
+
+assert main(sys.argv[1:]) == 0
+print(os.environ[RULES_ENV])
+print(sorted(cls.__name__ for cls in PromoProcessor.subclasses if issubclass(cls, RuleProcessor)))
+"""
+
+ITEMS = [make_item("2 For $5.00", "Save $1.50"), make_item("Deal: 25% off"), make_item(regular_price=4, sale_price=4)]
+
+
+def write_feed(path, items):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(json.dumps(item) + "\n" for item in items))
+    return path
+
+
+def test_expand_inputs_globs_and_dedupes(tmp_path):
+    first = write_feed(tmp_path / "feeds" / "a.jsonl", ITEMS)
+    second = write_feed(tmp_path / "feeds" / "nested" / "b.jsonl", ITEMS)
+    (tmp_path / "feeds" / "notes.txt").write_text("skip me")
+    assert expand_inputs([str(tmp_path / "feeds" / "**" / "*.jsonl"), str(first)]) == [first, second]
+    with pytest.raises(FileNotFoundError):
+        expand_inputs([str(tmp_path / "missing" / "*.jsonl")])
+    with pytest.raises(ValueError):
+        expand_inputs([str(tmp_path / "feeds" / "notes.txt")])
+
+
+@pytest.mark.parametrize("executor", ["serial", "thread"])
+def test_main_processes_feeds_and_writes_stats(registry, tmp_path, executor):
+    source = write_feed(tmp_path / "items.jsonl", ITEMS)
+    destination, stats_path = tmp_path / "results.jsonl", tmp_path / "stats.json"
+    assert main([str(source), "-o", str(destination), "--executor", executor, "-w", "2", "-c", "2",
+                 "--stats-json", str(stats_path), "-q"]) == 0
+    assert list(read_jsonl(destination)) == PromoProcessor.process_batch(ITEMS)
+    stats = json.loads(stats_path.read_text())
+    assert stats["records"] == 3 and stats["deals_priced"] == 2 and stats["coupons_priced"] == 1
+
+
+def test_main_reports_errors(tmp_path, capsys):
+    assert main([str(tmp_path / "missing.jsonl"), "-o", str(tmp_path / "out.jsonl")]) == 1
+    assert "error:" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        main([str(tmp_path / "missing.jsonl"), "-o", "-", "--workers", "0"])
+
+
+def rule_file(path, name):
+    rule = {"name": name, "patterns": [rf"{name}\\s+\\$(?P<total>\\d+)"], "groups": {"total": "int"},
+            "deal": {"volume_deals_price": "total"}}
+    path.write_text(json.dumps([rule]))
+    return path
+
+
+def test_rules_option_merges_with_the_environment_once(tmp_path):
+    first, second = rule_file(tmp_path / "first.json", "FirstRule"), rule_file(tmp_path / "second.json", "SecondRule")
+    source = write_feed(tmp_path / "items.jsonl", ITEMS)
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PROMO_RULES=str(first))
+    # The environment's file, spelled differently, and a repeated second file load once each.
+    command = [sys.executable, "-c", textwrap.dedent(RULES_RUN), str(source), "-o", "out.jsonl", "-q",
+               "--rules", "first.json", "--rules", str(second), "--rules", "./second.json"]
+    completed = subprocess.run(command, capture_output=True, text=True, env=env, cwd=str(tmp_path))
+    assert completed.returncode == 0, completed.stderr
+    paths, names = completed.stdout.splitlines()
+    assert paths.split(os.pathsep) == [str(first), str(second)]
+    assert names == "['FirstRule', 'SecondRule']"
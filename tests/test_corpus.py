@@ -0,0 +1,17 @@
+from benchmarks.corpus import FAMILIES, RETAILERS, family_descriptions, generate_items
+
+
+def test_generate_items_is_seeded():
+    assert list(generate_items(200, seed=4)) == list(generate_items(200, seed=4))
+    assert list(generate_items(200, seed=4)) != list(generate_items(200, seed=5))
+    assert {item["retailer"] for item in generate_items(200, seed=4)} == set(RETAILERS)
+
+
+def test_family_descriptions_are_won_by_their_processor(registry):
+    descriptions = family_descriptions(30, seed=2)
+    assert set(descriptions) == {family.processor for family in FAMILIES}
+    for family in FAMILIES:
+        for retailer in family.retailers:
+            for description in descriptions[family.processor]:
+                processor, _, _ = registry.match(description, retailer)
+                assert type(processor).__name__ == family.processor, (retailer, description)
@@ -0,0 +1,67 @@
+import time
+
+from promo_processor.guard import DEFAULT_MAX_LENGTH, MatchGuard, NO_MATCH, profile_pattern
+from tests.helpers import make_item
+
+
+def test_slow_matches_keep_their_result():
+    guard = MatchGuard(time_budget=0.001)
+
+    def slow(key):
+        time.sleep(0.005)
+        return ("processor", "match", 1)
+
+    assert guard.run("key", "description", slow) == ("processor", "match", 1)
+    assert guard.run("key", "description", lambda key: ("processor", "match", 1)) == ("processor", "match", 1)
+    stats = guard.stats()
+    assert stats["over_budget"] == 1
+    assert stats["slowest"] >= 0.005
+
+
+def test_default_length_cap_skips_only_oversized_descriptions():
+    guard = MatchGuard()
+    assert guard.run("key", "x" * DEFAULT_MAX_LENGTH, lambda key: "matched") == "matched"
+    assert guard.run("key", "x" * (DEFAULT_MAX_LENGTH + 1), lambda key: "matched") == NO_MATCH
+    assert MatchGuard(max_length=0).run("key", "x" * 100000, lambda key: "matched") == "matched"
+    capped = MatchGuard(max_length=10)
+    assert capped.run("key", "x" * 11, lambda key: "matched") == NO_MATCH
+    assert capped.stats()["too_long"] == 1
+
+
+def test_long_descriptions_still_match(registry, fresh_session):
+    description = "2 For $5.00 " + "valid on select items " * 100
+    session = fresh_session()
+    assert session.process_record(make_item(description))["unit_price"] == 2.5
+    assert session.performance_stats()["guard"]["too_long"] == 0
+
+
+def test_configure_guard_applies_to_processing(registry, fresh_session):
+    session = fresh_session(max_description_length=50)
+    item = make_item("2 For $5.00 " + "valid on select items " * 10)
+    assert "unit_price" not in session.process_record(item)
+    assert session.performance_stats()["guard"]["too_long"] == 1
+    session.configure_guard(max_length=0)
+    assert session.process_record(item)["unit_price"] == 2.5
+
+
+def test_output_does_not_depend_on_match_time(registry, fresh_session):
+    session = fresh_session(time_budget=1e-9)
+    expected = fresh_session(time_budget=0).process_record(make_item("4 For $3.06"))
+    assert session.process_record(make_item("4 For $3.06")) == expected
+    assert session.process_record(make_item("4 For $3.06")) == expected
+    assert session.performance_stats()["guard"]["over_budget"] == 1
+
+
+def test_digit_runs_do_not_backtrack_quadratically(registry):
+    # Retrying "\d+" from every digit took seconds here; one pass takes milliseconds.
+    started = time.perf_counter()
+    assert registry.match("1" * 20000 + " for $x")[0] is None
+    assert time.perf_counter() - started < 0.5
+    processor, match, _ = registry.match("1" * 20000 + " For $5.00")
+    assert type(processor).__name__ == "QuantityForPriceProcessor" and len(match.group("quantity")) == 20000
+
+
+def test_profile_pattern_reports_growth():
+    profile = profile_pattern(r"(a+)+b", lengths=(8, 16))
+    assert profile.worst_seconds > 0
+    assert profile.growth > 1
@@ -0,0 +1,29 @@
+import pytest
+
+from promo_processor.jobs import ProcessingJob
+from promo_processor.processor import PromoProcessor
+from tests.helpers import make_item
+
+ITEMS = [make_item(f"{count} For $6.00") for count in range(1, 7)] * 20
+
+
+@pytest.mark.parametrize("mode", ["single", "pool"])
+def test_job_processes_every_record(registry, mode):
+    job = ProcessingJob(ITEMS, mode=mode, workers=2, chunk_size=10).start()
+    assert job.join(timeout=60)
+    progress = job.progress()
+    assert progress.status == "done" and progress.finished and progress.fraction == 1.0
+    assert job.results == PromoProcessor.process_batch(ITEMS)
+    assert job.partial_results(limit=2) == job.results[-2:]
+
+
+def test_job_cancelled_before_start_keeps_no_results(registry):
+    job = ProcessingJob(ITEMS)
+    job.cancel()
+    assert job.start().join(timeout=10)
+    assert job.progress().status == "cancelled" and job.results == []
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        ProcessingJob(ITEMS, mode="gpu")
@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import logging
+import subprocess
+import textwrap
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from promo_processor.logs import MatchLog, StructuredFormatter
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+FORKING = """
+import sys
+import logging
+import multiprocessing
+from promo_processor.logs import configure_logging, stop_logging
+
+configure_logging(logging.INFO, sys.argv[1], use_queue=True)
+logger = logging.getLogger("forking")
+for index in range(2000):
+    logger.info("parent %d", index)
+
+def child(number):
+    for index in range(50):
+        logger.info("child %d %d", number, index)
+    stop_logging()
+
+processes = [multiprocessing.get_context("fork").Process(target=child, args=(number,)) for number in range(3)]
+for process in processes:
+    process.start()
+for process in processes:
+    process.join()
+stop_logging()
+"""
+
+
+class Processor:
+    pass
+
+
+@pytest.fixture
+def captured():
+    logging.disable(logging.NOTSET)
+    logger = logging.getLogger("tests.match_log")
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    yield logger, records
+    logger.removeHandler(handler)
+
+
+@pytest.mark.parametrize("mode, logged", [("all", 5), ("sample", 3), ("counters", 0)])
+def test_match_log_modes(captured, mode, logged):
+    logger, records = captured
+    log = MatchLog(logger, mode, sample_every=2)
+    for _ in range(5):
+        log.record("DEALS", Processor(), "2 For $5.00")
+    assert len(records) == logged
+    assert log.counts() == {"DEALS": {"Processor": 5}}
+
+
+def test_flush_logs_and_resets_counters(captured):
+    logger, records = captured
+    log = MatchLog(logger, "counters")
+    log.record("COUPONS", Processor(), "Save $1.00")
+    assert log.flush() == {"COUPONS": {"Processor": 1}}
+    assert records[-1].counts == {"COUPONS": {"Processor": 1}} and log.counts() == {}
+
+
+def test_structured_formatter_writes_one_json_object(captured):
+    logger, records = captured
+    MatchLog(logger).record("DEALS", Processor(), "2 For $5.00")
+    entry = json.loads(StructuredFormatter().format(records[0]))
+    assert entry["kind"] == "DEALS" and entry["processor"] == "Processor"
+    assert entry["description"] == "2 For $5.00" and entry["message"] == "DEALS: Processor: 2 For $5.00"
+
+
+def test_off_is_disabled_and_unknown_modes_are_rejected():
+    assert not MatchLog(logging.getLogger(), "off").enabled
+    with pytest.raises(ValueError):
+        MatchLog(logging.getLogger(), "verbose")
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_forked_children_log_through_the_parent(tmp_path):
+    log_file = tmp_path / "app.log"
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    completed = subprocess.run([sys.executable, "-c", textwrap.dedent(FORKING), str(log_file)],
+                               capture_output=True, text=True, env=env, cwd=str(tmp_path))
+    assert completed.returncode == 0, completed.stderr
+    messages = [line.split(" - ", 3)[-1] for line in log_file.read_text().splitlines()]
+    # Records queued before a fork are written once, by the parent, and every child record arrives.
+    assert sorted(messages) == sorted([f"parent {index}" for index in range(2000)] +
+                                      [f"child {number} {index}" for number in range(3) for index in range(50)])
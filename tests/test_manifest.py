@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import subprocess
+import textwrap
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PLAIN = """
+import promo_processor
+from promo_processor import manifest
+registry = promo_processor.load_processors()
+processor, match, _ = registry.match("Buy 2 for $5.00")
+print(json.dumps({"lazy": type(registry.processors[0]).__mro__[1].__name__ == "LazyProcessor",
+                  "names": sorted(type(p).__name__ for p in registry.processors),
+                  "winner": type(processor).__name__, "version": registry.version,
+                  "cached": manifest.manifest_path().exists()}))
+"""
+
+CUSTOM = """
+from promo_processor.processor import PromoProcessor
+
+class ZebraProcessor(PromoProcessor):
+    patterns = [r"zebra\\s+(?P<price>\\d+)"]
+
+    def calculate_deal(self, item, match):
+        item["unit_price"] = float(match.group("price"))
+        return item
+
+    def calculate_coupon(self, item, match):
+        return item
+""" + PLAIN.replace('"Buy 2 for $5.00"', '"zebra 7"')
+
+
+def run(script, cache_dir):
+    env = dict(os.environ, PROMO_RULES_CACHE=str(cache_dir), PYTHONPATH=str(ROOT))
+    env.pop("PROMO_RULES", None)
+    completed = subprocess.run([sys.executable, "-c", "import json\n" + textwrap.dedent(script)],
+                               capture_output=True, text=True, env=env, cwd=str(cache_dir))
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path
+
+
+def test_second_run_loads_lazily_with_the_same_registry(cache_dir):
+    eager = run(PLAIN, cache_dir)
+    lazy = run(PLAIN, cache_dir)
+    assert not eager["lazy"] and lazy["lazy"] and eager["cached"]
+    assert lazy["names"] == eager["names"]
+    assert lazy["version"] == eager["version"]
+    assert lazy["winner"] == eager["winner"] == "QuantityForPriceProcessor"
+
+
+def test_subclass_added_after_caching_is_registered(cache_dir):
+    run(PLAIN, cache_dir)
+    custom = run(CUSTOM, cache_dir)
+    assert not custom["lazy"]
+    assert "ZebraProcessor" in custom["names"]
+    assert custom["winner"] == "ZebraProcessor"
+
+
+def test_main_module_processors_never_reach_the_cache(cache_dir):
+    custom = run(CUSTOM, cache_dir)
+    assert custom["winner"] == "ZebraProcessor" and not custom["cached"]
+    plain = run(PLAIN, cache_dir)
+    assert "ZebraProcessor" not in plain["names"]
+    assert plain["winner"] == "QuantityForPriceProcessor"
+    # A plain run caches again, and the custom run still does not trust that cache.
+    assert run(PLAIN, cache_dir)["lazy"]
+    assert run(CUSTOM, cache_dir)["winner"] == "ZebraProcessor"
+
+
+def test_manifest_naming_an_unimportable_module_is_ignored(cache_dir):
+    run(PLAIN, cache_dir)
+    path = next(cache_dir.glob("manifest-*.json"))
+    manifest = json.loads(path.read_text())
+    entry = next(entry for entry in manifest["processors"] if not entry["rule"])
+    entry["module"] = "__main__"
+    path.write_text(json.dumps(manifest))
+    plain = run(PLAIN, cache_dir)
+    assert not plain["lazy"]
+    assert plain["winner"] == "QuantityForPriceProcessor"
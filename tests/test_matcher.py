@@ -0,0 +1,81 @@
+import re
+
+import pytest
+
+from benchmarks.corpus import RETAILERS, family_descriptions, generate_items
+from promo_processor.matcher import PatternMatcher
+from tests import helpers
+
+
+def corpus():
+    descriptions = set(helpers.DESCRIPTIONS)
+    for item in generate_items(1500, seed=11):
+        descriptions.update((item["volume_deals_description"], item["digital_coupon_description"]))
+    for family in family_descriptions(20, seed=5).values():
+        descriptions.update(family)
+    return sorted(descriptions)
+
+
+DESCRIPTIONS = corpus()
+
+
+def reference_match(processors, score, description):
+    """The original fan-out: every processor's best pattern by ``re.search``, highest score
+    wins, ties going to the earlier processor and then the earlier pattern."""
+    best = (None, None, -1)
+    for processor in processors:
+        results = []
+        for pattern in processor.patterns:
+            found = re.compile(pattern, re.IGNORECASE).search(description)
+            results.append((pattern, found, score(pattern) if found else -1))
+        pattern, found, pattern_score = max(results, key=lambda result: result[2])
+        if found and pattern_score > best[2]:
+            best = (processor, found, pattern_score)
+    return best
+
+
+@pytest.mark.parametrize("retailer", [None, *RETAILERS])
+def test_combined_matcher_matches_per_processor_search(registry, retailer):
+    matcher = registry.matcher_for(retailer)
+    processors = [processor for processor in registry.processors if retailer is None or processor.applies_to(retailer)]
+    for description in DESCRIPTIONS:
+        expected_processor, expected, expected_score = reference_match(processors, registry.pattern_scores.__getitem__,
+                                                                       description)
+        processor, match, score = matcher.match(description)
+        assert processor is expected_processor, description
+        if expected is None:
+            assert match is None
+            continue
+        assert score == expected_score
+        assert match.groups() == expected.groups(), description
+        assert match.groupdict() == expected.groupdict(), description
+
+
+def test_patterns_sharing_group_names_and_backreferences():
+    class First:
+        patterns = [r"(?P<n>\d+) for (?P<price>\d+)"]
+
+    class Second:
+        patterns = [r"(?P<word>[a-z]+) (?P=word)", r"(?i)buy (?P<n>\d+)"]
+
+    scores = {First.patterns[0]: 1, Second.patterns[0]: 2, Second.patterns[1]: 1}
+    matcher = PatternMatcher([First, Second], scores.__getitem__)
+    processor, match, score = matcher.match("2 for 5 and buy buy")
+    assert (processor, score, match.group("word")) == (Second, 2, "buy")
+    processor, match, _ = matcher.match("3 for 7")
+    assert processor is First and match.groupdict() == {"n": "3", "price": "7"}
+    assert matcher.match("nothing here") == (None, None, -1)
+
+
+def test_prefilter_keeps_every_pattern_that_matches(registry):
+    matcher = registry.matcher
+    for description in DESCRIPTIONS:
+        candidates = {pattern for _, pattern in matcher.candidates(description)}
+        for entry in matcher.entries:
+            if re.search(entry.pattern, description, re.IGNORECASE):
+                assert entry.pattern in candidates, (entry.pattern, description)
+
+
+def test_prefilter_skips_patterns_without_their_literal(registry):
+    matcher = registry.matcher
+    assert matcher.candidate_mask("Rollback") != matcher.candidate_mask("Target Circle Deal: $2.99 price on cereal")
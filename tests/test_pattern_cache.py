@@ -0,0 +1,35 @@
+from promo_processor.pattern_cache import compute_table, load_table
+from promo_processor.processor import PromoProcessor
+
+PATTERNS = [r"(?P<count>\d+)\s+for\s+\$(?P<total>\d+(?:\.\d+)?)", r"save\s+\$(\d+)", r"(\d+)%\s+off"]
+
+
+def score(pattern):
+    return len(pattern)
+
+
+def test_table_is_cached_and_reloaded(tmp_path):
+    table = load_table(PATTERNS, score, tmp_path)
+    assert table == compute_table(PATTERNS, score)
+    assert table.info[PATTERNS[0]].names == {"count": 1, "total": 2}
+    assert len(list(tmp_path.glob("patterns-*.json"))) == 1
+    assert load_table(PATTERNS, score, tmp_path) == table
+
+
+def test_key_follows_patterns_and_scoring(tmp_path):
+    load_table(PATTERNS, score, tmp_path)
+    load_table(PATTERNS[:2], score, tmp_path)
+    load_table(PATTERNS, lambda pattern: -len(pattern), tmp_path)
+    assert len(list(tmp_path.glob("patterns-*.json"))) == 3
+
+
+def test_corrupt_cache_is_recomputed(tmp_path):
+    load_table(PATTERNS, score, tmp_path)
+    path = next(tmp_path.glob("patterns-*.json"))
+    path.write_text("{not json")
+    assert load_table(PATTERNS, score, tmp_path) == compute_table(PATTERNS, score)
+
+
+def test_registry_scores_come_from_the_table(registry):
+    assert registry.pattern_scores == {pattern: PromoProcessor.calculate_pattern_precedence(pattern)
+                                       for pattern in registry.pattern_scores}
@@ -0,0 +1,42 @@
+import io
+import csv
+import json
+
+import pytest
+
+from promo_processor.pipeline import read_csv, read_jsonl, read_records, run_pipeline
+from promo_processor.processor import PromoProcessor
+from tests.helpers import make_item
+
+ITEMS = [make_item("2 For $5.00", "Save $1.50"), make_item("Deal: 25% off"), make_item(regular_price=4, sale_price=4)]
+
+
+def test_read_csv_converts_price_columns():
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=list(ITEMS[0]))
+    writer.writeheader()
+    writer.writerow({**ITEMS[0], "sale_price": "7.5"})
+    writer.writerow({**ITEMS[1], "sale_price": ""})
+    rows = list(read_csv(io.StringIO(out.getvalue())))
+    assert rows[0]["regular_price"] == 10 and rows[0]["sale_price"] == 7.5
+    assert rows[1]["sale_price"] == ""
+    assert rows[0]["product_title"] == ITEMS[0]["product_title"]
+
+
+def test_read_jsonl_skips_blank_lines():
+    source = io.StringIO("\n".join(json.dumps(item) for item in ITEMS) + "\n\n")
+    assert list(read_jsonl(source)) == ITEMS
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_run_pipeline_writes_processed_jsonl(registry, tmp_path, workers):
+    source = tmp_path / "items.jsonl"
+    source.write_text("".join(json.dumps(item) + "\n" for item in ITEMS))
+    destination = tmp_path / "out" / "results.jsonl"
+    assert run_pipeline(source, destination, chunk_size=2, workers=workers) == len(ITEMS)
+    assert list(read_jsonl(destination)) == PromoProcessor.process_batch(ITEMS)
+
+
+def test_unsupported_input_format(tmp_path):
+    with pytest.raises(ValueError):
+        read_records(tmp_path / "items.xml")
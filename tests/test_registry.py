@@ -0,0 +1,42 @@
+import json
+import dataclasses
+
+import pytest
+
+import promo_processor
+
+
+def test_load_processors_builds_the_registry_once(registry):
+    assert promo_processor.load_processors() is registry
+
+
+def test_registry_is_frozen(registry):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        registry.matcher = None
+
+
+def test_processors_are_singletons_in_precedence_order(registry):
+    scores = [registry.precedence[type(processor)] for processor in registry.processors]
+    assert scores == sorted(scores)
+    assert len({type(processor) for processor in registry.processors}) == len(registry.processors)
+    for description in ["2 For $5.00", "$1.99/lb"]:
+        processor, _, _ = registry.match(description)
+        assert any(processor is singleton for singleton in registry.processors)
+
+
+def test_save_patterns(registry, tmp_path):
+    registry.save_patterns(tmp_path / "patterns.json")
+    assert json.loads((tmp_path / "patterns.json").read_text()) == list(registry.patterns)
+
+
+def test_version_follows_the_engine_source(registry, tmp_path, monkeypatch):
+    from promo_processor import registry as registry_module
+
+    engine = tmp_path / "promo_engine_probe.py"
+    engine.write_text("ROUNDING = 2\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(registry_module, "ENGINE_MODULES", registry_module.ENGINE_MODULES + ("promo_engine_probe",))
+    before = dataclasses.replace(registry).version
+    assert dataclasses.replace(registry).version == before
+    engine.write_text("ROUNDING = 3\n")
+    assert dataclasses.replace(registry).version != before
@@ -0,0 +1,63 @@
+import re
+import json
+
+import pytest
+
+from promo_processor.rules import Rule, RuleError, compile_plan, load_plan
+
+RULE = {
+    "name": "MultiBuyRule",
+    "patterns": [r"(?P<count>\d+|two|three)\s+for\s+\$(?P<total>\d+(?:\.\d+)?)"],
+    "groups": {"count": "number", "total": "float"},
+    "let": {"each": "total / count"},
+    "deal": {"volume_deals_price": "round(total, 2)", "unit_price": "round(each, 2)", "digital_coupon_price": "''"},
+    "coupon": {"digital_coupon_price": "round(item.get('sale_price', 0) - each, 2)"},
+}
+
+
+def hooks_for(rule):
+    return compile_plan([Rule.from_dict(rule)]).hooks()
+
+
+def promo_match(rule, description):
+    return re.search(rule["patterns"][0], description, re.IGNORECASE)
+
+
+def test_formulas_compute_like_a_hand_written_hook():
+    hooks = hooks_for(RULE)
+    item = hooks["deal_0"](None, {"sale_price": 3}, promo_match(RULE, "Two for $5.00"))
+    assert item == {"sale_price": 3, "volume_deals_price": 5.0, "unit_price": 2.5, "digital_coupon_price": ""}
+    item = hooks["coupon_0"](None, {"sale_price": 3}, promo_match(RULE, "4 for $6"))
+    assert item["digital_coupon_price"] == 1.5
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('true')", "item.__class__", "open('x')", "(lambda: 1)()", "[x for x in item]",
+    "item.update({})", "unknown_name + 1",
+])
+def test_unsafe_or_unknown_formulas_are_rejected(expression):
+    rule = dict(RULE, deal={"unit_price": expression})
+    with pytest.raises(RuleError):
+        compile_plan([Rule.from_dict(rule)])
+
+
+@pytest.mark.parametrize("change", [
+    {"groups": {"missing": "int"}}, {"groups": {"count": "complex"}}, {"patterns": ["(unclosed"]},
+    {"let": {"count": "1"}}, {"let": {"item": "1"}},
+])
+def test_malformed_rules_are_rejected(change):
+    with pytest.raises(RuleError):
+        compile_plan([Rule.from_dict(dict(RULE, **change))])
+
+
+def test_plans_are_cached_by_file_content(tmp_path):
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps([RULE]))
+    cache = tmp_path / "cache"
+    plan = load_plan([rules], cache)
+    assert len(list(cache.glob("rules-*.plan"))) == 1
+    cached = load_plan([rules], cache)
+    assert cached.digest == plan.digest and cached.rules == plan.rules
+    assert cached.hooks()["deal_0"](None, {}, promo_match(RULE, "2 for $3"))["unit_price"] == 1.5
+    rules.write_text(json.dumps([dict(RULE, name="Renamed")]))
+    assert load_plan([rules], cache).digest != plan.digest
@@ -0,0 +1,127 @@
+import json
+import asyncio
+
+import pytest
+
+from promo_processor.service import BatcherStopped, MicroBatcher, ServiceClient, create_app
+from promo_processor.session import DefaultSession
+from tests.helpers import make_item
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_process_single_record_and_batch(registry):
+    async def scenario():
+        async with ServiceClient(create_app()) as client:
+            single = await client.post("/process", json=make_item("2 For $5.00"))
+            batch = await client.post("/process", json=[make_item("2 For $5.00"), make_item("4 For $3.06")])
+            return single, batch
+
+    single, batch = run(scenario())
+    assert single.status == 200 and single.json()["unit_price"] == 2.5
+    assert [record["unit_price"] for record in batch.json()] == [2.5, 0.77]
+
+
+def test_stream_answers_every_line_in_order(registry):
+    lines = [json.dumps(make_item(f"{count} For $6.00")) for count in range(1, 6)] + ["not json", "[1]"]
+    body = ("\n".join(lines) + "\n").encode()
+
+    async def scenario():
+        async with ServiceClient(create_app(), body_chunk_size=50) as client:
+            return await client.post("/process/stream", data=body)
+
+    output = run(scenario()).lines()
+    assert [record.get("unit_price") for record in output[:5]] == [6.0, 3.0, 2.0, 1.5, 1.2]
+    assert [record.get("line") for record in output[5:]] == [6, 7]
+
+
+def test_errors_and_routes(registry):
+    async def scenario():
+        async with ServiceClient(create_app(max_body_size=100)) as client:
+            return [await client.post("/process", data=b"{"), await client.post("/process", data=b"[1]"),
+                    await client.post("/process", json=[make_item()] * 5), await client.get("/process"),
+                    await client.get("/missing"), await client.get("/health")]
+
+    statuses = [response.status for response in run(scenario())]
+    assert statuses == [400, 400, 413, 405, 404, 200]
+
+
+def test_concurrent_submissions_share_batches(registry):
+    async def scenario():
+        batcher = MicroBatcher(DefaultSession(), max_batch_size=8, max_wait=0.05)
+        results = await asyncio.gather(*(batcher.submit(make_item("2 For $5.00")) for _ in range(16)))
+        await batcher.stop()
+        return batcher, results
+
+    batcher, results = run(scenario())
+    assert [result["unit_price"] for result in results] == [2.5] * 16
+    assert batcher.records == 16 and batcher.batches < 16
+
+
+def test_a_failed_batch_fails_every_caller(registry):
+    async def scenario():
+        batcher = MicroBatcher(DefaultSession(), max_batch_size=8, max_wait=0.05)
+
+        async def broken(batch):
+            raise RuntimeError("worker died")
+
+        batcher._process = broken
+        results = await asyncio.gather(*(batcher.submit(make_item("2 For $5.00")) for _ in range(4)),
+                                       return_exceptions=True)
+        # The batcher survives the failure.
+        batcher._process = MicroBatcher._process.__get__(batcher)
+        after = await asyncio.wait_for(batcher.submit(make_item("2 For $5.00")), 5)
+        await batcher.stop()
+        return results, after
+
+    results, after = run(scenario())
+    assert [str(result) for result in results] == ["worker died"] * 4
+    assert after["unit_price"] == 2.5
+
+
+def test_submit_after_stop_is_rejected(registry):
+    async def scenario():
+        batcher = MicroBatcher(DefaultSession())
+        await batcher.submit(make_item("2 For $5.00"))
+        await batcher.stop()
+        with pytest.raises(BatcherStopped):
+            await batcher.submit(make_item("2 For $5.00"))
+        await batcher.start()
+        result = await batcher.submit(make_item("2 For $5.00"))
+        await batcher.stop()
+        return result
+
+    assert run(scenario())["unit_price"] == 2.5
+
+
+def test_requests_after_shutdown_get_503(registry):
+    async def scenario():
+        async with ServiceClient(create_app()) as client:
+            pass
+        return [await client.post("/process", json=make_item("2 For $5.00")),
+                await client.post("/process/stream", data=json.dumps(make_item("2 For $5.00")).encode())]
+
+    assert [response.status for response in run(scenario())] == [503, 503]
+
+
+def test_stream_enforces_the_body_size_limit(registry):
+    lines = [json.dumps(make_item("2 For $5.00")) for _ in range(20)]
+    body = ("\n".join(lines) + "\n").encode()
+
+    async def scenario():
+        small = ServiceClient(create_app(max_body_size=len(lines[0]) // 2), body_chunk_size=len(body))
+        large = ServiceClient(create_app(max_body_size=len(body) // 2), body_chunk_size=len(lines[0]) + 1)
+        async with small as client:
+            rejected = await client.post("/process/stream", data=body)
+        async with large as client:
+            cut = await client.post("/process/stream", data=body)
+        return rejected, cut
+
+    rejected, cut = run(scenario())
+    assert rejected.status == 413
+    output = cut.lines()
+    assert cut.status == 200 and 0 < len(output) < len(lines)
+    assert "larger than" in output[-1]["error"]
+    assert all(record["unit_price"] == 2.5 for record in output[:-1])
@@ -0,0 +1,114 @@
+import pickle
+import asyncio
+import inspect
+
+import pytest
+
+from benchmarks.corpus import FAMILIES, family_descriptions, generate_items
+from promo_processor import ProcessingSession, SessionConfig
+from promo_processor.parallel import process_parallel
+from promo_processor.processor import PromoProcessor
+from promo_processor.record import PromoRecord
+from tests.helpers import make_item, process_or_error
+
+
+@pytest.fixture(scope="module")
+def items(registry):
+    # Some corpus records trip a processor's own bug; the parity tests only use the ones it accepts.
+    session = ProcessingSession(SessionConfig(cache_size=0))
+    return [item for item in generate_items(1500, seed=21)
+            if isinstance(process_or_error(session.process_record, item), dict)]
+
+
+@pytest.fixture(scope="module")
+def expected(items):
+    session = ProcessingSession(SessionConfig(cache_size=0))
+    return [session.process_record(item) for item in items]
+
+
+def test_hooks_are_plain_functions(registry):
+    for processor in registry.processors:
+        assert not inspect.iscoroutinefunction(processor.calculate_deal), processor
+        assert not inspect.iscoroutinefunction(processor.calculate_coupon), processor
+
+
+def test_process_record_applies_deal_and_coupon(registry):
+    result = ProcessingSession().process_record(make_item("2 For $5.00", "Save $1.50"))
+    assert (result["volume_deals_price"], result["digital_coupon_price"], result["unit_price"]) == (5.0, 1.5, 6.5)
+    assert result["store_brand"] == "no"
+
+
+def test_batch_matches_record_by_record(items, expected):
+    assert ProcessingSession().process_batch(items) == expected
+
+
+def test_compact_records_read_like_dicts(items, expected):
+    results = ProcessingSession(SessionConfig(compact_records=True)).process_batch(items)
+    assert all(isinstance(result, PromoRecord) for result in results)
+    assert [result.to_dict() for result in results] == expected
+    assert [list(result) for result in results] == [list(result) for result in expected]
+    assert [pickle.loads(pickle.dumps(result)).to_dict() for result in results[:50]] == expected[:50]
+
+
+def test_input_records_are_not_modified(items):
+    before = [dict(item) for item in items]
+    ProcessingSession().process_batch(items)
+    assert items == before
+
+
+def test_hooks_update_the_record_in_place(registry):
+    descriptions = family_descriptions(5, seed=9)
+    for family in FAMILIES:
+        for description in descriptions[family.processor]:
+            processor, match, _ = registry.match(description, family.retailers[0])
+            for slot in family.slots:
+                record = make_item(description, description)
+                result = process_or_error(lambda record: getattr(processor, f"calculate_{slot}")(record, match), record)
+                assert isinstance(result, str) or result is record, (slot, description)
+
+
+def test_process_item_appends_in_order(items, expected):
+    session = ProcessingSession()
+    asyncio.run(session.process_item(items[:10]))
+    asyncio.run(session.process_item(items[10]))
+    assert session.results == expected[:11]
+
+
+def test_sessions_do_not_share_state(items, expected):
+    first, second = ProcessingSession(), ProcessingSession(SessionConfig(collect_stats=True))
+    asyncio.run(first.process_item(items[:5]))
+    asyncio.run(second.process_item(items[5:8]))
+    assert (first.results, second.results) == (expected[:5], expected[5:8])
+    assert first.cache is not second.cache
+    assert (first.performance_stats()["items"], second.performance_stats()["items"]) == (0, 3)
+
+
+def test_classmethods_use_the_default_session(items, expected):
+    saved, PromoProcessor.results = PromoProcessor.results, []
+    try:
+        asyncio.run(PromoProcessor.process_item(items[:3]))
+        assert PromoProcessor.results == PromoProcessor.default_session().results == expected[:3]
+    finally:
+        PromoProcessor.results = saved
+
+
+def test_process_parallel_matches_serial_in_order(items, expected):
+    chunks = list(process_parallel(items, workers=2, chunk_size=200))
+    assert [len(chunk) for chunk in chunks[:-1]] == [200] * (len(chunks) - 1)
+    assert [result for chunk in chunks for result in chunk] == expected
+    assert list(ProcessingSession(SessionConfig(workers=2, chunk_size=300)).process_parallel(items)) == expected
+
+
+def test_process_parallel_rejects_empty_chunks(items):
+    with pytest.raises(ValueError):
+        next(process_parallel(items, chunk_size=0))
+
+
+def test_run_retailer_overrides_record_retailer(registry):
+    item = make_item(coupon="Target Circle Deal: 20% off snacks", sale_price=10, retailer="walmart")
+    session = ProcessingSession()
+    assert "digital_coupon_price" not in session.process_record(item)
+    assert session.process_record(item, "target")["unit_price"] == 8.0
+    assert session.process_record({**item, "retailer": " Target "})["unit_price"] == 8.0
+    assert ProcessingSession(SessionConfig(retailer="target")).process_record(item)["unit_price"] == 8.0
+    assert registry.scope_for("costco") is None and registry.matcher_for("costco") is registry.matcher
@@ -0,0 +1,32 @@
+import pytest
+
+from promo_processor.stats import ProcessingStats
+from tests.helpers import make_item
+
+
+def test_stats_are_off_by_default(registry, fresh_session):
+    session = fresh_session()
+    session.process_record(make_item("2 For $5.00"))
+    assert session.performance_stats()["items"] == 0
+
+
+def test_stats_count_matches_and_calculations(registry, fresh_session):
+    session = fresh_session(cache_size=0, collect_stats=True)
+    items = [make_item("2 For $5.00", "Save $1.50"), make_item("3 For $9.00"), make_item("Rollback")]
+    session.process_batch(items)
+    session.process_batch(items)
+    snapshot = session.performance_stats()
+    assert snapshot["items"] == 6 and snapshot["latency"]["samples"] == 6
+    quantity = snapshot["processors"]["QuantityForPriceProcessor"]
+    assert (quantity["hits"], quantity["calculations"]) == (4, 4)
+    assert snapshot["processors"]["SavingsProcessor"]["hits"] == 2
+    assert sum(bucket["count"] for bucket in snapshot["histogram"]) == 6
+
+
+def test_histogram_buckets_cover_every_sample():
+    stats = ProcessingStats()
+    for elapsed_ns in (1_000, 5_000, 20_000, 1_000_000):
+        stats.record_latency(elapsed_ns)
+    histogram = stats.histogram(buckets=4)
+    assert [bucket["count"] for bucket in histogram] == [2, 1, 0, 1]
+    assert histogram[-1]["upper_us"] == pytest.approx(1_000)
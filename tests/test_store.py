@@ -0,0 +1,52 @@
+import pytest
+
+from benchmarks.corpus import generate_items
+from promo_processor.processor import PromoProcessor
+from promo_processor.store import ResultStore, process_incremental
+from tests.helpers import process_or_error
+
+
+@pytest.fixture(scope="module")
+def items(registry):
+    return [item for item in generate_items(400, seed=8)
+            if isinstance(process_or_error(PromoProcessor.process_record, item), dict)]
+
+
+def expected_for(items):
+    return PromoProcessor.process_batch(items)
+
+
+def test_second_run_comes_from_the_store_unchanged(tmp_path, items):
+    with ResultStore(tmp_path / "results.db") as store:
+        assert list(process_incremental(items, store, chunk_size=64)) == expected_for(items)
+        assert store.stats()["misses"] == len(items)
+        assert list(process_incremental(items, store, chunk_size=64)) == expected_for(items)
+        assert store.stats()["hits"] == len(items)
+
+
+def test_changed_records_are_reprocessed_and_passthrough_columns_stay_current(tmp_path, items):
+    with ResultStore(tmp_path / "results.db") as store:
+        list(process_incremental(items, store))
+        changed = [dict(item) for item in items]
+        changed[0].update(volume_deals_description="2 For $5.00", digital_coupon_description="")
+        changed[1]["crawl_date"] = "2025-01-01"
+        results = list(process_incremental(changed, store))
+        assert results == expected_for(changed)
+        assert results[0]["unit_price"] == 2.5
+        assert results[1]["crawl_date"] == "2025-01-01"
+        assert store.stats()["misses"] == len(items) + 1
+
+
+def test_other_registry_versions_are_not_reused(tmp_path, items):
+    with ResultStore(tmp_path / "results.db", version="old") as store:
+        store.put_many([(store.key(items[0]), {"unit_price": -1})])
+    with ResultStore(tmp_path / "results.db") as store:
+        assert list(process_incremental(items[:1], store)) == expected_for(items[:1])
+        assert store.prune() == 1
+
+
+def test_workers_only_receive_unseen_records(tmp_path, items):
+    with ResultStore(tmp_path / "results.db") as store:
+        list(process_incremental(items[:100], store, chunk_size=32))
+        assert list(process_incremental(items, store, chunk_size=32, workers=2)) == expected_for(items)
+        assert store.stats()["misses"] == len(items)
@@ -0,0 +1,107 @@
+import io
+
+import pytest
+
+from benchmarks.corpus import RETAILERS, generate_items
+from tests.helpers import DESCRIPTIONS, make_item, process_or_error
+
+pd = pytest.importorskip("pandas")
+
+from promo_processor.vectorized import process_dataframe  # noqa: E402
+
+# Prices whose halves sit on a binary boundary, where Series.round and round disagree.
+ROUNDING_ITEMS = [
+    make_item("4 For $3.06"), make_item("2 For $5.45"), make_item("Buy 4 for $3.22"),
+    make_item("Buy 2, get 2 50% off", regular_price=4.07, sale_price=4.07),
+    make_item("Buy 2 get 10% off", regular_price=2.35, sale_price=2.35),
+    make_item("Deal: 15% off", regular_price=1.15, sale_price=0),
+    make_item(coupon="20% off paper towels", regular_price=3.825, sale_price=0),
+    make_item(coupon="Buy 1, get 1 25% off", regular_price=2.01, sale_price=2.01),
+]
+WHITESPACE_ITEMS = [
+    make_item("  20% OFF PAPER TOWELS - $3.58 EACH"), make_item(" Deal: 15% off"),
+    make_item("2  For  $5.00"), make_item(coupon=" 20% off paper towels"),
+]
+
+
+def csv_roundtrip(items):
+    return pd.read_csv(io.StringIO(pd.DataFrame(items).to_csv(index=False)), keep_default_na=False)
+
+
+def assert_engines_agree(fresh_session, frame):
+    session = fresh_session(cache_size=0)
+    records = frame.to_dict("records")
+    expected = [process_or_error(session.process_record, record) for record in records]
+    rows = [index for index, result in enumerate(expected) if isinstance(result, dict)]
+    vectorized = process_dataframe(frame.iloc[rows]).to_dict("records")
+    mismatches = [(records[index]["volume_deals_description"], records[index]["digital_coupon_description"],
+                   {key: (value, got.get(key)) for key, value in expected[index].items() if got.get(key) != value})
+                  for index, got in zip(rows, vectorized) if any(got.get(key) != value
+                                                                 for key, value in expected[index].items())]
+    assert mismatches == []
+    return len(rows)
+
+
+def test_vectorized_matches_row_engine(registry, fresh_session):
+    items = [make_item(deal, coupon, regular_price=price, sale_price=price - 1)
+             for deal in DESCRIPTIONS for coupon in ("", *DESCRIPTIONS[::7]) for price in (6, 12)]
+    assert assert_engines_agree(fresh_session, pd.DataFrame(items)) > len(items) * 0.9
+
+
+@pytest.mark.filterwarnings("error::FutureWarning")
+def test_vectorized_matches_row_engine_on_corpus(registry, fresh_session):
+    assert assert_engines_agree(fresh_session, csv_roundtrip(list(generate_items(3000, seed=3)))) > 2500
+
+
+def test_vectorized_rounds_like_round(registry, fresh_session):
+    assert assert_engines_agree(fresh_session, csv_roundtrip(ROUNDING_ITEMS)) == len(ROUNDING_ITEMS)
+    unit_prices = process_dataframe(pd.DataFrame(ROUNDING_ITEMS[:2]))["unit_price"].tolist()
+    assert unit_prices == [0.77, 2.73]
+
+
+def test_vectorized_matches_raw_descriptions(registry, fresh_session):
+    assert assert_engines_agree(fresh_session, pd.DataFrame(WHITESPACE_ITEMS)) == len(WHITESPACE_ITEMS)
+
+
+def test_vectorized_routes_rows_by_retailer(registry, fresh_session):
+    items = [make_item(deal, coupon, retailer=retailer) for retailer in ["", "Costco", *RETAILERS]
+             for deal in ("2 For $5.00", "Target Circle Deal: 20% off snacks")
+             for coupon in ("", "Target Circle Deal: 20% off snacks")]
+    assert assert_engines_agree(fresh_session, pd.DataFrame(items)) == len(items)
+
+
+# Savings deals are left out: that row hook raises, so they still fall back to it.
+SAVINGS_DEALS = ("", "Coupon: $2.00 off", "$1.00 off", "Save $1.00 on 2 coffee", "$9.99 SAVE $2.00 on 3 (2)")
+SAVINGS_COUPONS = ("", "Coupon: $1.00 off", "$0.50 off", "Save $1.50", "Save $0.50 on 2 ", "Save $3.00 off 10 items",
+                   "SAVE $2.00 on 4 boxes")
+VECTORIZED_SAVINGS = ("SavingsProcessor", "DollarDiscountProcessor", "CouponDiscountProcessor", "SaveOnQuantityProcessor")
+
+
+@pytest.mark.parametrize("extra", [{}, {"price": 3.5, "promo_price": 4.25}])
+def test_savings_families_are_vectorized(registry, fresh_session, monkeypatch, extra):
+    items = [make_item(deal, coupon, regular_price=price, sale_price=sale, **extra)
+             for deal in SAVINGS_DEALS for coupon in SAVINGS_COUPONS for price, sale in ((6, 5), (4.35, 0))]
+    session = fresh_session(cache_size=0)
+    expected = [session.process_record(item) for item in items]
+    # Any row that fell back to these hooks would now raise.
+    for processor in registry.processors:
+        if type(processor).__name__ in VECTORIZED_SAVINGS:
+            for slot in ("deal", "coupon"):
+                monkeypatch.setattr(type(processor), f"calculate_{slot}", lambda self, item, match: 1 / 0)
+    results = process_dataframe(pd.DataFrame(items)).to_dict("records")
+    assert [{key: result[key] for key in record} for result, record in zip(results, expected)] == expected
+
+
+def test_vectorized_hooks_compute_columns(registry):
+    frame = process_dataframe(pd.DataFrame([make_item("2 For $5.00"), make_item("Deal: 25% off"),
+                                            make_item("Buy 2, Get 1 Free", regular_price=6, sale_price=6)]))
+    assert frame["unit_price"].tolist() == [2.5, 2.0, 4.0]
+    assert frame["volume_deals_price"].tolist() == [5.0, 2.0, 12.0]
+
+
+def test_input_frame_is_not_modified(registry):
+    df = pd.DataFrame([make_item("2 For $5.00", "Save $1.50")], index=[7])
+    before = df.copy()
+    result = process_dataframe(df)
+    pd.testing.assert_frame_equal(df, before)
+    assert result.index.tolist() == [7]
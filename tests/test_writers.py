@@ -0,0 +1,106 @@
+import io
+import gzip
+import json
+
+import pytest
+
+from promo_processor.record import PromoRecord
+from promo_processor.writers import detect_format, to_bytes, write_records
+
+RECORDS = [
+    {"sku": "A", "regular_price": 10, "unit_price": "", "count": 1, "flag": True, "note": "x"},
+    {"sku": "B", "regular_price": 4.5, "unit_price": 2.25, "count": 2, "flag": False, "note": 3},
+]
+
+
+def test_json_matches_json_dump():
+    assert to_bytes(RECORDS, "json", indent=4).decode() == json.dumps(RECORDS, indent=4)
+    assert json.loads(to_bytes(RECORDS, "json", indent=None)) == RECORDS
+    assert json.loads(to_bytes([], "json")) == []
+
+
+def test_compressed_jsonl(tmp_path):
+    path = tmp_path / "results.jsonl.gz"
+    assert detect_format(path) == {"format": "jsonl", "compression": "gzip"}
+    assert write_records(RECORDS, path, chunk_size=1) == len(RECORDS)
+    with gzip.open(path, "rt") as f:
+        assert [json.loads(line) for line in f] == RECORDS
+
+
+def test_unsupported_output_format():
+    with pytest.raises(ValueError):
+        detect_format("results.xml")
+
+
+def read_table(format, records, chunk_size):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    write_records(records, buffer, format, chunk_size=chunk_size)
+    buffer.seek(0)
+    return pq.read_table(buffer) if format == "parquet" else pa.ipc.open_file(buffer).read_all()
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_roundtrip_keeps_values(format):
+    table = read_table(format, RECORDS, 1000)
+    rows = table.to_pylist()
+    assert [row["regular_price"] for row in rows] == [10.0, 4.5]
+    assert [row["unit_price"] for row in rows] == [None, 2.25]
+    assert [row["count"] for row in rows] == [1, 2]
+    assert [row["note"] for row in rows] == ["x", "3"]
+    # Engine fields missing from the first chunk are still columns.
+    assert "volume_deals_price" in table.schema.names
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_engine_fields_first_seen_in_later_chunk_are_kept(format):
+    records = [{"sku": "A", "regular_price": 3.0}, {"sku": "B", "regular_price": 3.0, "volume_deals_price": 5.0}]
+    rows = read_table(format, records, 1).to_pylist()
+    assert [row["volume_deals_price"] for row in rows] == [None, 5.0]
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+@pytest.mark.parametrize("later", [
+    {"sku": "C", "regular_price": 1.0, "count": 3, "flag": True, "note": "y", "new_column": 1},
+    {"sku": "C", "regular_price": 1.0, "count": 2.5, "flag": True, "note": "y"},
+    {"sku": "C", "regular_price": "n/a", "count": 3, "flag": True, "note": "y"},
+    {"sku": "C", "regular_price": 1.0, "count": 3, "flag": "yes", "note": "y"},
+])
+def test_data_that_does_not_fit_the_schema_raises(format, later):
+    with pytest.raises(ValueError):
+        read_table(format, RECORDS + [later], 2)
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+@pytest.mark.parametrize("later", [
+    {"sku": "C", "regular_price": 1.0, "count": 3, "flag": True, "note": "y", "new_column": 1},
+    {"sku": "C", "regular_price": "n/a", "count": 2.5, "flag": "yes", "note": "y"},
+])
+def test_one_chunk_infers_the_schema_from_every_record(format, later):
+    # How the app builds its downloads: the whole result list as one chunk.
+    records = RECORDS + [later]
+    rows = read_table(format, records, len(records)).to_pylist()
+    assert len(rows) == 3 and rows[-1]["sku"] == "C"
+
+
+def test_text_prices_are_written_as_strings():
+    rows = read_table("parquet", [{"sku": "A", "regular_price": "$3.99"}, {"sku": "B", "regular_price": 2}],
+                      1000).to_pylist()
+    assert [row["regular_price"] for row in rows] == ["$3.99", "2"]
+
+
+def test_jsonl_keeps_every_column():
+    buffer = io.BytesIO()
+    write_records(RECORDS + [{"sku": "C", "new_column": 1}], buffer, "jsonl", chunk_size=1)
+    lines = [json.loads(line) for line in buffer.getvalue().decode().splitlines()]
+    assert lines[-1] == {"sku": "C", "new_column": 1}
+
+
+def test_promo_records_are_written_like_dicts():
+    records = [PromoRecord(record) for record in RECORDS]
+    records[1]["unit_price"] = 2.0
+    expected = [RECORDS[0], dict(RECORDS[1], unit_price=2.0)]
+    assert json.loads(to_bytes(records, "json")) == expected
+    assert json.loads(to_bytes([{"nested": [records[0]]}], "json")) == [{"nested": [RECORDS[0]]}]